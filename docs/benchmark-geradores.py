@@ -0,0 +1,232 @@
+"""
+Benchmark dos geradores de documentos (gerar-manual.py e gerar-pitch.py).
+
+Sintetiza manuais em markdown no estilo de manual-usuario.md e decks com os
+componentes do pitch, mede a vazão de cada etapa e compara com um baseline
+salvo. Uma métrica que cair mais que o limite em relação ao baseline faz o
+benchmark sair com erro.
+
+    python benchmark-geradores.py --save-baseline    # antes da mudança: grava o baseline
+    python benchmark-geradores.py                    # depois: mede e compara
+    python benchmark-geradores.py --chapters 40 --rows 200 --slides 60
+
+As métricas são vazões absolutas (linhas/s, slides/s) e só valem na máquina
+que as mediu. Por isso o baseline não é versionado: fica em
+.cache/benchmark-baseline.json (fora do git) e é gravado com --save-baseline
+na mesma máquina, antes da comparação — por exemplo no commit de partida,
+antes de aplicar a mudança. O baseline guarda o nome da máquina; gravado em
+outra, ou com outra carga, ele é ignorado e a comparação não reprova nada.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import contextlib
+import importlib.util
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(SCRIPT_DIR, ".cache", "benchmark-baseline.json")
+
+
+def load_generator(filename, name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPT_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ── Cargas sintéticas ──────────────────────────────────────────────────────────
+
+def synth_manual(chapters=20, rows=30, tips=3, bullets=8):
+    """Markdown com a mesma estrutura do manual real: capa, sumário, capítulos."""
+    out = [
+        "# FinApp", "## Manual do Usuário", "",
+        "**Versão:** 3.0 (sintético)", "**Data:** Março 2026", "", "---", "",
+        "## Sumário", "",
+    ]
+    out += [f"{c}. [Capítulo {c}](#{c}-capitulo-{c})" for c in range(1, chapters + 1)]
+    for c in range(1, chapters + 1):
+        out += ["", "---", "", f"## {c} Capítulo {c}", "",
+                f"Este capítulo descreve a tela **{c}** do FinApp e como usá-la no dia a dia, "
+                f"com *exemplos* e atalhos. Veja também o [Capítulo 1](#1-capitulo-1).", ""]
+        out += [f"### {c}.1 Campos", "",
+                "| Campo | Descrição | Obrigatório |", "|-------|-----------|:-----------:|"]
+        out += [f"| **Campo {r}** | Valor de exemplo número {r} em R$ com `;` | "
+                f"{'Sim' if r % 2 else 'Não'} |" for r in range(1, rows + 1)]
+        out += ["", f"### {c}.2 Passo a passo", ""]
+        out += [f"{b}. Clique em **Ação {b}** e confirme" for b in range(1, bullets + 1)]
+        out += [""]
+        out += [f"- Item **{b}** da lista com *ênfase* e texto corrido" for b in range(1, bullets + 1)]
+        for t in range(tips):
+            out += ["", f"> **Dica {t + 1}:** use o filtro do mês para conferir os lançamentos."]
+        out += ["", f"#### Observação {c}", "", "Texto final do capítulo."]
+    return "\n".join(out) + "\n"
+
+
+def synth_deck(pitch, slides=20):
+    """Deck de N slides montado só com stat_card, feature_card, checklist e pill."""
+    from pptx.util import Inches
+
+    prs = pitch.new_presentation()
+    for n in range(slides):
+        sl = pitch.new_slide(prs, pitch.WHITE)
+        pitch.label(sl, Inches(0.8), Inches(0.5), f"SLIDE {n + 1}")
+        for i in range(3):
+            pitch.stat_card(sl, Inches(0.8 + i * 4.0), Inches(1.1), Inches(3.7), Inches(2.2),
+                            f"{(n + 1) * (i + 3)}%", "Descrição do indicador em duas linhas",
+                            pitch.EMERALD_600, source="Fonte: sintética")
+        for i in range(3):
+            pitch.feature_card(sl, Inches(0.8 + i * 4.0), Inches(3.5), Inches(3.7), Inches(1.9),
+                               "$", f"Recurso {i + 1}", "Texto curto do recurso em destaque")
+        pitch.checklist(sl, Inches(0.8), Inches(5.6), Inches(6), ["Primeiro", "Segundo", "Terceiro"])
+        pitch.pill(sl, Inches(8.8), Inches(5.7), "Disponível hoje")
+    return prs
+
+
+# ── Medição ────────────────────────────────────────────────────────────────────
+
+def best_of(repeat, fn, setup=None):
+    """
+    Menor tempo de repeat execuções (menos sensível a ruído que a média).
+    setup() roda fora do cronômetro e seu retorno é passado para fn.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_manual(manual, args):
+    md = synth_manual(args.chapters, args.rows, args.tips, args.bullets)
+    lines = md.count("\n")
+    blocks = manual.parse_markdown(md)
+    manual.fill_toc([blocks])
+    tables = [data for kind, data in blocks if kind == "table"]
+    table_rows = sum(len(t) for t in tables)
+
+    def tables_only(doc):
+        for rows in tables:
+            manual.add_table_from_md(doc, rows)
+
+    def render(doc):
+        manual.render_blocks(doc, blocks)
+
+    doc = manual.new_document()
+    render(doc)
+    size = len(save_bytes(doc.save))
+    return {
+        "manual.parse_markdown": (lines / best_of(args.repeat, lambda: manual.parse_markdown(md)),
+                                  "linhas/s"),
+        "manual.tabelas": (table_rows / best_of(args.repeat, tables_only, manual.new_document),
+                           "linhas de tabela/s"),
+        "manual.render": (len(blocks) / best_of(args.repeat, render, manual.new_document),
+                          "blocos/s"),
+        "manual.save": (size / best_of(args.repeat, lambda: save_bytes(doc.save)) / 1e6, "MB/s"),
+    }
+
+
+def bench_pitch(pitch, args):
+    out = os.path.join(SCRIPT_DIR, ".cache", "benchmark-pitch.pptx")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_s = best_of(args.repeat, lambda: pitch.build(out=out, use_cache=False))
+        pitch.build(out=out)
+        cached_s = best_of(args.repeat, lambda: pitch.build(out=out))
+    os.remove(out)
+
+    prs = synth_deck(pitch, args.slides)
+    synth_s = best_of(args.repeat, lambda: synth_deck(pitch, args.slides))
+    return {
+        "pitch.build": (1 / build_s, "decks/s"),
+        "pitch.build_cache": (1 / cached_s, "decks/s"),
+        "pitch.sintetico": (args.slides / synth_s, "slides/s"),
+        "pitch.save": (args.slides / best_of(args.repeat, lambda: save_bytes(prs.save)), "slides/s"),
+    }
+
+
+def save_bytes(save):
+    buf = io.BytesIO()
+    save(buf)
+    return buf.getvalue()
+
+
+# ── Baseline ───────────────────────────────────────────────────────────────────
+
+def workload(args):
+    return {k: getattr(args, k) for k in ("chapters", "rows", "tips", "bullets", "slides")}
+
+
+def compare(results, baseline, threshold):
+    """Linhas do relatório e lista de métricas que regrediram além do limite."""
+    lines, regressions = [], []
+    for name, (value, unit) in results.items():
+        base = baseline.get(name)
+        delta = "" if base is None else f"{(value / base - 1) * 100:+6.1f}%"
+        lines.append(f"  {name:<24} {value:12.1f} {unit:<20} {delta}")
+        if base is not None and value < base * (1 - threshold):
+            regressions.append(name)
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos geradores do manual e do pitch")
+    parser.add_argument("--chapters", type=int, default=20, help="capítulos do manual sintético")
+    parser.add_argument("--rows", type=int, default=30, help="linhas por tabela")
+    parser.add_argument("--tips", type=int, default=3, help="dicas (>) por capítulo")
+    parser.add_argument("--bullets", type=int, default=8, help="itens de lista por capítulo")
+    parser.add_argument("--slides", type=int, default=20, help="slides do deck sintético")
+    parser.add_argument("--repeat", type=int, default=3, help="execuções por métrica (vale a menor)")
+    parser.add_argument("--only", choices=("manual", "pitch"), help="mede só um dos geradores")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="queda máxima tolerada em relação ao baseline (padrão: 0.25)")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="arquivo JSON do baseline (padrão: .cache/benchmark-baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="grava os resultados desta execução como baseline desta máquina")
+    args = parser.parse_args()
+
+    results = {}
+    if args.only != "pitch":
+        results.update(bench_manual(load_generator("gerar-manual.py", "gerar_manual"), args))
+    if args.only != "manual":
+        results.update(bench_pitch(load_generator("gerar-pitch.py", "gerar_pitch"), args))
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.get("host") != platform.node():
+            print(f"Baseline ignorado: gravado em outra máquina ({stored.get('host')})")
+        elif stored["workload"] != workload(args):
+            print("Baseline ignorado: carga diferente da usada nesta execução")
+        else:
+            baseline = stored["metrics"]
+    elif not args.save_baseline:
+        print("Sem baseline nesta máquina: rode com --save-baseline antes da mudança")
+
+    lines, regressions = compare(results, baseline, args.threshold)
+    print(f"Carga: {workload(args)}")
+    print("\n".join(lines))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"host": platform.node(), "workload": workload(args),
+                       "metrics": {name: value for name, (value, _) in results.items()}},
+                      f, indent=2)
+            f.write("\n")
+        print(f"Baseline gravado: {args.baseline}")
+    elif regressions:
+        print(f"REGRESSÃO acima de {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
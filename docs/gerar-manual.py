@@ -1,16 +1,62 @@
 """
-Gera o Manual do Usuário do FinApp em formato Word (.docx)
-Fonte: manual-usuario.md (markdown é a fonte única de verdade)
+Gera o Manual do Usuário do FinApp em formato Word (.docx) e, opcionalmente,
+em HTML (uma página por capítulo) e EPUB.
+Fonte: manual-usuario.md (markdown é a fonte única de verdade; o parser mora
+em manual_md.py)
 """
 
 import re
 import os
+import io
+import sys
+import html
+import time
+import shutil
+import itertools
+import functools
+import zipfile
+import argparse
+import hashlib
+import zlib
+import tracemalloc
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
+from perfil import Profiler
+import perfil
+import pacote
+import observador
+import manual_md
+from manual_md import (HEADING_KINDS, RE_IMAGE, inline_tokens, parse_markdown, iter_sections,
+                       block_links, link_report, toc_entries, fill_toc)
+
+# --check só valida o markdown: sai antes de carregar python-docx. É o único
+# caminho do --check; o argparse de main() só o documenta no --help
+if __name__ == "__main__" and any(arg == "--check" or arg.startswith("--check=")
+                                  for arg in sys.argv[1:]):
+    sys.exit(manual_md.check_cli(sys.argv[1:], os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "manual-usuario.md")))
+
+# Com --profile, o custo dos imports pesados abaixo entra no relatório
+IMPORT_T0 = time.perf_counter()
+if "--profile" in sys.argv:
+    tracemalloc.start()
+
+import docx
 from docx import Document
-from docx.shared import Pt, Cm, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT, WD_ALIGN_VERTICAL
+from docx.shared import Pt, Cm, Emu, Inches, RGBColor
+from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT, WD_TAB_LEADER
+from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml.ns import qn, nsdecls
 from docx.oxml import parse_xml
+from lxml import etree
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow é opcional: sem ele as imagens entram sem redimensionar
+    Image = None
+
+IMPORT_WALL = time.perf_counter() - IMPORT_T0
+IMPORT_MEM = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
 
 # ── Tema de cores ──────────────────────────────────────────────────────────────
 EMERALD     = RGBColor(0x05, 0x96, 0x69)
@@ -27,174 +73,375 @@ AMBER_BG    = "FFFBEB"
 AMBER_BORDER= "F59E0B"
 
 FONT = "Segoe UI"
+CODE_FONT = "Consolas"
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR  = os.path.join(SCRIPT_DIR, ".cache", "manual-secoes")
+MD_PATH    = os.path.join(SCRIPT_DIR, "manual-usuario.md")
+OUT_PATH   = os.path.join(SCRIPT_DIR, "FinApp - Manual do Usuario.docx")
+HTML_DIR   = os.path.join(SCRIPT_DIR, "manual-html")
+EPUB_PATH  = os.path.join(SCRIPT_DIR, "FinApp - Manual do Usuario.epub")
+IMAGE_DIR  = os.path.join(SCRIPT_DIR, ".cache", "manual-imagens")
+PROFILE_PATH = os.path.join(SCRIPT_DIR, ".cache", "perfil-manual.json")
+
+# Imagens: cabem na área útil de configure_page (16 cm de largura) e numa altura
+# que deixa espaço para a legenda na mesma página
+IMAGE_DPI     = 150
+IMAGE_MAX_W   = Cm(16)
+IMAGE_MAX_H   = Cm(20)
+IMAGE_QUALITY = 82
+
+W_R       = qn("w:r")
+W_T       = qn("w:t")
+W_TR      = qn("w:tr")
+W_PPR     = qn("w:pPr")
+W_ID      = qn("w:id")
+W_NAME    = qn("w:name")
+W_ANCHOR  = qn("w:anchor")
+W_INSTR   = qn("w:instr")
+W_BOOKMARK_START = qn("w:bookmarkStart")
+W_BOOKMARK_END   = qn("w:bookmarkEnd")
+W_GRIDCOL = qn("w:gridCol")
+W_VAL     = qn("w:val")
+W_W       = qn("w:w")
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+# ── Fragmentos OOXML ───────────────────────────────────────────────────────────
+
+class FragmentRegistry:
+    """
+    Cada fragmento distinto (builder + parâmetros) é parseado uma única vez;
+    os usos seguintes recebem um deepcopy do protótipo.
+    """
+
+    def __init__(self):
+        self._protos = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, builder, *args):
+        key = (builder, args)
+        proto = self._protos.get(key)
+        if proto is None:
+            self.misses += 1
+            proto = self._protos[key] = parse_xml(builder(*args))
+        else:
+            self.hits += 1
+        return deepcopy(proto)
+
+    def stats(self):
+        return {"fragments": len(self._protos), "hits": self.hits, "misses": self.misses}
+
+
+FRAGMENTS = FragmentRegistry()
+PROFILER = Profiler()
 
-# ── Helpers de formatação ──────────────────────────────────────────────────────
 
-def set_cell_bg(cell, hex_color):
-    shd = parse_xml(f'<w:shd {nsdecls("w")} w:fill="{hex_color}" w:val="clear"/>')
-    cell._tc.get_or_add_tcPr().append(shd)
+def outline_lvl_xml(level):
+    return f'<w:outlineLvl {nsdecls("w")} w:val="{level}"/>'
 
 
-def remove_table_borders(table):
-    tbl = table._tbl
-    tblPr = tbl.tblPr
-    borders = parse_xml(
-        f'<w:tblBorders {nsdecls("w")}>'
-        f'<w:top w:val="none"/><w:left w:val="none"/>'
-        f'<w:bottom w:val="none"/><w:right w:val="none"/>'
-        f'<w:insideH w:val="none"/><w:insideV w:val="none"/>'
-        f'</w:tblBorders>'
+def page_field_xml():
+    return (
+        f'<w:fldSimple {nsdecls("w")} w:instr=" PAGE "><w:r><w:rPr>'
+        f'<w:rFonts w:ascii="{FONT}" w:hAnsi="{FONT}"/>'
+        f'<w:sz w:val="16"/></w:rPr><w:t>1</w:t></w:r></w:fldSimple>'
     )
-    tblPr.append(borders)
-
-
-def set_thin_border_table(table):
-    for row in table.rows:
-        for cell in row.cells:
-            tc = cell._tc
-            tcPr = tc.get_or_add_tcPr()
-            borders = parse_xml(
-                f'<w:tcBorders {nsdecls("w")}>'
-                f'<w:top w:val="single" w:sz="4" w:color="{SLATE_200}"/>'
-                f'<w:bottom w:val="single" w:sz="4" w:color="{SLATE_200}"/>'
-                f'<w:left w:val="single" w:sz="4" w:color="{SLATE_200}"/>'
-                f'<w:right w:val="single" w:sz="4" w:color="{SLATE_200}"/>'
-                f'</w:tcBorders>'
-            )
-            tcPr.append(borders)
-
-
-def apply_inline_bold(paragraph, text):
-    """Parse **bold** markers and add runs with correct formatting."""
-    parts = re.split(r'\*\*(.+?)\*\*', text)
-    for i, part in enumerate(parts):
-        run = paragraph.add_run(part)
-        run.font.name = FONT
-        if i % 2 == 1:  # bold segment
-            run.bold = True
-
-
-def set_paragraph_font(paragraph, size=10, color=None, bold=False, italic=False):
-    for run in paragraph.runs:
-        run.font.name = FONT
-        run.font.size = Pt(size)
-        if color:
-            run.font.color.rgb = color
-        run.bold = bold
-        run.italic = italic
-
-
-def set_paragraph_spacing(paragraph, before=0, after=4, line_spacing=None):
-    pf = paragraph.paragraph_format
-    pf.space_before = Pt(before)
-    pf.space_after = Pt(after)
-    if line_spacing:
-        pf.line_spacing = Pt(line_spacing)
 
 
-# ── Estilos de parágrafo ───────────────────────────────────────────────────────
+def tip_xml(width):
+    """Caixa de dica: tabela 1x1 sem bordas, fundo âmbar e filete à esquerda."""
+    none = 'w:val="none"'
+    return (
+        f'<w:tbl {nsdecls("w")}><w:tblPr><w:tblW w:type="auto" w:w="0"/><w:jc w:val="left"/>'
+        f'<w:tblBorders><w:top {none}/><w:left {none}/><w:bottom {none}/><w:right {none}/>'
+        f'<w:insideH {none}/><w:insideV {none}/></w:tblBorders>'
+        f'<w:tblLook w:val="04A0" w:firstRow="1" w:lastRow="0" w:firstColumn="1" '
+        f'w:lastColumn="0" w:noHBand="0" w:noVBand="1"/></w:tblPr>'
+        f'<w:tblGrid><w:gridCol w:w="{width}"/></w:tblGrid>'
+        f'<w:tr><w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/>'
+        f'<w:tcBorders><w:left w:val="single" w:sz="16" w:space="0" w:color="{AMBER_BORDER}"/></w:tcBorders>'
+        f'<w:shd w:val="clear" w:color="auto" w:fill="{AMBER_BG}"/></w:tcPr>'
+        f'<w:p><w:pPr><w:pStyle w:val="{STYLE_TIP}"/></w:pPr></w:p></w:tc></w:tr></w:tbl>'
+    )
 
-def add_h1(doc, text):
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-    run = p.add_run(text)
-    run.font.name = FONT
-    run.font.size = Pt(22)
-    run.font.color.rgb = EMERALD
-    run.bold = True
-    set_paragraph_spacing(p, before=18, after=4)
-    # Underline accent
-    p2 = doc.add_paragraph()
-    run2 = p2.add_run("─" * 60)
-    run2.font.name = FONT
-    run2.font.size = Pt(7)
-    run2.font.color.rgb = EMERALD
-    set_paragraph_spacing(p2, before=0, after=10)
-    return p
 
+def table_xml():
+    return (
+        f'<w:tbl {nsdecls("w")}><w:tblPr>'
+        f'<w:tblStyle w:val="{STYLE_TABLE}"/><w:tblW w:type="auto" w:w="0"/>'
+        f'<w:jc w:val="left"/>'
+        f'<w:tblLook w:val="04A0" w:firstRow="1" w:lastRow="0" w:firstColumn="0" '
+        f'w:lastColumn="0" w:noHBand="0" w:noVBand="1"/>'
+        f'</w:tblPr><w:tblGrid/>'
+        f'<w:tr><w:trPr><w:tblHeader/></w:trPr></w:tr></w:tbl>'
+    )
 
-def add_h2(doc, text):
-    # Section number + title
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-    run = p.add_run(text)
-    run.font.name = FONT
-    run.font.size = Pt(14)
-    run.font.color.rgb = EMERALD
-    run.bold = True
-    set_paragraph_spacing(p, before=14, after=3)
+
+def toc_entry_xml():
+    """Linha do sumário: link interno para o bookmark do título + número da página."""
+    return (
+        f'<w:p {nsdecls("w")}><w:pPr><w:pStyle w:val="{STYLE_TOC}"/></w:pPr>'
+        f'<w:hyperlink w:history="1"><w:r><w:t xml:space="preserve"/></w:r><w:r><w:tab/></w:r>'
+        f'<w:fldSimple><w:r><w:t/></w:r></w:fldSimple></w:hyperlink></w:p>'
+    )
+
+
+def update_fields_xml():
+    return f'<w:updateFields {nsdecls("w")} w:val="true"/>'
+
+
+def cell_xml(style_id, width):
+    return (
+        f'<w:tc {nsdecls("w")}><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/></w:tcPr>'
+        f'<w:p><w:pPr><w:pStyle w:val="{style_id}"/></w:pPr></w:p></w:tc>'
+    )
+
+
+# ── Helpers de formatação ──────────────────────────────────────────────────────
+
+def run_props_xml(marks, link):
+    """rPr de um run: estilo de caractere pela marca principal, as demais diretas."""
+    style_id = (STYLE_CODE if "code" in marks else STYLE_LINK if link
+                else STYLE_STRONG if "b" in marks else STYLE_EMPHASIS)
+    extra = ("<w:b/>" if "b" in marks and style_id != STYLE_STRONG else "") + \
+            ("<w:i/>" if "i" in marks and style_id != STYLE_EMPHASIS else "")
+    return f'<w:rPr {nsdecls("w")}><w:rStyle w:val="{style_id}"/>{extra}</w:rPr>'
+
+
+def link_xml(href):
+    """Link interno (#ancora) vira w:hyperlink; externo, um campo HYPERLINK sem rId."""
+    if href.startswith("#"):
+        return f'<w:hyperlink {nsdecls("w")} w:anchor="{bookmark_name(href[1:])}"/>'
+    return f'<w:fldSimple {nsdecls("w")} w:instr=" HYPERLINK &quot;{html.escape(href)}&quot; "/>'
+
+
+def append_runs(p, text):
+    """Append one w:r per run of uniformly formatted text to the w:p element."""
+    for href, group in itertools.groupby(inline_tokens(text), key=lambda tok: tok[2]):
+        parent = p
+        if href:
+            parent = FRAGMENTS.get(link_xml, href)
+            p.append(parent)
+        for part, marks, _ in group:
+            r = etree.SubElement(parent, W_R)
+            if marks or href:
+                r.append(FRAGMENTS.get(run_props_xml, marks, bool(href)))
+            t = etree.SubElement(r, W_T)
+            t.text = part
+            if part[:1].isspace() or part[-1:].isspace():
+                t.set(XML_SPACE, "preserve")
+
+
+def apply_inline(paragraph, text):
+    append_runs(paragraph._p, text)
+
+
+# ── Estilos nomeados ───────────────────────────────────────────────────────────
+#
+# Toda a formatação de texto mora em styles.xml: os parágrafos e runs do corpo
+# só referenciam o styleId, sem rPr próprio.
+
+STYLE_H       = ("FinAppHeading1", "FinAppHeading2", "FinAppHeading3", "FinAppHeading4")
+STYLE_H1_RULE = "FinAppHeadingRule"
+STYLE_BODY    = "FinAppBody"
+STYLE_TIP     = "FinAppTip"
+STYLE_BULLET  = "FinAppBullet"
+STYLE_NUMBER  = "FinAppNumber"
+STYLE_TH      = "FinAppTableHeader"
+STYLE_TD      = "FinAppTableCell"
+STYLE_SEP     = "FinAppSeparator"
+STYLE_FIGURE  = "FinAppFigure"
+STYLE_CAPTION = "FinAppCaption"
+STYLE_TOC     = "FinAppToc"
+STYLE_STRONG  = "FinAppStrong"
+STYLE_EMPHASIS = "FinAppEmphasis"
+STYLE_CODE    = "FinAppCode"
+STYLE_LINK    = "FinAppLink"
+STYLE_TABLE   = "FinAppTable"
+
+
+def _add_style(styles, style_id, style_type, size=None, color=None, bold=False,
+               italic=False, before=None, after=None, base=None, left_indent=None,
+               outline_level=None):
+    style = styles.add_style(style_id, style_type)
+    if base:
+        style.base_style = styles[base]
+    font = style.font
+    if size:
+        font.size = Pt(size)
+    if color:
+        font.color.rgb = color
+    if bold:
+        font.bold = True
+    if italic:
+        font.italic = True
+    if style_type == WD_STYLE_TYPE.PARAGRAPH:
+        pf = style.paragraph_format
+        if before is not None:
+            pf.space_before = Pt(before)
+        if after is not None:
+            pf.space_after = Pt(after)
+        if left_indent is not None:
+            pf.left_indent = left_indent
+        if outline_level is not None:
+            style.element.get_or_add_pPr().append(FRAGMENTS.get(outline_lvl_xml, outline_level))
+    return style
+
+
+def register_styles(doc):
+    """Registra a fonte padrão e os estilos do manual uma única vez em styles.xml."""
+    styles = doc.styles
+    r_fonts = styles.element.find(qn("w:docDefaults")).find(
+        f'{qn("w:rPrDefault")}/{qn("w:rPr")}/{qn("w:rFonts")}')
+    for attr in ("w:asciiTheme", "w:hAnsiTheme", "w:eastAsiaTheme", "w:cstheme"):
+        r_fonts.attrib.pop(qn(attr), None)
+    for attr in ("w:ascii", "w:hAnsi", "w:cs"):
+        r_fonts.set(qn(attr), FONT)
+
+    P, C = WD_STYLE_TYPE.PARAGRAPH, WD_STYLE_TYPE.CHARACTER
+    _add_style(styles, STYLE_H[0], P, 22, EMERALD, bold=True, before=18, after=4, outline_level=0)
+    _add_style(styles, STYLE_H[1], P, 14, EMERALD, bold=True, before=14, after=3, outline_level=1)
+    _add_style(styles, STYLE_H[2], P, 11, SLATE_700, bold=True, before=8, after=3, outline_level=2)
+    _add_style(styles, STYLE_H[3], P, 10, SLATE_700, bold=True, italic=True, before=6, after=2,
+               outline_level=3)
+    _add_style(styles, STYLE_H1_RULE, P, 7, EMERALD, before=0, after=10)
+    _add_style(styles, STYLE_BODY, P, 10, SLATE_900, before=0, after=4)
+    _add_style(styles, STYLE_TIP, P, 9.5, SLATE_700, italic=True, before=4, after=4,
+               left_indent=Cm(0.3))
+    _add_style(styles, STYLE_BULLET, P, 10, SLATE_900, before=1, after=1,
+               left_indent=Cm(0.6), base="List Bullet")
+    _add_style(styles, STYLE_NUMBER, P, 10, SLATE_900, base="List Number")
+    _add_style(styles, STYLE_TH, P, 9.5, RGBColor(0xFF, 0xFF, 0xFF), bold=True, before=3, after=3)
+    _add_style(styles, STYLE_TD, P, 9.5, SLATE_900, before=3, after=3)
+    _add_style(styles, STYLE_SEP, P, 4, before=6, after=6)
+    _add_style(styles, STYLE_FIGURE, P, before=6, after=2)
+    _add_style(styles, STYLE_CAPTION, P, 9, SLATE_500, italic=True, before=2, after=10)
+    for style_id in (STYLE_FIGURE, STYLE_CAPTION):
+        styles[style_id].paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    _add_style(styles, STYLE_TOC, P, 10, SLATE_900, before=1, after=1).paragraph_format \
+        .tab_stops.add_tab_stop(Cm(16), WD_TAB_ALIGNMENT.RIGHT, WD_TAB_LEADER.DOTS)
+    _add_style(styles, STYLE_STRONG, C, bold=True)
+    _add_style(styles, STYLE_EMPHASIS, C, italic=True)
+    code = _add_style(styles, STYLE_CODE, C, size=9, color=SLATE_700)
+    code.font.name = CODE_FONT
+    code.element.get_or_add_rPr().append(parse_xml(
+        f'<w:shd {nsdecls("w")} w:val="clear" w:color="auto" w:fill="{SLATE_100}"/>'))
+    _add_style(styles, STYLE_LINK, C, color=EMERALD).font.underline = True
+
+    # Tabela: bordas finas, cabeçalho verde e zebra via formatação condicional
+    border = f'w:val="single" w:sz="4" w:space="0" w:color="{SLATE_200}"'
+    styles.element.append(parse_xml(
+        f'<w:style {nsdecls("w")} w:type="table" w:customStyle="1" w:styleId="{STYLE_TABLE}">'
+        f'<w:name w:val="{STYLE_TABLE}"/><w:basedOn w:val="TableNormal"/>'
+        f'<w:tblPr><w:tblStyleRowBandSize w:val="1"/><w:tblBorders>'
+        f'<w:top {border}/><w:left {border}/><w:bottom {border}/><w:right {border}/>'
+        f'<w:insideH {border}/><w:insideV {border}/>'
+        f'</w:tblBorders></w:tblPr>'
+        f'<w:tcPr><w:vAlign w:val="center"/></w:tcPr>'
+        f'<w:tblStylePr w:type="firstRow"><w:tcPr>'
+        f'<w:shd w:val="clear" w:color="auto" w:fill="{EMERALD_HEX}"/></w:tcPr></w:tblStylePr>'
+        f'<w:tblStylePr w:type="band1Horz"><w:tcPr>'
+        f'<w:shd w:val="clear" w:color="auto" w:fill="{WHITE}"/></w:tcPr></w:tblStylePr>'
+        f'<w:tblStylePr w:type="band2Horz"><w:tcPr>'
+        f'<w:shd w:val="clear" w:color="auto" w:fill="{SLATE_50}"/></w:tcPr></w:tblStylePr>'
+        f'</w:style>'
+    ))
+
+
+def styled_paragraph(container, style_id, text=None):
+    p = container.add_paragraph(text)
+    p._p.style = style_id
     return p
 
 
-def add_h3(doc, text):
-    p = doc.add_paragraph()
-    run = p.add_run(text)
-    run.font.name = FONT
-    run.font.size = Pt(11)
-    run.font.color.rgb = SLATE_700
-    run.bold = True
-    set_paragraph_spacing(p, before=8, after=3)
+# ── Estilos de parágrafo ───────────────────────────────────────────────────────
+
+def add_heading(doc, level, text, anchor):
+    p = styled_paragraph(doc, STYLE_H[level - 1], text)
+    add_bookmark(p._p, anchor)
     return p
 
 
-def add_h4(doc, text):
-    p = doc.add_paragraph()
-    run = p.add_run(text)
-    run.font.name = FONT
-    run.font.size = Pt(10)
-    run.font.color.rgb = SLATE_700
-    run.bold = True
-    run.italic = True
-    set_paragraph_spacing(p, before=6, after=2)
+def add_h1(doc, data):
+    p = add_heading(doc, 1, *data)
+    # Underline accent
+    styled_paragraph(doc, STYLE_H1_RULE, "─" * 60)
     return p
 
 
+def add_h2(doc, data):
+    return add_heading(doc, 2, *data)
+
+
+def add_h3(doc, data):
+    return add_heading(doc, 3, *data)
+
+
+def add_h4(doc, data):
+    return add_heading(doc, 4, *data)
+
+
 def add_body(doc, text):
-    p = doc.add_paragraph()
-    apply_inline_bold(p, text)
-    set_paragraph_font(p, size=10, color=SLATE_900)
-    set_paragraph_spacing(p, before=0, after=4)
+    p = styled_paragraph(doc, STYLE_BODY)
+    apply_inline(p, text)
     return p
 
 
 def add_tip(doc, text):
     """Blockquote > as a highlighted tip box."""
-    table = doc.add_table(rows=1, cols=1)
-    table.alignment = WD_TABLE_ALIGNMENT.LEFT
-    remove_table_borders(table)
-    cell = table.cell(0, 0)
-    set_cell_bg(cell, AMBER_BG)
-    cell.width = Cm(16)
-
-    # Left border accent via XML
-    tc = cell._tc
-    tcPr = tc.get_or_add_tcPr()
-    borders = parse_xml(
-        f'<w:tcBorders {nsdecls("w")}>'
-        f'<w:left w:val="single" w:sz="16" w:color="{AMBER_BORDER}"/>'
-        f'</w:tcBorders>'
-    )
-    tcPr.append(borders)
-
-    p = cell.paragraphs[0]
-    apply_inline_bold(p, text)
-    p.paragraph_format.left_indent = Cm(0.3)
-    p.paragraph_format.space_before = Pt(4)
-    p.paragraph_format.space_after = Pt(4)
-    for run in p.runs:
-        run.font.name = FONT
-        run.font.size = Pt(9.5)
-        run.font.color.rgb = SLATE_700
-        run.italic = True
+    tbl = FRAGMENTS.get(tip_xml, str(Cm(16).twips))
+    append_runs(tbl.find(f'{W_TR}/{qn("w:tc")}/{qn("w:p")}'), text)
+    doc.element.body._insert_tbl(tbl)
 
     doc.add_paragraph().paragraph_format.space_after = Pt(2)
 
 
 def add_separator(doc):
-    p = doc.add_paragraph()
-    run = p.add_run()
-    run.font.size = Pt(4)
-    set_paragraph_spacing(p, before=6, after=6)
+    styled_paragraph(doc, STYLE_SEP)
+
+
+def add_toc(doc, entries):
+    """Sumário com links internos; os números de página são campos PAGEREF."""
+    styled_paragraph(doc, STYLE_H[1], "Sumário")
+    body = doc.element.body
+    for i, (text, anchor) in enumerate(entries, start=1):
+        bookmark = bookmark_name(anchor)
+        p = FRAGMENTS.get(toc_entry_xml)
+        link = p[1]
+        link.set(W_ANCHOR, bookmark)
+        link[0][0].text = f"{i}. {text}"
+        link[2].set(W_INSTR, f" PAGEREF {bookmark} \\h ")
+        body.sectPr.addprevious(p)
+
+
+# ── Bookmarks e referências cruzadas ───────────────────────────────────────────
+#
+# Cada título recebe uma âncora no formato do GitHub (a mesma usada nos links do
+# markdown) e um bookmark no docx com nome derivado dela, então os links podem
+# ser escritos sem consultar o resto do documento. O índice âncora → título é
+# montado durante o parse e usado só para conferir os links no fim do build.
+
+BOOKMARK_MAX = 40  # limite do Word para nomes de bookmark
+
+
+def bookmark_name(anchor):
+    """'2-navegacao' → '_2_navegacao' (bookmark oculto, como os _Toc do Word)."""
+    name = "_" + re.sub(r"\W", "_", anchor)
+    if len(name) > BOOKMARK_MAX:
+        name = name[:BOOKMARK_MAX - 9] + "_" + format(zlib.crc32(anchor.encode()), "08x")
+    return name
+
+
+def add_bookmark(p, anchor):
+    """Envolve o conteúdo do w:p num bookmark; o id vem do nome, estável entre builds."""
+    name = bookmark_name(anchor)
+    bm_id = str(zlib.crc32(name.encode()) & 0x7FFFFFFF)
+    start = etree.SubElement(p, W_BOOKMARK_START)
+    start.set(W_ID, bm_id)
+    start.set(W_NAME, name)
+    p.insert(1 if p[0].tag == W_PPR else 0, start)
+    etree.SubElement(p, W_BOOKMARK_END).set(W_ID, bm_id)
 
 
 # ── Tabelas ────────────────────────────────────────────────────────────────────
@@ -202,164 +449,202 @@ def add_separator(doc):
 def add_table_from_md(doc, rows_data):
     """
     rows_data: list of lists of strings (header row first, no separator row).
+
+    O w:tbl inteiro é montado de uma vez a partir de protótipos; cabeçalho,
+    zebra e bordas vêm do estilo FinAppTable, não de cada célula.
     """
     if not rows_data or len(rows_data) < 2:
         return
 
     col_count = len(rows_data[0])
-    table = doc.add_table(rows=len(rows_data), cols=col_count)
-    table.alignment = WD_TABLE_ALIGNMENT.LEFT
-    table.style = "Table Grid"
+    col_w = str(Emu(doc._block_width // col_count).twips)
+    tbl = FRAGMENTS.get(table_xml)
+    grid = tbl[1]
+    for _ in range(col_count):
+        etree.SubElement(grid, W_GRIDCOL).set(W_W, col_w)
 
+    header_tr = tbl[2]
     for r_idx, row in enumerate(rows_data):
-        for c_idx, cell_text in enumerate(row):
-            cell = table.cell(r_idx, c_idx)
-            p = cell.paragraphs[0]
-            p.clear()
-
-            is_header = (r_idx == 0)
-            text = cell_text.strip()
-
-            apply_inline_bold(p, text)
-
-            for run in p.runs:
-                run.font.name = FONT
-                run.font.size = Pt(9.5)
-                if is_header:
-                    run.bold = True
-                    run.font.color.rgb = RGBColor(0xFF, 0xFF, 0xFF)
-                else:
-                    run.font.color.rgb = SLATE_900
-
-            p.paragraph_format.space_before = Pt(3)
-            p.paragraph_format.space_after = Pt(3)
-            cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-
-            if is_header:
-                set_cell_bg(cell, EMERALD_HEX)
-            elif r_idx % 2 == 0:
-                set_cell_bg(cell, SLATE_50)
-            else:
-                set_cell_bg(cell, WHITE)
-
-    set_thin_border_table(table)
+        tr = header_tr if r_idx == 0 else etree.SubElement(tbl, W_TR)
+        style_id = STYLE_TH if r_idx == 0 else STYLE_TD
+        for c_idx in range(col_count):
+            tc = FRAGMENTS.get(cell_xml, style_id, col_w)
+            append_runs(tc[1], row[c_idx].strip() if c_idx < len(row) else "")
+            tr.append(tc)
+
+    doc.element.body._insert_tbl(tbl)
     doc.add_paragraph().paragraph_format.space_after = Pt(4)
 
 
-# ── Parser de markdown ─────────────────────────────────────────────────────────
-
-def parse_markdown(doc, content):
-    lines = content.split("\n")
-    i = 0
-    in_table = False
-    table_rows = []
-
-    def flush_table():
-        nonlocal in_table, table_rows
-        if table_rows:
-            add_table_from_md(doc, table_rows)
-        in_table = False
-        table_rows = []
-
-    while i < len(lines):
-        line = lines[i]
-
-        # Skip YAML front matter / title already handled
-        if line.startswith("# FinApp"):
-            i += 1
-            continue
-        if line.startswith("## Manual do Usuário"):
-            i += 1
-            continue
-        if line.startswith("**Versão") or line.startswith("**Data"):
-            i += 1
-            continue
-        if line.strip() == "---":
-            if in_table:
-                flush_table()
-            add_separator(doc)
-            i += 1
-            continue
-
-        # Sumário — skip
-        if line.strip() == "## Sumário":
-            while i < len(lines) and not lines[i].startswith("---") and not (lines[i].startswith("## ") and "Sumário" not in lines[i]):
-                i += 1
-            continue
-
-        # Table row
-        if line.strip().startswith("|"):
-            cells = [c.strip() for c in line.strip().strip("|").split("|")]
-            # Skip separator row (|:---:|---|)
-            if all(re.match(r'^:?-+:?$', c.strip()) for c in cells if c.strip()):
-                i += 1
-                continue
-            if not in_table:
-                in_table = True
-                table_rows = []
-            table_rows.append(cells)
-            i += 1
-            continue
-        else:
-            if in_table:
-                flush_table()
-
-        # Blank line
-        if not line.strip():
-            i += 1
-            continue
-
-        # Headings
-        if line.startswith("#### "):
-            add_h4(doc, line[5:].strip())
-        elif line.startswith("### "):
-            add_h3(doc, line[4:].strip())
-        elif line.startswith("## "):
-            add_h2(doc, line[3:].strip())
-        elif line.startswith("# "):
-            add_h1(doc, line[2:].strip())
-
-        # Blockquote / tip
-        elif line.startswith("> "):
-            text = line[2:].strip()
-            # Accumulate multi-line blockquotes
-            while i + 1 < len(lines) and lines[i + 1].startswith("> "):
-                i += 1
-                text += " " + lines[i][2:].strip()
-            add_tip(doc, text)
-
-        # Bullet list
-        elif line.startswith("- "):
-            text = line[2:].strip()
-            p = doc.add_paragraph(style="List Bullet")
-            apply_inline_bold(p, text)
-            for run in p.runs:
-                run.font.name = FONT
-                run.font.size = Pt(10)
-                run.font.color.rgb = SLATE_900
-            p.paragraph_format.space_before = Pt(1)
-            p.paragraph_format.space_after = Pt(1)
-            p.paragraph_format.left_indent = Cm(0.6)
-
-        # Numbered list (unlikely in this markdown, handle anyway)
-        elif re.match(r'^\d+\.\s', line):
-            text = re.sub(r'^\d+\.\s', '', line)
-            p = doc.add_paragraph(style="List Number")
-            apply_inline_bold(p, text)
-            for run in p.runs:
-                run.font.name = FONT
-                run.font.size = Pt(10)
-                run.font.color.rgb = SLATE_900
-
-        # Regular paragraph
-        else:
-            if line.strip():
-                add_body(doc, line.strip())
+# ── Renderização (AST → docx) ──────────────────────────────────────────────────
+
+def add_bullet(doc, text):
+    apply_inline(styled_paragraph(doc, STYLE_BULLET), text)
+
+
+def add_numbered(doc, text):
+    apply_inline(styled_paragraph(doc, STYLE_NUMBER), text)
+
+
+def skip_block(doc, data):
+    """Título e metadados vão para a capa."""
+
 
-        i += 1
+RENDERERS = {
+    "title":  skip_block,
+    "meta":   skip_block,
+    "toc":    add_toc,
+    "sep":    lambda doc, _: add_separator(doc),
+    "h1":     add_h1,
+    "h2":     add_h2,
+    "h3":     add_h3,
+    "h4":     add_h4,
+    "table":  add_table_from_md,
+    "tip":    add_tip,
+    "bullet": add_bullet,
+    "number": add_numbered,
+    "para":   add_body,
+    "image":  lambda doc, data: add_image(doc, *data),
+}
 
-    if in_table:
-        flush_table()
+
+def render_block(doc, kind, data):
+    with PROFILER.phase("render:" + kind):
+        RENDERERS[kind](doc, data)
+
+
+def render_blocks(doc, blocks):
+    for kind, data in blocks:
+        render_block(doc, kind, data)
+
+
+# ── Imagens ────────────────────────────────────────────────────────────────────
+#
+# Antes de renderizar, cada imagem referenciada é reduzida para caber na área
+# útil da página e recomprimida, num pool de processos. O resultado fica em
+# .cache/manual-imagens com o hash do arquivo de origem no nome, então
+# screenshots que não mudaram nunca são reprocessados.
+
+def image_hash(src):
+    h = hashlib.sha256(f"{IMAGE_DPI}:{IMAGE_MAX_W}:{IMAGE_MAX_H}:{IMAGE_QUALITY}:".encode())
+    with open(src, "rb") as f:
+        h.update(f.read())
+    return h.hexdigest()[:24]
+
+
+def cached_image(digest):
+    for ext in (".jpg", ".png"):
+        path = os.path.join(IMAGE_DIR, digest + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def process_image(src, digest):
+    """Redimensiona e recomprime uma imagem (roda nos workers do pool)."""
+    if Image is None:
+        dst = os.path.join(IMAGE_DIR, digest + os.path.splitext(src)[1].lower())
+        shutil.copyfile(src, dst)
+        return dst
+
+    max_w = round(IMAGE_MAX_W.inches * IMAGE_DPI)
+    max_h = round(IMAGE_MAX_H.inches * IMAGE_DPI)
+    with Image.open(src) as im:
+        im.thumbnail((max_w, max_h), Image.LANCZOS)
+        if im.mode in ("RGBA", "LA", "P"):
+            dst = os.path.join(IMAGE_DIR, digest + ".png")
+            im.save(dst, "PNG", optimize=True, dpi=(IMAGE_DPI, IMAGE_DPI))
+        else:
+            dst = os.path.join(IMAGE_DIR, digest + ".jpg")
+            im.convert("RGB").save(dst, "JPEG", quality=IMAGE_QUALITY, optimize=True,
+                                   progressive=True, dpi=(IMAGE_DPI, IMAGE_DPI))
+    return dst
+
+
+def process_images(sources, use_cache=True):
+    """Processa (em paralelo) as imagens que não estão no cache: {origem: processada}."""
+    os.makedirs(IMAGE_DIR, exist_ok=True)
+    processed = {}
+    pending = []
+    for src in sources:
+        digest = image_hash(src)
+        hit = cached_image(digest) if use_cache else None
+        if hit:
+            processed[src] = hit
+        else:
+            pending.append((src, digest))
+    if len(pending) > 1:
+        with ProcessPoolExecutor() as pool:
+            results = pool.map(process_image, *zip(*pending))
+            processed.update(zip((src for src, _ in pending), results))
+    elif pending:
+        processed[pending[0][0]] = process_image(*pending[0])
+
+    if use_cache:
+        keep = {os.path.basename(p) for p in processed.values()}
+        for name in os.listdir(IMAGE_DIR):
+            if name not in keep:
+                os.remove(os.path.join(IMAGE_DIR, name))
+    return processed
+
+
+def attach_images(key, blocks, processed, base_dir):
+    """
+    Troca o caminho de cada bloco de imagem pelo arquivo processado e inclui o
+    nome desse arquivo na chave de cache da seção.
+    """
+    names = []
+    new_blocks = []
+    for kind, data in blocks:
+        if kind == "image":
+            path = processed[os.path.normpath(os.path.join(base_dir, data[1]))]
+            names.append(os.path.basename(path))
+            data = (data[0], path)
+        new_blocks.append((kind, data))
+    if names:
+        key = hashlib.sha256((key + "\0" + "\0".join(names)).encode()).hexdigest()
+    return key, new_blocks
+
+
+def prepare_images(parsed, base_dir=SCRIPT_DIR, use_cache=True):
+    sources = {os.path.normpath(os.path.join(base_dir, data[1]))
+               for _, blocks in parsed for kind, data in blocks if kind == "image"}
+    processed = process_images(sources, use_cache)
+    return [attach_images(key, blocks, processed, base_dir) for key, blocks in parsed]
+
+
+def add_image(doc, alt, path):
+    _, image = doc.part.get_or_add_image(path)
+    width = min(IMAGE_MAX_W, Emu(round(image.px_width * Inches(1) / IMAGE_DPI)))
+    height = round(width * image.px_height / image.px_width)
+    if height > IMAGE_MAX_H:
+        width = round(width * IMAGE_MAX_H / height)
+    run = styled_paragraph(doc, STYLE_FIGURE).add_run()
+    run.add_picture(path, width=Emu(width))
+    if alt:
+        run._r.find(f'.//{qn("wp:docPr")}').set("descr", alt)
+        styled_paragraph(doc, STYLE_CAPTION, alt)
+
+
+# Nos fragmentos em cache, r:embed guarda o nome do arquivo processado em vez
+# do rId, que só vale para o documento em que a imagem foi inserida.
+RE_EMBED_RID = re.compile(rb'r:embed="(rId\d+)"')
+RE_EMBED_IMG = re.compile(rb'r:embed="img:([^"]+)"')
+RE_DOCPR_ID  = re.compile(rb'<wp:docPr id="\d+" name="Picture \d+"')
+
+
+def embeds_to_names(doc, fragment):
+    related = doc.part.related_parts
+    return RE_EMBED_RID.sub(
+        lambda m: b'r:embed="img:' + related[m.group(1).decode()].filename.encode() + b'"',
+        fragment)
+
+
+def names_to_embeds(doc, fragment):
+    def resolve(m):
+        r_id, _ = doc.part.get_or_add_image(os.path.join(IMAGE_DIR, m.group(1).decode()))
+        return b'r:embed="' + r_id.encode() + b'"'
+    return RE_EMBED_IMG.sub(resolve, fragment)
 
 
 # ── Capa ───────────────────────────────────────────────────────────────────────
@@ -428,32 +713,716 @@ def configure_page(doc):
     run_f.font.name = FONT
     run_f.font.size = Pt(8)
     run_f.font.color.rgb = SLATE_500
-    fld = parse_xml(
-        '<w:fldSimple xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
-        'w:instr=" PAGE "><w:r><w:rPr>'
-        '<w:rFonts w:ascii="Segoe UI" w:hAnsi="Segoe UI"/>'
-        '<w:sz w:val="16"/></w:rPr><w:t>1</w:t></w:r></w:fldSimple>'
+    fp._p.append(FRAGMENTS.get(page_field_xml))
+
+    # Pede ao Word que atualize os campos ao abrir (números de página do sumário);
+    # w:updateFields precisa vir antes de w:compat na ordem do schema
+    settings = doc.settings.element
+    compat = settings.find(qn("w:compat"))
+    if compat is not None:
+        compat.addprevious(FRAGMENTS.get(update_fields_xml))
+    else:
+        settings.append(FRAGMENTS.get(update_fields_xml))
+
+
+# ── Cache incremental por seção ────────────────────────────────────────────────
+
+GENERATOR_SOURCES = (os.path.abspath(__file__), os.path.abspath(manual_md.__file__))
+
+
+def generator_hash():
+    """Hash do gerador e do parser: qualquer mudança na renderização invalida o cache."""
+    digest = hashlib.sha256()
+    for path in GENERATOR_SOURCES:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def section_key(gen_hash, section, blocks):
+    """
+    O texto da seção define o conteúdo; as âncoras entram na chave porque o
+    sufixo de títulos repetidos depende das seções anteriores. O sumário
+    gerado também: vem dos títulos das outras seções.
+    """
+    anchors = [data[1] for kind, data in blocks if kind in HEADING_KINDS]
+    anchors += [part for kind, data in blocks if kind == "toc" for entry in data for part in entry]
+    return hashlib.sha256("\0".join([gen_hash, section, *anchors]).encode("utf-8")).hexdigest()
+
+
+RE_XMLNS = re.compile(rb' xmlns:\w+="[^"]*"')
+
+
+def serialize_block(el):
+    """
+    Serializa um filho de w:body sem as declarações de namespace que o lxml
+    repete em cada elemento; o elemento raiz do documento já declara todas.
+    """
+    xml = etree.tostring(el, encoding="UTF-8")
+    end = xml.index(b">")
+    return RE_XMLNS.sub(b"", xml[:end]) + xml[end:]
+
+
+def parse_fragment(doc, fragment):
+    nsdecl = " ".join(f'xmlns:{k}="{v}"' for k, v in doc.element.nsmap.items())
+    return list(parse_xml(f"<w:body {nsdecl}>".encode() + fragment + b"</w:body>"))
+
+
+def insert_fragment(doc, fragment):
+    """Anexa ao corpo um fragmento no formato do cache (imagens por nome de arquivo)."""
+    sect_pr = doc.element.body.sectPr
+    for el in parse_fragment(doc, names_to_embeds(doc, fragment)):
+        sect_pr.addprevious(el)
+
+
+def section_fragment(doc, start):
+    """Fragmento (formato do cache) dos elementos do corpo a partir da posição start."""
+    body = doc.element.body
+    new_elements = body[start:body.index(body.sectPr)]
+    return embeds_to_names(doc, b"".join(serialize_block(el) for el in new_elements))
+
+
+def write_cache(key, fragment):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(cache_path(key), "wb") as f:
+        f.write(fragment)
+
+
+def render_section_cached(doc, blocks, key, use_cache=True):
+    """
+    Renderiza uma seção no corpo do documento reaproveitando o fragmento OOXML
+    salvo em disco quando o conteúdo não mudou. Retorna True em caso de acerto.
+    """
+    body = doc.element.body
+    cache_file = cache_path(key)
+
+    if use_cache and os.path.exists(cache_file):
+        with PROFILER.phase("cache"):
+            with open(cache_file, "rb") as f:
+                insert_fragment(doc, f.read())
+        return True
+
+    start = body.index(body.sectPr)
+    render_blocks(doc, blocks)
+    if use_cache:
+        write_cache(key, section_fragment(doc, start))
+    return False
+
+
+def cache_path(key):
+    return os.path.join(CACHE_DIR, key + ".xml")
+
+
+def prune_cache(used_keys):
+    """Remove fragmentos de seções que não existem mais no manual."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(".xml") and name[:-4] not in used_keys:
+            os.remove(os.path.join(CACHE_DIR, name))
+
+
+# ── Renderização paralela por capítulo ─────────────────────────────────────────
+#
+# As seções (uma por '## ') que não estão no cache são renderizadas em processos
+# separados, cada uma num documento novo aberto do mesmo modelo base, e voltam
+# como fragmentos no formato do cache. Estilos e numeração (List Bullet / List
+# Number) vêm todos do modelo comum e os ids de bookmark derivam do nome, então
+# só as imagens precisam de reconciliação: o fragmento traz o nome do arquivo no
+# lugar do rId e o documento final cria as relações ao juntar (names_to_embeds).
+# Os ids de wp:docPr são renumerados no fim, como para os fragmentos do cache.
+
+def render_fragment(blocks):
+    """Roda no worker: blocos de uma seção → fragmento OOXML."""
+    doc = new_document()
+    start = doc.element.body.index(doc.element.body.sectPr)
+    render_blocks(doc, blocks)
+    return section_fragment(doc, start)
+
+
+def render_shards(sections, jobs):
+    """
+    {chave: fragmento} para [(chave, blocos)], em até jobs processos. As seções
+    maiores saem primeiro para equilibrar a carga entre os workers.
+    """
+    order = sorted(sections, key=lambda item: -len(item[1]))
+    with ProcessPoolExecutor(max_workers=min(jobs, len(order))) as pool:
+        fragments = pool.map(render_fragment, [blocks for _, blocks in order])
+        return {key: fragment for (key, _), fragment in zip(order, fragments)}
+
+
+# ── Backend streaming ──────────────────────────────────────────────────────────
+#
+# Em vez de montar o documento inteiro em memória, word/document.xml é escrito
+# direto no zip: cada bloco é renderizado no corpo de um Document "casca",
+# serializado e removido em seguida. As demais partes (estilos, cabeçalho,
+# rodapé, numeração) vêm da casca, salva depois do corpo.
+
+def split_document_xml(doc):
+    """Serializa o documento atual e separa o que vem antes/depois do w:sectPr final."""
+    xml = etree.tostring(doc.element, encoding="UTF-8", standalone=True)
+    idx = xml.rindex(b"<w:sectPr")
+    return xml[:idx], xml[idx:]
+
+
+def stream_section(doc, blocks, key, write, use_cache=True):
+    """Passa os bytes OOXML da seção para write(). Retorna True em caso de acerto no cache."""
+    cache_file = cache_path(key)
+    if use_cache and os.path.exists(cache_file):
+        with PROFILER.phase("cache"), open(cache_file, "rb") as f:
+            write(names_to_embeds(doc, f.read()))
+        return True
+
+    body = doc.element.body
+    sect_pr = body.sectPr
+    cache_out = None
+    if use_cache:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        cache_out = open(cache_file + ".tmp", "wb")
+    try:
+        for kind, data in blocks:
+            render_block(doc, kind, data)
+            while body[0] is not sect_pr:
+                el = body[0]
+                chunk = serialize_block(el)
+                write(chunk)
+                if cache_out:
+                    cache_out.write(embeds_to_names(doc, chunk))
+                body.remove(el)
+    finally:
+        if cache_out:
+            cache_out.close()
+    if cache_out:
+        os.replace(cache_file + ".tmp", cache_file)
+    return False
+
+
+def build_streaming(md_path=MD_PATH, out_path=OUT_PATH, use_cache=True, pack=None,
+                    image_cache=True):
+    pack = pack or {}
+    doc = new_document()
+
+    body = doc.element.body
+    prefix, suffix = split_document_xml(doc)
+    for el in list(body)[:-1]:
+        body.remove(el)
+
+    # Só as referências de imagem são lidas antes: o pool processa todas de uma vez
+    base_dir = os.path.dirname(os.path.abspath(md_path))
+    with open(md_path, encoding="utf-8") as md:
+        sources = {os.path.normpath(os.path.join(base_dir, m.group(2)))
+                   for m in (RE_IMAGE.fullmatch(line.strip()) for line in md) if m}
+    with PROFILER.phase("images"):
+        processed = process_images(sources, image_cache)
+
+    # O sumário sai antes dos capítulos: uma passada a mais pelo parser colhe os
+    # títulos ## (índice próprio, para as âncoras saírem iguais às da escrita)
+    with PROFILER.phase("parse"), open(md_path, encoding="utf-8") as md:
+        toc_index = {}
+        toc = toc_entries(parse_markdown(section, toc_index) for section in iter_sections(md))
+
+    # Os blocos já escritos saem do corpo, então o python-docx não enxerga os ids
+    # de wp:docPr usados antes: a numeração é refeita na saída
+    pic_ids = itertools.count(1)
+
+    def write_chunk(chunk):
+        out.write(RE_DOCPR_ID.sub(
+            lambda m: b'<wp:docPr id="%d" name="Picture %d"' % ((next(pic_ids),) * 2), chunk))
+
+    gen_hash = generator_hash()
+    used_keys = set()
+    index = {}
+    links = []
+    hits = total = 0
+    tmp_path = out_path + ".partial"
+    with pacote.open_zip(tmp_path, **pack) as zf:
+        with pacote.stream_entry(zf, "word/document.xml", **pack) as out, \
+                open(md_path, encoding="utf-8") as md:
+            out.write(prefix)
+            for section in iter_sections(md):
+                with PROFILER.phase("parse"):
+                    blocks = parse_markdown(section, index)
+                    fill_toc([blocks], toc)
+                key, blocks = attach_images(section_key(gen_hash, section, blocks),
+                                            blocks, processed, base_dir)
+                used_keys.add(key)
+                links.append((None, [(kind, data) for kind, data in blocks
+                                     if block_links(kind, data) or kind in HEADING_KINDS]))
+                total += 1
+                if stream_section(doc, blocks, key, write_chunk, use_cache):
+                    hits += 1
+            out.write(suffix)
+
+        with PROFILER.phase("save"):
+            shell = io.BytesIO()
+            doc.save(shell)
+            with zipfile.ZipFile(shell) as src:
+                parts = {item.filename: src.read(item) for item in src.infolist()
+                         if item.filename != "word/document.xml"}
+            pacote.write_parts(zf, parts, **pack)
+    written, digest = pacote.replace_if_changed(tmp_path, out_path)
+    if use_cache:
+        prune_cache(used_keys)
+
+    print(pacote.describe("Manual (streaming)", out_path, written, digest))
+    print(f"Seções: {hits} do cache, {total - hits} renderizadas")
+    for line in link_report(links, index):
+        print(line)
+
+
+# ── Saída HTML / EPUB ──────────────────────────────────────────────────────────
+#
+# Mesmo AST, outros renderizadores: um site HTML com uma página por capítulo
+# ("## N ...") e um EPUB 3 com o mesmo XHTML. As cores vêm do tema acima.
+
+HTML_MARKS = (("b", "strong"), ("i", "em"), ("code", "code"))
+
+
+def inline_html(text, links):
+    out = []
+    for href, group in itertools.groupby(inline_tokens(text), key=lambda tok: tok[2]):
+        inner = []
+        for part, marks, _ in group:
+            tags = [tag for mark, tag in HTML_MARKS if mark in marks]
+            inner.append("".join(f"<{t}>" for t in tags) + html.escape(part)
+                         + "".join(f"</{t}>" for t in reversed(tags)))
+        if href:
+            href = links.get(href[1:], href) if href.startswith("#") else href
+            out.append(f'<a href="{html.escape(href)}">{"".join(inner)}</a>')
+        else:
+            out.extend(inner)
+    return "".join(out)
+
+
+def split_chapters(parsed):
+    """Separa as seções em (blocos do índice, [(âncora, título, blocos)])."""
+    front, chapters = [], []
+    for _, blocks in parsed:
+        if blocks and blocks[0][0] == "h2":
+            title, anchor = blocks[0][1]
+            chapters.append((anchor, title, blocks))
+        else:
+            front.extend(blocks)
+    return front, chapters
+
+
+def blocks_to_html(blocks, links):
+    """links: âncora → href já apontando para a página do capítulo certo."""
+    out = []
+    open_list = None
+
+    def close_list():
+        nonlocal open_list
+        if open_list:
+            out.append(f"</{open_list}>")
+            open_list = None
+
+    for kind, data in blocks:
+        list_tag = {"bullet": "ul", "number": "ol"}.get(kind)
+        if list_tag != open_list:
+            close_list()
+            if list_tag:
+                out.append(f"<{list_tag}>")
+                open_list = list_tag
+        if list_tag:
+            out.append(f"<li>{inline_html(data, links)}</li>")
+        elif kind in HEADING_KINDS:
+            text, anchor = data
+            out.append(f'<{kind} id="{anchor}">{html.escape(text)}</{kind}>')
+        elif kind == "para":
+            out.append(f"<p>{inline_html(data, links)}</p>")
+        elif kind == "tip":
+            out.append(f'<aside class="tip"><p>{inline_html(data, links)}</p></aside>')
+        elif kind == "sep":
+            out.append("<hr/>")
+        elif kind == "table" and len(data) >= 2:
+            cols = len(data[0])
+            head = "".join(f"<th>{inline_html(c, links)}</th>" for c in data[0])
+            body = "".join(
+                "<tr>" + "".join(f"<td>{inline_html(c, links)}</td>" for c in (row + [""] * cols)[:cols])
+                + "</tr>"
+                for row in data[1:])
+            out.append(f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>")
+        elif kind == "toc":
+            items = "".join(f'<li><a href="{html.escape(links.get(anchor, "#" + anchor))}">'
+                            f'{html.escape(text)}</a></li>' for text, anchor in data)
+            out.append(f'<nav class="toc"><h2>Sumário</h2><ol>{items}</ol></nav>')
+        elif kind == "meta":
+            out.append(f'<p class="meta">{inline_html(data, links)}</p>')
+        elif kind == "image":
+            alt, path = data
+            caption = f"<figcaption>{html.escape(alt)}</figcaption>" if alt else ""
+            out.append(f'<figure><img src="img/{os.path.basename(path)}" alt="{html.escape(alt)}"/>'
+                       f'{caption}</figure>')
+    close_list()
+    return "\n".join(out)
+
+
+def manual_css():
+    return f"""body {{ font-family: "{FONT}", sans-serif; color: #{SLATE_900}; max-width: 46rem;
+  margin: 2rem auto; padding: 0 1rem; line-height: 1.5; font-size: 10.5pt; }}
+h1, h2 {{ color: #{EMERALD_HEX}; }}
+h1 {{ font-size: 22pt; border-bottom: 2px solid #{EMERALD_HEX}; }}
+h2 {{ font-size: 14pt; }}
+h3, h4 {{ color: #{SLATE_700}; font-size: 11pt; }}
+h4 {{ font-style: italic; font-size: 10pt; }}
+a {{ color: #{EMERALD_HEX}; }}
+hr {{ border: 0; border-top: 1px solid #{SLATE_200}; margin: 1.5rem 0; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 9.5pt; margin: .5rem 0 1rem; }}
+th, td {{ border: 1px solid #{SLATE_200}; padding: 3pt 6pt; text-align: left; }}
+th {{ background: #{EMERALD_HEX}; color: #{WHITE}; }}
+tbody tr:nth-child(even) {{ background: #{SLATE_50}; }}
+.tip {{ background: #{AMBER_BG}; border-left: 4px solid #{AMBER_BORDER}; color: #{SLATE_700};
+  font-style: italic; font-size: 9.5pt; padding: 2pt 10pt; margin: .5rem 0 1rem; }}
+.meta, .pager {{ color: #{SLATE_500}; }}
+.toc {{ background: #{EMERALD_BG}; padding: .5rem 1rem; }}
+figure {{ margin: 1rem 0; text-align: center; }}
+figure img {{ max-width: 100%; max-height: 80vh; border: 1px solid #{SLATE_200}; }}
+figcaption {{ color: #{SLATE_500}; font-size: 9pt; font-style: italic; }}
+code {{ font-family: "{CODE_FONT}", monospace; font-size: 9pt; background: #{SLATE_100};
+  padding: 0 2pt; }}
+"""
+
+
+def html_page(title, body, xhtml=False):
+    head = ('<?xml version="1.0" encoding="UTF-8"?>\n<!DOCTYPE html>\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" '
+            'lang="pt-BR" xml:lang="pt-BR">' if xhtml else '<!DOCTYPE html>\n<html lang="pt-BR">')
+    return (f'{head}\n<head><meta charset="utf-8"/><title>{html.escape(title)}</title>'
+            f'<link rel="stylesheet" href="style.css"/></head>\n<body>\n{body}\n</body>\n</html>\n')
+
+
+def render_pages(parsed, ext):
+    """Gera [(nome do arquivo, título, html do corpo)]: índice + um arquivo por capítulo."""
+    front, chapters = split_chapters(parsed)
+    names = ["index." + ext] + [f"{anchor}.{ext}" for anchor, _, _ in chapters]
+    # Âncora → página que contém o título; o título do capítulo aponta para a página
+    links = {data[1]: f"{names[0]}#{data[1]}" for kind, data in front if kind in HEADING_KINDS}
+    for name, (_, _, blocks) in zip(names[1:], chapters):
+        links.update((data[1], f"{name}#{data[1]}") for kind, data in blocks[1:]
+                     if kind in HEADING_KINDS)
+        links[blocks[0][1][1]] = name
+    pages = [(names[0], "FinApp — Manual do Usuário",
+              "<h1>FinApp</h1>\n" + blocks_to_html(front, links))]
+    for i, (_, title, blocks) in enumerate(chapters, start=1):
+        nav = [f'<a href="{names[0]}">Sumário</a>']
+        if i > 1:
+            nav.insert(0, f'<a href="{names[i - 1]}">← Anterior</a>')
+        if i < len(chapters):
+            nav.append(f'<a href="{names[i + 1]}">Próximo →</a>')
+        pager = f'<p class="pager">{" · ".join(nav)}</p>'
+        pages.append((names[i], title, blocks_to_html(blocks, links) + "\n" + pager))
+    return pages
+
+
+def image_paths(parsed):
+    return sorted({data[1] for _, blocks in parsed for kind, data in blocks if kind == "image"})
+
+
+def render_html(parsed, use_cache=True, out_dir=HTML_DIR, pack=None):
+    """Grava só os arquivos que mudaram; pack (compressão) não se aplica ao HTML."""
+    os.makedirs(os.path.join(out_dir, "img"), exist_ok=True)
+    files = {os.path.join("img", os.path.basename(path)): read_bytes(path)
+             for path in image_paths(parsed)}
+    pages = render_pages(parsed, "html")
+    files.update((name, html_page(title, body).encode("utf-8")) for name, title, body in pages)
+    files["style.css"] = manual_css().encode("utf-8")
+    written = sum(pacote.write_if_changed(data, os.path.join(out_dir, name))[0]
+                  for name, data in files.items())
+    return [f"HTML gerado: {out_dir} ({len(pages)} páginas, {written} arquivo(s) alterado(s))"]
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def render_epub(parsed, use_cache=True, out_path=EPUB_PATH, pack=None):
+    pages = render_pages(parsed, "xhtml")
+    book_id = "urn:sha256:" + hashlib.sha256(
+        "".join(body for _, _, body in pages).encode("utf-8")).hexdigest()
+    modified = pacote.BUILD_DATE.strftime("%Y-%m-%dT%H:%M:%SZ")
+    images = image_paths(parsed)
+    manifest = "".join(f'<item id="p{i}" href="{name}" media-type="application/xhtml+xml"/>'
+                       for i, (name, _, _) in enumerate(pages))
+    manifest += "".join(
+        f'<item id="img{i}" href="img/{os.path.basename(path)}" '
+        f'media-type="{"image/png" if path.endswith(".png") else "image/jpeg"}"/>'
+        for i, path in enumerate(images))
+    spine = "".join(f'<itemref idref="p{i}"/>' for i in range(len(pages)))
+    nav_items = "".join(f'<li><a href="{name}">{html.escape(title)}</a></li>'
+                        for name, title, _ in pages[1:])
+    opf = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="bookid">'
+        '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        f'<dc:identifier id="bookid">{book_id}</dc:identifier>'
+        '<dc:title>FinApp — Manual do Usuário</dc:title><dc:language>pt-BR</dc:language>'
+        f'<meta property="dcterms:modified">{modified}</meta></metadata>'
+        '<manifest><item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>'
+        f'<item id="css" href="style.css" media-type="text/css"/>{manifest}</manifest>'
+        f'<spine>{spine}</spine></package>'
     )
-    fp._p.append(fld)
+    container = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+        '<rootfiles><rootfile full-path="OEBPS/content.opf" '
+        'media-type="application/oebps-package+xml"/></rootfiles></container>'
+    )
+    nav = html_page("Sumário", f'<nav epub:type="toc"><h1>Sumário</h1><ol>{nav_items}</ol></nav>',
+                    xhtml=True)
+
+    parts = {
+        "mimetype": b"application/epub+zip",
+        "META-INF/container.xml": container.encode("utf-8"),
+        "OEBPS/content.opf": opf.encode("utf-8"),
+        "OEBPS/nav.xhtml": nav.encode("utf-8"),
+        "OEBPS/style.css": manual_css().encode("utf-8"),
+    }
+    parts.update(("OEBPS/" + name, html_page(title, body, xhtml=True).encode("utf-8"))
+                 for name, title, body in pages)
+    parts.update(("OEBPS/img/" + os.path.basename(path), read_bytes(path)) for path in images)
+    written, digest = pacote.pack_parts(parts, out_path, **(pack or {}))
+    return [pacote.describe("EPUB", out_path, written, digest)]
+
+
+# ── Modo watch ─────────────────────────────────────────────────────────────────
+
+# Módulos auxiliares recarregados pelo watch quando mudam (dependências primeiro)
+HELPERS = (perfil, pacote, manual_md)
+
+
+def load_fresh_generator(changed=()):
+    """Reexecuta este arquivo como módulo novo; docx/lxml continuam em sys.modules."""
+    return observador.load_fresh(__file__, "gerar_manual", HELPERS, changed)
 
 
 # ── Main ───────────────────────────────────────────────────────────────────────
 
+def parse_sections(md_path=MD_PATH):
+    """
+    Lê e parseia o manual uma vez: [(chave de cache, blocos)] por seção e o
+    índice de títulos (âncora → título).
+    """
+    gen_hash = generator_hash()
+    index = {}
+    with PROFILER.phase("read"), open(md_path, encoding="utf-8") as md:
+        lines = md.readlines()
+    with PROFILER.phase("parse"):
+        sections = list(iter_sections(lines))
+        blocks = [parse_markdown(section, index) for section in sections]
+        # O sumário depende dos títulos de todas as seções: é preenchido antes
+        # das chaves, para o cache da seção dele mudar junto com os títulos
+        fill_toc(blocks)
+        parsed = [(section_key(gen_hash, section, b), b) for section, b in zip(sections, blocks)]
+    return parsed, index
+
+
+# Estilos, página e capa não dependem do markdown: saem de um modelo base gerado
+# uma vez por versão do tema (cores, fontes, ids de estilo e o código que o monta)
+
+TEMPLATE_PHASES = ("styles", "page setup", "cover")  # as fases de build_template()
+TEMPLATE_STATE = None  # "hit" ou "miss" do último new_document(), para o --profile
+
+
+def build_template():
+    """Pacote base do manual: estilos, cabeçalho/rodapé, configurações e capa."""
+    with PROFILER.phase("styles"):
+        doc = Document()
+        register_styles(doc)
+    with PROFILER.phase("page setup"):
+        configure_page(doc)
+    with PROFILER.phase("cover"):
+        add_cover(doc)
+    pacote.stamp_core_properties(doc.core_properties, "FinApp — Manual do Usuário")
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+TEMPLATE_BUILDERS = (build_template, register_styles, _add_style, configure_page, add_cover,
+                     outline_lvl_xml, page_field_xml, update_fields_xml)
+
+
+@functools.lru_cache(maxsize=None)
+def template_version():
+    return pacote.template_version(pacote.theme_constants(globals()), TEMPLATE_BUILDERS,
+                                   "python-docx", docx.__version__)
+
+
+def new_document():
+    """Documento com estilos, página (cabeçalho/rodapé) e capa, pronto para o corpo."""
+    global TEMPLATE_STATE
+    t0 = time.perf_counter()
+    with PROFILER.phase("template"):
+        data, fresh = pacote.cached_template("manual.docx", template_version(), build_template)
+        doc = Document(io.BytesIO(data))
+    TEMPLATE_STATE = "miss" if fresh else "hit"
+    # Com o modelo em cache, build_template() não roda e as fases dele sumiriam
+    # do perfil: ficam com o tempo de carregar o modelo, de onde as três saem
+    if not fresh and PROFILER.enabled:
+        wall = time.perf_counter() - t0
+        for name in TEMPLATE_PHASES:
+            PROFILER.record(name, wall)
+    return doc
+
+
+def render_docx(parsed, use_cache=True, out_path=OUT_PATH, pack=None, jobs=1):
+    doc = new_document()
+
+    # Com mais de uma seção a renderizar, os capítulos vão para o pool; o resto
+    # do caminho (cache, junção, imagens) é o mesmo do build em série
+    missing = {key: blocks for key, blocks in parsed
+               if not (use_cache and os.path.exists(cache_path(key)))}
+    shards = {}
+    if jobs > 1 and len(missing) > 1:
+        with PROFILER.phase("shards"):
+            shards = render_shards(list(missing.items()), jobs)
+
+    hits = 0
+    for key, blocks in parsed:
+        if key in shards:
+            with PROFILER.phase("merge"):
+                insert_fragment(doc, shards[key])
+            if use_cache:
+                write_cache(key, shards[key])
+        elif render_section_cached(doc, blocks, key, use_cache):
+            hits += 1
+    # Fragmentos do cache trazem ids de wp:docPr de builds diferentes
+    for pic_id, doc_pr in enumerate(doc.element.body.iter(qn("wp:docPr")), start=1):
+        doc_pr.set("id", str(pic_id))
+        doc_pr.set("name", f"Picture {pic_id}")
+    if use_cache:
+        prune_cache({key for key, _ in parsed})
+
+    with PROFILER.phase("save"):
+        written, digest = pacote.save_package(doc.save, out_path, **(pack or {}))
+    frag = FRAGMENTS.stats()
+    return [
+        pacote.describe("Manual", out_path, written, digest),
+        f"Seções: {hits} do cache, {len(parsed) - hits} renderizadas"
+        + (f" em {min(jobs, len(shards))} processos" if shards else ""),
+        f"Fragmentos OOXML: {frag['fragments']} protótipos, "
+        f"{frag['hits']} reaproveitados, {frag['misses']} parseados",
+    ]
+
+
+TARGETS = {
+    "docx": render_docx,
+    "html": render_html,
+    "epub": render_epub,
+}
+
+
+def render_target(fmt, parsed, use_cache, pack=None, jobs=1):
+    # Só o docx divide o trabalho por capítulo (render_shards)
+    extra = {"jobs": jobs} if fmt == "docx" else {}
+    return TARGETS[fmt](parsed, use_cache=use_cache, pack=pack, **extra)
+
+
+def build(md_path=MD_PATH, formats=("docx",), use_cache=True, pack=None, jobs=1,
+          image_cache=True):
+    """
+    Parseia o manual uma vez e distribui o AST para os renderizadores pedidos.
+    use_cache vale para as seções; image_cache, para as imagens já processadas.
+    Com mais de um formato, cada um roda num processo do pool (em série com
+    --profile, para as fases de todos os formatos caírem no mesmo relatório).
+    Os capítulos do docx só são divididos entre processos (jobs) quando os
+    formatos rodam em série; no pool de formatos cada um já ocupa um processo.
+    """
+    parsed, index = parse_sections(md_path)
+    with PROFILER.phase("images"):
+        parsed = prepare_images(parsed, os.path.dirname(os.path.abspath(md_path)), image_cache)
+    if len(formats) == 1 or PROFILER.enabled:
+        reports = []
+        for fmt in formats:
+            with PROFILER.phase(fmt):
+                reports.append(render_target(fmt, parsed, use_cache, pack, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=len(formats)) as pool:
+            futures = [pool.submit(render_target, fmt, parsed, use_cache, pack)
+                       for fmt in formats]
+            reports = [f.result() for f in futures]
+    with PROFILER.phase("links"):
+        reports.append(link_report(parsed, index))
+    for lines in reports:
+        for line in lines:
+            print(line)
+
+
 def main():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    md_path   = os.path.join(script_dir, "manual-usuario.md")
-    out_path  = os.path.join(script_dir, "FinApp - Manual do Usuario.docx")
+    # Sem abreviações: "--chec" não passa pelo desvio do --check lá em cima
+    parser = argparse.ArgumentParser(description="Gera o Manual do Usuário (.docx, HTML, EPUB)",
+                                     allow_abbrev=False)
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignora o cache de seções e renderiza todos os capítulos "
+                             "(as imagens continuam no cache; ver --no-image-cache)")
+    parser.add_argument("--no-image-cache", action="store_true",
+                        help="reprocessa todas as imagens com o Pillow")
+    parser.add_argument("--watch", action="store_true",
+                        help="reconstrói a cada alteração do markdown ou do gerador")
+    parser.add_argument("--stream", action="store_true",
+                        help="escreve o document.xml direto no zip (memória constante; só docx)")
+    parser.add_argument("--formats", default="docx",
+                        help="formatos separados por vírgula: docx,html,epub (padrão: docx)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, metavar="N",
+                        help="processos para renderizar os capítulos do docx que não estão "
+                             "no cache (padrão: número de CPUs; 1 desliga)")
+    parser.add_argument("--compression", choices=sorted(pacote.COMPRESSION), default="deflate",
+                        help="compressão do docx/epub; store é mais rápido para builds de "
+                             "desenvolvimento (padrão: deflate)")
+    parser.add_argument("--level", type=int, choices=range(10), default=pacote.DEFAULT_LEVEL,
+                        metavar="0-9", help="nível do deflate (padrão: %(default)s)")
+    parser.add_argument("--check", nargs="?", const=MD_PATH, metavar="ARQUIVO",
+                        help="só valida o markdown (tabelas, **, dicas, títulos, links), "
+                             "sem carregar python-docx")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_PATH, metavar="ARQUIVO",
+                        help="grava tempo e alocações por fase em JSON "
+                             f"(padrão: {os.path.relpath(PROFILE_PATH, SCRIPT_DIR)})")
+    args = parser.parse_args()
+
+    formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+    unknown = [f for f in formats if f not in TARGETS]
+    if unknown:
+        parser.error(f"formato desconhecido: {', '.join(unknown)}")
+    if args.stream and formats != ("docx",):
+        parser.error("--stream só gera docx")
+    if args.jobs < 1:
+        parser.error("--jobs precisa ser pelo menos 1")
+
+    use_cache = not args.no_cache
+    image_cache = not args.no_image_cache
+    pack = {"compression": args.compression, "level": args.level}
+
+    def run(generator):
+        if args.profile:
+            generator.PROFILER.start(since=generator.IMPORT_T0)
+            generator.PROFILER.record("import", generator.IMPORT_WALL, *generator.IMPORT_MEM)
+        if args.stream:
+            generator.build_streaming(use_cache=use_cache, pack=pack, image_cache=image_cache)
+        else:
+            generator.build(formats=formats, use_cache=use_cache, pack=pack, jobs=args.jobs,
+                            image_cache=image_cache)
+        if args.profile:
+            generator.PROFILER.dump(args.profile, "gerar-manual", formats=list(formats),
+                                    stream=args.stream, cache=use_cache,
+                                    image_cache=image_cache, jobs=args.jobs,
+                                    template=generator.TEMPLATE_STATE)
+
+    generator = sys.modules[__name__]
+    run(generator)
+    if not args.watch:
+        return
 
-    with open(md_path, encoding="utf-8") as f:
-        content = f.read()
+    sources = {os.path.abspath(__file__), *observador.sources(HELPERS)}
 
-    doc = Document()
-    configure_page(doc)
-    add_cover(doc)
-    parse_markdown(doc, content)
+    def rebuild(changed):
+        nonlocal generator
+        if changed & sources:
+            generator = load_fresh_generator(changed)
+        run(generator)
 
-    doc.save(out_path)
-    print(f"Manual gerado: {out_path}")
+    observador.watch([MD_PATH, *sorted(sources)], rebuild)
 
 
 if __name__ == "__main__":
@@ -4,13 +4,56 @@ Visual moderno, dados reais, narrativa persuasiva.
 14 slides — marco 2026
 """
 
+import io
+import os
+import sys
+import time
+import re
+import csv
+import json
+import heapq
+import hashlib
+import inspect
+import argparse
+import functools
+import tracemalloc
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
+from perfil import Profiler
+import perfil
+import pacote
+import observador
+import metricas
+import transacoes
+import miniaturas
+
+# Com --profile, o custo dos imports pesados abaixo entra no relatorio
+IMPORT_T0 = time.perf_counter()
+if "--profile" in sys.argv:
+    tracemalloc.start()
+
+import pptx
 from pptx import Presentation
 from pptx.util import Inches, Pt, Cm, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
-from pptx.oxml.ns import qn
-import os
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION, XL_LABEL_POSITION
+from pptx.oxml import parse_xml
+from pptx.oxml.xmlchemy import OxmlElement
+from pptx.oxml.ns import qn, nsdecls
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from lxml import etree
+
+IMPORT_WALL = time.perf_counter() - IMPORT_T0
+IMPORT_MEM = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUT_PATH = os.path.join(SCRIPT_DIR, "FinApp - Pitch Deck.pptx")
+SPEC_PATH = os.path.join(SCRIPT_DIR, "pitch-deck.json")
+PROFILE_PATH = os.path.join(SCRIPT_DIR, ".cache", "perfil-pitch.json")
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache", "pitch-slides")
+PROFILER = Profiler()
 
 # ── Paleta de cores ────────────────────────────────────────────────────────────
 EMERALD_600 = RGBColor(0x05, 0x96, 0x69)
@@ -49,6 +92,9 @@ FONT        = "Segoe UI"
 W           = Inches(13.333)
 H           = Inches(7.5)
 
+P_NV_GRP_SP_PR = qn("p:nvGrpSpPr")
+P_GRP_SP_PR    = qn("p:grpSpPr")
+
 
 # ── Helpers base ───────────────────────────────────────────────────────────────
 
@@ -156,98 +202,936 @@ def deco_circle(slide, l, t, size, color=SLATE_800):
     oval(slide, l, t, size, size, color)
 
 
+# ── Instancias de componentes ──────────────────────────────────────────────────
+#
+# Os componentes repetidos (cards, pills, listas) sao desenhados uma vez por
+# geometria: em (0, 0), com marcadores no lugar dos textos e das cores. As
+# formas ficam guardadas como carimbo; cada uso copia o carimbo, desloca as
+# formas, renumera os ids e troca marcadores por textos e cores reais. O XML
+# resultante e o mesmo que os helpers acima gerariam.
+
+A_R   = qn("a:r")
+A_T   = qn("a:t")
+A_BR  = qn("a:br")
+A_OFF = qn("a:off")
+A_CLR = qn("a:srgbClr")
+P_CNV_PR = qn("p:cNvPr")
+
+_STAMPS = {}
+
+
+def _marker_text(i):
+    return f"\u27e6{i}\u27e7"
+
+
+def _marker_color(i):
+    return RGBColor(0x01, 0x02, i)
+
+
+def make_stamp(slide, draw, n_texts, n_colors):
+    """Desenha o componente com marcadores e tira as formas do slide."""
+    sp_tree = slide.shapes._spTree
+    first = len(sp_tree)
+    draw(slide, 0, 0, [_marker_text(i) for i in range(n_texts)],
+         [_marker_color(i) for i in range(n_colors)])
+    shapes = sp_tree[first:]
+    for el in shapes:
+        sp_tree.remove(el)
+    return shapes
+
+
+def _fill_text(run, text, paragraph):
+    """
+    Poe text no lugar da run marcadora. paragraph: o componente usa p.text, que
+    vira uma run por linha com quebras entre elas; senao e run.text, literal.
+    """
+    if not paragraph:
+        run.text = text
+        return
+    parent = run.getparent()
+    pos = parent.index(run)
+    parent.remove(run)
+    for idx, line in enumerate(re.split("\n|\v", text)):
+        if idx > 0:
+            parent.insert(pos, OxmlElement("a:br"))
+            pos += 1
+        if line:
+            piece = deepcopy(run)
+            piece.text = line
+            parent.insert(pos, piece)
+            pos += 1
+
+
+def instance(slide, key, draw, l, t, texts, colors, paragraph=True):
+    """
+    Desenha o componente identificado por key (tudo o que muda a geometria) em
+    (l, t). draw(slide, l, t, texts, colors) e o desenho direto, usado so na
+    primeira vez de cada key; paragraph diz se os textos entram via p.text.
+    """
+    stamp = _STAMPS.get(key)
+    if stamp is None:
+        stamp = _STAMPS[key] = make_stamp(slide, draw, len(texts), len(colors))
+    texts = {_marker_text(i): text for i, text in enumerate(texts)}
+    colors = {str(_marker_color(i)): str(color) for i, color in enumerate(colors)}
+
+    sp_tree = slide.shapes._spTree
+    shape_id = slide.shapes._next_shape_id
+    for template in stamp:
+        el = deepcopy(template)
+        c_nv_pr = el.find(f".//{P_CNV_PR}")
+        c_nv_pr.set("id", str(shape_id))
+        c_nv_pr.set("name", f"{c_nv_pr.get('name').rsplit(' ', 1)[0]} {shape_id - 1}")
+        shape_id += 1
+        off = el.find(f".//{A_OFF}")
+        off.set("x", str(int(off.get("x")) + l))
+        off.set("y", str(int(off.get("y")) + t))
+        for clr in el.iter(A_CLR):
+            if clr.get("val") in colors:
+                clr.set("val", colors[clr.get("val")])
+        for run in list(el.iter(A_R)):
+            marker = run.find(A_T).text
+            if marker in texts:
+                _fill_text(run, texts[marker], paragraph)
+        sp_tree.insert_element_before(el, "p:extLst")
+
+
 def checklist(slide, l, t, w, items, size=Pt(13), color=EMERALD_600, text_color=SLATE_700, gap=Pt(10)):
-    tb = slide.shapes.add_textbox(l, t, w, Inches(len(items) * 0.5))
-    tf = tb.text_frame
-    tf.word_wrap = True
-    for i, item in enumerate(items):
-        p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
-        r1 = p.add_run()
-        r1.text = "\u2713  "
-        r1.font.name = FONT
-        r1.font.size = size
-        r1.font.color.rgb = color
-        r1.font.bold = True
-        r2 = p.add_run()
-        r2.text = item
-        r2.font.name = FONT
-        r2.font.size = size
-        r2.font.color.rgb = text_color
-        p.space_after = gap
+    def draw(slide, l, t, items, colors):
+        color, text_color = colors
+        tb = slide.shapes.add_textbox(l, t, w, Inches(len(items) * 0.5))
+        tf = tb.text_frame
+        tf.word_wrap = True
+        for i, item in enumerate(items):
+            p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+            r1 = p.add_run()
+            r1.text = "\u2713  "
+            r1.font.name = FONT
+            r1.font.size = size
+            r1.font.color.rgb = color
+            r1.font.bold = True
+            r2 = p.add_run()
+            r2.text = item
+            r2.font.name = FONT
+            r2.font.size = size
+            r2.font.color.rgb = text_color
+            p.space_after = gap
+
+    instance(slide, ("checklist", w, len(items), size, gap), draw, l, t,
+             items, (color, text_color), paragraph=False)
 
 
 def xlist(slide, l, t, w, items, size=Pt(12.5), color=ROSE_500, text_color=SLATE_600):
-    tb = slide.shapes.add_textbox(l, t, w, Inches(len(items) * 0.5))
-    tf = tb.text_frame
-    tf.word_wrap = True
-    for i, item in enumerate(items):
-        p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
-        r1 = p.add_run()
-        r1.text = "\u2717  "
-        r1.font.name = FONT
-        r1.font.size = size
-        r1.font.color.rgb = color
-        r1.font.bold = True
-        r2 = p.add_run()
-        r2.text = item
-        r2.font.name = FONT
-        r2.font.size = size
-        r2.font.color.rgb = text_color
-        p.space_after = Pt(6)
+    def draw(slide, l, t, items, colors):
+        color, text_color = colors
+        tb = slide.shapes.add_textbox(l, t, w, Inches(len(items) * 0.5))
+        tf = tb.text_frame
+        tf.word_wrap = True
+        for i, item in enumerate(items):
+            p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+            r1 = p.add_run()
+            r1.text = "\u2717  "
+            r1.font.name = FONT
+            r1.font.size = size
+            r1.font.color.rgb = color
+            r1.font.bold = True
+            r2 = p.add_run()
+            r2.text = item
+            r2.font.name = FONT
+            r2.font.size = size
+            r2.font.color.rgb = text_color
+            p.space_after = Pt(6)
+
+    instance(slide, ("xlist", w, len(items), size), draw, l, t, items, (color, text_color),
+             paragraph=False)
 
 
 # ── Componentes reutilizaveis ──────────────────────────────────────────────────
 
 def stat_card(slide, l, t, w, h, number, desc, accent, bg_color=WHITE, number_size=Pt(40), source=None):
-    rrect(slide, l, t, w, h, bg_color, line_color=SLATE_200)
-    accent_bar(slide, l + Inches(0.3), t + Inches(0.2), Inches(0.6), Pt(4), accent)
-    txt(slide, l + Inches(0.3), t + Inches(0.4), w - Inches(0.5), Inches(0.75),
-        number, size=number_size, color=accent, bold=True)
-    txt(slide, l + Inches(0.3), t + Inches(1.25), w - Inches(0.5), h - Inches(1.7),
-        desc, size=Pt(12.5), color=SLATE_600, spacing=Pt(17))
-    if source:
-        txt(slide, l + Inches(0.3), t + h - Inches(0.45), w - Inches(0.5), Inches(0.35),
-            source, size=Pt(9), color=SLATE_400)
+    def draw(slide, l, t, texts, colors):
+        number, desc, *source = texts
+        accent, bg_color = colors
+        rrect(slide, l, t, w, h, bg_color, line_color=SLATE_200)
+        accent_bar(slide, l + Inches(0.3), t + Inches(0.2), Inches(0.6), Pt(4), accent)
+        txt(slide, l + Inches(0.3), t + Inches(0.4), w - Inches(0.5), Inches(0.75),
+            number, size=number_size, color=accent, bold=True)
+        txt(slide, l + Inches(0.3), t + Inches(1.25), w - Inches(0.5), h - Inches(1.7),
+            desc, size=Pt(12.5), color=SLATE_600, spacing=Pt(17))
+        if source:
+            txt(slide, l + Inches(0.3), t + h - Inches(0.45), w - Inches(0.5), Inches(0.35),
+                source[0], size=Pt(9), color=SLATE_400)
+
+    texts = (number, desc, source) if source else (number, desc)
+    instance(slide, ("stat_card", w, h, number_size, len(texts)), draw, l, t,
+             texts, (accent, bg_color))
 
 
 def feature_card(slide, l, t, w, h, icon, title, desc, accent=EMERALD_600):
-    rrect(slide, l, t, w, h, WHITE, line_color=SLATE_200)
-    # Icon badge
-    icon_size = Inches(0.5)
-    oval(slide, l + Inches(0.28), t + Inches(0.22), icon_size, icon_size, EMERALD_50)
-    txt(slide, l + Inches(0.28), t + Inches(0.22), icon_size, icon_size,
-        icon, size=Pt(18), color=accent, bold=True,
-        align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
-    txt(slide, l + Inches(0.28), t + Inches(0.84), w - Inches(0.55), Inches(0.35),
-        title, size=Pt(13.5), color=SLATE_900, bold=True)
-    txt(slide, l + Inches(0.28), t + Inches(1.22), w - Inches(0.55), h - Inches(1.45),
-        desc, size=Pt(11), color=SLATE_600, spacing=Pt(16))
+    def draw(slide, l, t, texts, colors):
+        icon, title, desc = texts
+        accent, = colors
+        rrect(slide, l, t, w, h, WHITE, line_color=SLATE_200)
+        # Icon badge
+        icon_size = Inches(0.5)
+        oval(slide, l + Inches(0.28), t + Inches(0.22), icon_size, icon_size, EMERALD_50)
+        txt(slide, l + Inches(0.28), t + Inches(0.22), icon_size, icon_size,
+            icon, size=Pt(18), color=accent, bold=True,
+            align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
+        txt(slide, l + Inches(0.28), t + Inches(0.84), w - Inches(0.55), Inches(0.35),
+            title, size=Pt(13.5), color=SLATE_900, bold=True)
+        txt(slide, l + Inches(0.28), t + Inches(1.22), w - Inches(0.55), h - Inches(1.45),
+            desc, size=Pt(11), color=SLATE_600, spacing=Pt(16))
+
+    instance(slide, ("feature_card", w, h), draw, l, t, (icon, title, desc), (accent,))
 
 
 def pill(slide, l, t, text, accent=EMERALD_600, bg_color=None):
-    w = Inches(2.9)
-    h = Inches(0.46)
-    bg_c = bg_color or EMERALD_50
-    rrect(slide, l, t, w, h, bg_c)
-    txt(slide, l, t, w, h, "\u2713  " + text, size=Pt(11.5), color=accent,
-        bold=True, align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
+    def draw(slide, l, t, texts, colors):
+        text, = texts
+        accent, bg_c = colors
+        w = Inches(2.9)
+        h = Inches(0.46)
+        rrect(slide, l, t, w, h, bg_c)
+        txt(slide, l, t, w, h, text, size=Pt(11.5), color=accent,
+            bold=True, align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
+
+    instance(slide, ("pill",), draw, l, t, ("\u2713  " + text,), (accent, bg_color or EMERALD_50))
+
+
+# ── Graficos ───────────────────────────────────────────────────────────────────
+#
+# Graficos nativos (editaveis no PowerPoint) com o visual do painel do app.
+
+MONTHS = ("jan", "fev", "mar", "abr", "mai", "jun", "jul", "ago", "set", "out", "nov", "dez")
+MONEY_FORMAT = '"R$" #,##0'
+
+
+def month_label(month):
+    """"2026-03" -> "mar/26"."""
+    return f"{MONTHS[int(month[5:7]) - 1]}/{month[2:4]}"
+
+
+def style_chart(chart, size=Pt(10)):
+    chart.font.name = FONT
+    chart.font.size = size
+    chart.font.color.rgb = SLATE_600
+    value_axis = chart.value_axis
+    value_axis.major_gridlines.format.line.color.rgb = SLATE_200
+    value_axis.format.line.fill.background()
+    value_axis.tick_labels.number_format = MONEY_FORMAT
+    value_axis.tick_labels.number_format_is_linked = False
+    chart.category_axis.format.line.color.rgb = SLATE_200
+    chart.category_axis.has_major_gridlines = False
+
+
+def column_chart(slide, l, t, w, h, categories, series):
+    """Colunas agrupadas; series = [(nome, valores, cor)]."""
+    data = CategoryChartData(number_format=MONEY_FORMAT)
+    data.categories = categories
+    for name, values, _ in series:
+        data.add_series(name, values)
+    chart = slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, l, t, w, h, data).chart
+    style_chart(chart)
+    for plotted, (_, _, color) in zip(chart.series, series):
+        plotted.format.fill.solid()
+        plotted.format.fill.fore_color.rgb = color
+    chart.plots[0].gap_width = 60
+    chart.plots[0].overlap = -10
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.TOP
+    chart.legend.include_in_layout = False
+    return chart
+
+
+def bar_chart(slide, l, t, w, h, items, color=ROSE_500):
+    """Barras horizontais com rotulo de valor; items = [(nome, valor)], maior no topo."""
+    data = CategoryChartData(number_format=MONEY_FORMAT)
+    data.categories = [name for name, _ in items]
+    data.add_series("", [value for _, value in items])
+    chart = slide.shapes.add_chart(XL_CHART_TYPE.BAR_CLUSTERED, l, t, w, h, data).chart
+    style_chart(chart)
+    chart.category_axis.reverse_order = True
+    chart.value_axis.visible = False
+    chart.value_axis.has_major_gridlines = False
+    chart.has_legend = False
+    plot = chart.plots[0]
+    plot.gap_width = 50
+    plot.series[0].format.fill.solid()
+    plot.series[0].format.fill.fore_color.rgb = color
+    plot.has_data_labels = True
+    plot.data_labels.number_format = MONEY_FORMAT
+    plot.data_labels.number_format_is_linked = False
+    plot.data_labels.position = XL_LABEL_POSITION.OUTSIDE_END
+    return chart
+
+
+# ── Modelo base ────────────────────────────────────────────────────────────────
+#
+# Tamanho do slide, tema (cores e fontes) e um layout por fundo usado no deck
+# saem de um pacote base gerado uma vez por versao do tema; o build so monta
+# o conteudo dos slides.
+
+# Layouts com fundo pronto: os slides herdam o fundo em vez de pinta-lo um a um
+LAYOUTS = {
+    "FinApp Escuro":   SLATE_900,
+    "FinApp Branco":   WHITE,
+    "FinApp Claro":    SLATE_50,
+    "FinApp Destaque": EMERALD_600,
+}
+
+# Esquema de cores e fontes do tema (aparece no seletor de cores do PowerPoint)
+THEME_COLORS = {
+    "dk1": SLATE_900, "lt1": WHITE, "dk2": SLATE_800, "lt2": SLATE_50,
+    "accent1": EMERALD_600, "accent2": BLUE_500, "accent3": AMBER_500,
+    "accent4": ROSE_500, "accent5": VIOLET_500, "accent6": SLATE_500,
+    "hlink": EMERALD_600, "folHlink": EMERALD_DK,
+}
+
+
+def apply_theme(prs):
+    part = prs.slide_master.part.part_related_by(RT.THEME)
+    theme = etree.fromstring(part.blob)
+    scheme = theme.find(f'{qn("a:themeElements")}/{qn("a:clrScheme")}')
+    scheme.set("name", "FinApp")
+    for slot, color in THEME_COLORS.items():
+        el = scheme.find(qn(f"a:{slot}"))
+        el.clear()
+        etree.SubElement(el, qn("a:srgbClr")).set("val", str(color))
+    fonts = theme.find(f'{qn("a:themeElements")}/{qn("a:fontScheme")}')
+    fonts.set("name", "FinApp")
+    for latin in fonts.iter(qn("a:latin")):
+        latin.set("typeface", FONT)
+    part._blob = etree.tostring(theme, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def apply_layouts(prs):
+    """
+    Reaproveita os primeiros layouts do modelo padrao como copias do "Blank"
+    com os fundos de LAYOUTS; os demais saem do pacote. O "Blank" fica para
+    fundos fora da lista.
+    """
+    layouts = list(prs.slide_layouts)
+    blank = prs.slide_layouts.get_by_name("Blank")
+    spare = [layout for layout in layouts if layout is not blank]
+    for (name, color), layout in zip(LAYOUTS.items(), spare):
+        el = layout._element
+        el.attrib.pop("type", None)
+        el.replace(el.cSld, deepcopy(blank._element.cSld))
+        el.cSld.set("name", name)
+        bg(layout, color)
+    for layout in spare[len(LAYOUTS):]:
+        prs.slide_layouts.remove(layout)
+
+
+def build_template():
+    prs = Presentation()
+    prs.slide_width  = W
+    prs.slide_height = H
+    apply_theme(prs)
+    apply_layouts(prs)
+    buf = io.BytesIO()
+    prs.save(buf)
+    return buf.getvalue()
+
+
+TEMPLATE_BUILDERS = (build_template, apply_theme, apply_layouts, bg)
+
+
+@functools.lru_cache(maxsize=None)
+def template_version():
+    return pacote.template_version(pacote.theme_constants(globals()), TEMPLATE_BUILDERS,
+                                   "python-pptx", pptx.__version__)
+
+
+def new_presentation():
+    data, _ = pacote.cached_template("pitch.pptx", template_version(), build_template)
+    return Presentation(io.BytesIO(data))
+
+
+def new_slide(prs, color):
+    """Slide em branco com fundo color: usa o layout pronto quando existe um."""
+    for layout in prs.slide_layouts:
+        if layout.name in LAYOUTS and LAYOUTS[layout.name] == color:
+            return prs.slides.add_slide(layout)
+    sl = prs.slides.add_slide(prs.slide_layouts.get_by_name("Blank"))
+    bg(sl, color)
+    return sl
+
+
+# ── Registro de slides ─────────────────────────────────────────────────────────
+#
+# Cada slide e uma funcao registrada com @slide(fundo), na ordem do deck. Os
+# textos e dados chegam como argumentos, lidos da entrada do slide no roteiro
+# (pitch-deck.json). O XML do slide fica em cache com a chave das entradas, do
+# codigo do slide e dos componentes que ele usa: mudar uma linha do roteiro
+# reconstroi so aquele slide.
+
+SLIDES = []
+
+
+class SlideSpec:
+    def __init__(self, render, background, data=()):
+        self.render = render
+        self.background = background
+        self.data = data            # argumentos que vem da exportacao de transacoes
+
+    @property
+    def name(self):
+        return self.render.__name__
+
+    @property
+    def entry(self):
+        """Nome da entrada do slide no roteiro (slide_capa -> capa)."""
+        return self.name.removeprefix("slide_")
+
+    @property
+    def fields(self):
+        """Argumentos que vem do roteiro."""
+        return [name for name in list(inspect.signature(self.render).parameters)[1:]
+                if name not in self.data]
+
+    @property
+    def cacheable(self):
+        # Graficos vivem em partes proprias do pacote, fora do spTree
+        return not self.data
+
+
+def slide(background, data=()):
+    """
+    Registra a funcao decorada como o proximo slide do deck. Slides com data
+    so entram no deck quando ha exportacao de transacoes (--transactions).
+    """
+    def register(render):
+        SLIDES.append(SlideSpec(render, background, data))
+        return render
+    return register
+
+
+@functools.lru_cache(maxsize=None)
+def grid(x0, y0, step_x, step_y, count, cols=1):
+    """
+    Posicoes (x, y) de count celulas em cols colunas, da esquerda para a direita
+    e de cima para baixo. Os layouts de cards, tabelas e pills chamam sempre com
+    os mesmos argumentos; a grade sai do cache em vez de ser recalculada.
+    """
+    return tuple((x0 + (i % cols) * step_x, y0 + (i // cols) * step_y) for i in range(count))
+
+
+# ── Roteiro do deck ────────────────────────────────────────────────────────────
+#
+# pitch-deck.json: {"slides": {"capa": {...}, "problema": {...}, ...}}, com um
+# campo por parametro da funcao do slide. Cores (campos accent e background)
+# sao nomes da paleta acima ou "#RRGGBB". YAML tambem serve se o PyYAML estiver
+# instalado.
+
+COLOR_FIELDS = ("accent", "background")
+
+
+class DeckSpecError(Exception):
+    pass
+
+
+def spec_color(value, where):
+    if isinstance(value, str) and value.startswith("#") and len(value) == 7:
+        return RGBColor.from_string(value[1:].upper())
+    color = globals().get(value) if isinstance(value, str) else None
+    if not isinstance(color, RGBColor):
+        raise DeckSpecError(f"{where}: cor desconhecida {value!r}")
+    return color
+
+
+def resolve_colors(value, where):
+    if isinstance(value, list):
+        return [resolve_colors(item, f"{where}[{i}]") for i, item in enumerate(value)]
+    if isinstance(value, dict):
+        return {k: spec_color(v, f"{where}.{k}") if k in COLOR_FIELDS
+                else resolve_colors(v, f"{where}.{k}") for k, v in value.items()}
+    return value
+
+
+def read_spec(path):
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise DeckSpecError(f"{path}: roteiro em YAML exige o PyYAML "
+                                    "(pip install pyyaml)") from None
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def load_spec(path=SPEC_PATH):
+    """{nome da funcao: argumentos} de cada slide registrado, conferidos com a assinatura."""
+    data = read_spec(path)
+    slides = data.get("slides") if isinstance(data, dict) else None
+    if not isinstance(slides, dict):
+        raise DeckSpecError(f"{path}: falta a secao 'slides'")
+    unknown = sorted(set(slides) - {spec.entry for spec in SLIDES})
+    if unknown:
+        raise DeckSpecError(f"{path}: slides desconhecidos: {', '.join(unknown)}")
+
+    inputs = {}
+    for spec in SLIDES:
+        fields = slides.get(spec.entry)
+        if not isinstance(fields, dict):
+            raise DeckSpecError(f"{path}: falta o slide '{spec.entry}'")
+        missing = [name for name in spec.fields if name not in fields]
+        extra = [name for name in fields if name not in spec.fields]
+        if missing or extra:
+            problems = ([f"faltam {', '.join(missing)}"] if missing else []) + \
+                       ([f"sobram {', '.join(extra)}"] if extra else [])
+            raise DeckSpecError(f"{path}: slide '{spec.entry}': {'; '.join(problems)}")
+        inputs[spec.name] = resolve_colors(fields, f"{path}: {spec.entry}")
+    return inputs
+
+
+# Tudo o que os slides desenham passa por estas funcoes
+COMPONENTS = (new_slide, bg, rect, rrect, oval, txt, mtxt, label, accent_bar, stripe_left,
+              deco_circle, make_stamp, _fill_text, instance, checklist, xlist, stat_card,
+              feature_card, pill)
+
+
+@functools.lru_cache(maxsize=None)
+def components_hash():
+    return pacote.template_version({}, COMPONENTS, template_version())
+
+
+def slide_key(spec, inputs):
+    digest = hashlib.sha256()
+    for part in (components_hash(), spec.name, str(spec.background),
+                 repr(sorted(inputs.items()))):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    pacote.code_digest(digest, spec.render)
+    return digest.hexdigest()
+
+
+def cache_path(key):
+    return os.path.join(CACHE_DIR, key + ".xml")
+
+
+def store_slide(sl, key):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(cache_path(key), "wb") as f:
+        f.write(etree.tostring(sl.shapes._spTree, encoding="UTF-8"))
+
+
+def restore_slide(sl, key):
+    """
+    Copia as formas do spTree salvo para o slide novo (que ja tem o fundo do
+    layout). Retorna False quando o slide nao esta no cache.
+    """
+    path = cache_path(key)
+    if not os.path.exists(path):
+        return False
+    with open(path, "rb") as f:
+        paste_slide(sl, f.read())
+    return True
+
+
+def clear_slide(sl):
+    """Tira as formas do slide; o fundo (layout ou p:bg) fica."""
+    sp_tree = sl.shapes._spTree
+    for el in list(sp_tree):
+        if el.tag not in (P_NV_GRP_SP_PR, P_GRP_SP_PR):
+            sp_tree.remove(el)
+
+
+def paste_slide(sl, xml):
+    """Troca as formas do slide pelas do spTree serializado em xml."""
+    clear_slide(sl)
+    sp_tree = sl.shapes._spTree
+    sp_tree.extend([el for el in parse_xml(xml) if el.tag not in (P_NV_GRP_SP_PR, P_GRP_SP_PR)])
+
+
+def prune_cache(used_keys):
+    """Remove slides que nao fazem mais parte do deck."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(".xml") and name[:-4] not in used_keys:
+            os.remove(os.path.join(CACHE_DIR, name))
+
+
+# ── Medida dos textos ──────────────────────────────────────────────────────────
+#
+# Depois de montado, cada slide tem as caixas de texto medidas com metricas.py:
+# quebra de linha pela largura da caixa (menos as margens internas) e altura
+# pela entrelinha de cada paragrafo. Caixa estourada e avisada; com
+# --overflow reduzir ela ganha normAutofit com a escala de fonte que cabe, que
+# o PowerPoint aplica ao abrir. O XML em cache continua sem a reducao.
+
+P_SP       = qn("p:sp")
+P_TX_BODY  = qn("p:txBody")
+A_P        = qn("a:p")
+A_EXT      = qn("a:ext")
+A_BODY_PR  = qn("a:bodyPr")
+A_P_PR     = qn("a:pPr")
+A_R_PR     = qn("a:rPr")
+A_DEF_R_PR = qn("a:defRPr")
+A_LATIN    = qn("a:latin")
+A_SPC_PTS  = qn("a:spcPts")
+A_SPC_PCT  = qn("a:spcPct")
+A_LN_SPC   = qn("a:lnSpc")
+A_SPC_AFT  = qn("a:spcAft")
+AUTOFIT    = {qn("a:noAutofit"), qn("a:normAutofit"), qn("a:spAutoFit")}
+
+EMU_PER_PT    = 12700
+BODY_INSETS   = {"lIns": 91440, "tIns": 45720, "rIns": 91440, "bIns": 45720}
+DEFAULT_SIZE  = 18.0
+OVERFLOW_SLACK = 0.5           # folga, em linhas: a caixa cresce (spAutoFit) sem estourar
+SHRINK_STEPS  = (0.95, 0.9, 0.85, 0.8, 0.75, 0.7, 0.65, 0.6)
+
+
+def _spacing(p_pr, tag, size):
+    """Espacamento tag (lnSpc, spcAft) de um paragrafo em pontos, ou None."""
+    el = p_pr.find(tag) if p_pr is not None else None
+    if el is None:
+        return None
+    pts = el.find(A_SPC_PTS)
+    if pts is not None:
+        return int(pts.get("val")) / 100
+    pct = el.find(A_SPC_PCT)
+    if pct is not None:
+        return int(pct.get("val")) / 100000 * size * metricas.LINE_HEIGHT
+    return None
+
+
+def paragraph_style(p):
+    """(linhas de texto, fonte, tamanho em pt, negrito, entrelinha, espaco depois)."""
+    p_pr = p.find(A_P_PR)
+    default = p_pr.find(A_DEF_R_PR) if p_pr is not None else None
+    lines, text, sizes, widest = [], [], [], (0, None)
+    for child in p:
+        if child.tag == A_BR:
+            lines.append("".join(text))
+            text = []
+        elif child.tag == A_R:
+            run_text = child.find(A_T).text or ""
+            text.append(run_text)
+            r_pr = child.find(A_R_PR)
+            props = r_pr if r_pr is not None and r_pr.get("sz") else default
+            sizes.append(int(props.get("sz")) / 100 if props is not None and props.get("sz")
+                         else DEFAULT_SIZE)
+            if len(run_text) > widest[0]:
+                widest = (len(run_text), r_pr if r_pr is not None else default)
+    lines.append("".join(text))
+
+    props = widest[1] if widest[1] is not None else default
+    size = max(sizes, default=int(default.get("sz")) / 100
+               if default is not None and default.get("sz") else DEFAULT_SIZE)
+    bold = props is not None and props.get("b") == "1"
+    latin = props.find(A_LATIN) if props is not None else None
+    font = latin.get("typeface") if latin is not None else FONT
+    return (lines, font, size, bold, _spacing(p_pr, A_LN_SPC, size),
+            _spacing(p_pr, A_SPC_AFT, size) or 0.0)
+
+
+def text_height(paragraphs, width, scale=1.0):
+    """Altura em pontos dos paragrafos quebrados em width pontos, com a fonte em scale."""
+    height = 0.0
+    last = len(paragraphs) - 1
+    for i, (lines, font, size, bold, spacing, after) in enumerate(paragraphs):
+        size *= scale
+        count = sum(len(metricas.wrap(line, width, font, size, bold)) for line in lines)
+        height += metricas.paragraph_height(count, size, spacing and spacing * scale,
+                                            after if i < last else 0.0)
+    return height
+
+
+class Overflow:
+    def __init__(self, slide_no, name, text, needed, available, scale):
+        self.slide_no = slide_no
+        self.name = name
+        self.text = text
+        self.needed = needed
+        self.available = available
+        self.scale = scale          # escala aplicada (1.0: nenhuma)
+
+    def __str__(self):
+        fix = f", reduzida para {self.scale:.0%}" if self.scale < 1 else ""
+        return (f"slide {self.slide_no:02d} {self.name}: texto com {self.needed / 72:.2f} pol "
+                f"numa caixa de {self.available / 72:.2f} pol{fix} ({self.text[:40]!r})")
+
+
+def check_text(sl, slide_no, shrink=False):
+    """Mede as caixas de texto do slide; retorna (caixas medidas, [Overflow])."""
+    measured, overflows = 0, []
+    for sp in sl.shapes._spTree.iter(P_SP):
+        tx_body = sp.find(P_TX_BODY)
+        ext = sp.find(f".//{A_EXT}")
+        if tx_body is None or ext is None:
+            continue
+        body_pr = tx_body.find(A_BODY_PR)
+        insets = {k: int(body_pr.get(k, v)) for k, v in BODY_INSETS.items()}
+        width = (int(ext.get("cx")) - insets["lIns"] - insets["rIns"]) / EMU_PER_PT
+        available = (int(ext.get("cy")) - insets["tIns"] - insets["bIns"]) / EMU_PER_PT
+        if body_pr.get("wrap") == "none":
+            width = float("inf")
+        paragraphs = [paragraph_style(p) for p in tx_body.iter(A_P)]
+        if not any(line for lines, *_ in paragraphs for line in lines):
+            continue
+        measured += 1
+        needed = text_height(paragraphs, width)
+        slack = OVERFLOW_SLACK * max(spacing or size * metricas.LINE_HEIGHT
+                                     for _, _, size, _, spacing, _ in paragraphs)
+        if needed <= available + slack:
+            continue
+
+        scale = 1.0
+        if shrink:
+            for step in SHRINK_STEPS:
+                if text_height(paragraphs, width, step) <= available + slack:
+                    scale = step
+                    break
+            if scale < 1:
+                for autofit in list(body_pr):
+                    if autofit.tag in AUTOFIT:
+                        body_pr.remove(autofit)
+                body_pr.append(parse_xml(
+                    f'<a:normAutofit {nsdecls("a")} fontScale="{round(scale * 100000)}"/>'))
+        text = " / ".join(" ".join(lines) for lines, *_ in paragraphs)
+        overflows.append(Overflow(slide_no, sp.find(f".//{P_CNV_PR}").get("name"), text,
+                                  needed, available, scale))
+    return measured, overflows
+
+
+# ── Sobreposicao de formas ─────────────────────────────────────────────────────
+#
+# Depois de montado, cada slide tem as caixas das formas varridas da esquerda
+# para a direita (sweep line): so formas com trechos de x em comum sao
+# comparadas, em O(n log n + pares). Sobreposicao fora de LAYERING e forma fora
+# de W x H sao avisadas.
+
+A_PRST_GEOM = qn("a:prstGeom")
+P_C_NV_SP_PR = qn("p:cNvSpPr")
+
+
+class Box:
+    """Caixa de uma forma do slide, em EMU; order e a posicao no spTree."""
+
+    def __init__(self, order, name, kind, x, y, w, h):
+        self.order = order
+        self.name = name
+        self.kind = kind
+        self.x0, self.y0 = x, y
+        self.x1, self.y1 = x + w, y + h
+
+    def contains(self, other):
+        return (self.x0 <= other.x0 and self.y0 <= other.y0
+                and other.x1 <= self.x1 and other.y1 <= self.y1)
+
+
+def shape_kind(sp):
+    """texto (caixa de texto), decoracao (circulo sem texto) ou forma (retangulos)."""
+    c_nv_sp_pr = sp.find(f".//{P_C_NV_SP_PR}")
+    if c_nv_sp_pr is not None and c_nv_sp_pr.get("txBox") == "1":
+        return "texto"
+    geom = sp.find(f".//{A_PRST_GEOM}")
+    if geom is not None and geom.get("prst") == "ellipse":
+        return "decoracao"
+    return "forma"
+
+
+def shape_boxes(sl):
+    boxes = []
+    for order, sp in enumerate(sl.shapes._spTree.iter(P_SP)):
+        off, ext = sp.find(f".//{A_OFF}"), sp.find(f".//{A_EXT}")
+        if off is None or ext is None:
+            continue
+        boxes.append(Box(order, sp.find(f".//{P_CNV_PR}").get("name"), shape_kind(sp),
+                         int(off.get("x")), int(off.get("y")),
+                         int(ext.get("cx")), int(ext.get("cy"))))
+    return boxes
+
+
+# Camadas intencionais: (tipo de baixo, tipo de cima) -> regra. Decoracao fica
+# atras de tudo; texto pode ficar sobre qualquer forma; forma sobre forma so
+# quando cabe inteira na de baixo (card num painel, barra de destaque no card).
+LAYERING = {
+    ("decoracao", "decoracao"): "sempre",
+    ("decoracao", "forma"): "sempre",
+    ("decoracao", "texto"): "sempre",
+    ("forma", "decoracao"): "sempre",
+    ("texto", "decoracao"): "sempre",
+    ("forma", "texto"): "sempre",
+    ("forma", "forma"): "contida",
+}
+# Decoracao pode vazar da borda do slide (orbs cortados de proposito)
+BLEED_KINDS = {"decoracao"}
+
+
+def overlapping_pairs(boxes):
+    """Pares (a, b) de caixas com area em comum, por varredura em x."""
+    active = []         # heap de (x1, order, box) das caixas que cruzam a linha
+    pairs = []
+    for box in sorted(boxes, key=lambda b: (b.x0, b.order)):
+        while active and active[0][0] <= box.x0:
+            heapq.heappop(active)
+        for _, _, other in active:
+            if other.y0 < box.y1 and box.y0 < other.y1:
+                pairs.append((other, box) if other.order < box.order else (box, other))
+        heapq.heappush(active, (box.x1, box.order, box))
+    return pairs
+
+
+def check_layout(sl, slide_no):
+    """Avisos de sobreposicao nao prevista e de formas fora do slide."""
+    boxes = shape_boxes(sl)
+    problems = []
+    for box in boxes:
+        if box.kind not in BLEED_KINDS and (box.x0 < 0 or box.y0 < 0
+                                            or box.x1 > W or box.y1 > H):
+            problems.append(f"slide {slide_no:02d} {box.name}: fora do slide "
+                            f"({box.x0 / 914400:.2f}, {box.y0 / 914400:.2f}) a "
+                            f"({box.x1 / 914400:.2f}, {box.y1 / 914400:.2f}) pol")
+    for below, above in overlapping_pairs(boxes):
+        rule = LAYERING.get((below.kind, above.kind))
+        if rule == "sempre" or (rule == "contida" and below.contains(above)):
+            continue
+        problems.append(f"slide {slide_no:02d} {above.name} sobre {below.name}")
+    return len(boxes), problems
+
+
+# ── Miniaturas ─────────────────────────────────────────────────────────────────
+#
+# Cada slide montado vira uma lista de exibicao (tuplas simples, sem lxml) que
+# miniaturas.py desenha em PNG, um slide por processo. Ver miniaturas.render.
+
+PREVIEW_DIR = os.path.join(SCRIPT_DIR, ".cache", "pitch-preview")
+P_GRAPHIC_FRAME = qn("p:graphicFrame")
+P_BG = qn("p:bg")
+A_SOLID_FILL = qn("a:solidFill")
+A_NO_FILL = qn("a:noFill")
+A_LN = qn("a:ln")
+A_GD = qn("a:gd")
+A_NORM_AUTOFIT = qn("a:normAutofit")
+SHAPE_KINDS = {"rect": "rect", "roundRect": "rrect", "ellipse": "oval"}
+ROUND_RECT_ADJ = 16667      # raio padrao do roundRect, em 1/100000 do lado menor
+
+
+def _solid(el):
+    """Cor "RRGGBB" do a:solidFill filho de el, ou None."""
+    clr = el.find(f"{A_SOLID_FILL}/{A_CLR}") if el is not None else None
+    return clr.get("val") if clr is not None else None
+
+
+def slide_background(sl):
+    for part in (sl, sl.slide_layout, sl.slide_layout.slide_master):
+        bg_el = part._element.find(f".//{P_BG}")
+        color = _solid(bg_el.find(f".//{qn('p:bgPr')}")) if bg_el is not None else None
+        if color:
+            return color
+    return "FFFFFF"
+
+
+def _run_style(props, default, scale):
+    """(cor, negrito, tamanho, fonte) de uma run: rPr sobrepoe o defRPr do paragrafo."""
+    def pick(attr, fallback):
+        for el in (props, default):
+            if el is not None and el.get(attr) is not None:
+                return el.get(attr)
+        return fallback
+
+    color = _solid(props) or _solid(default) or "000000"
+    latin = next((el.find(A_LATIN) for el in (props, default)
+                  if el is not None and el.find(A_LATIN) is not None), None)
+    return (color, pick("b", "0") == "1", int(pick("sz", DEFAULT_SIZE * 100)) / 100 * scale,
+            latin.get("typeface") if latin is not None else FONT)
+
+
+def _display_text(sp, tx_body, x, y, w, h):
+    body_pr = tx_body.find(A_BODY_PR)
+    autofit = body_pr.find(A_NORM_AUTOFIT)
+    scale = int(autofit.get("fontScale", 100000)) / 100000 if autofit is not None else 1.0
+    paragraphs = []
+    for p in tx_body.iter(A_P):
+        p_pr = p.find(A_P_PR)
+        default = p_pr.find(A_DEF_R_PR) if p_pr is not None else None
+        runs, style = [], _run_style(None, default, scale)
+        for child in p:
+            if child.tag == A_R:
+                style = _run_style(child.find(A_R_PR), default, scale)
+                runs.append((child.find(A_T).text or "", *style))
+            elif child.tag == A_BR:
+                runs.append(("\n", *style))
+        size = max((run[3] for run in runs), default=style[2])
+        paragraphs.append((p_pr.get("algn", "l") if p_pr is not None else "l", size,
+                           _spacing(p_pr, A_LN_SPC, size), _spacing(p_pr, A_SPC_AFT, size) or 0.0,
+                           runs))
+    if not any(run[0].strip() for *_, runs in paragraphs for run in runs):
+        return None
+    insets = tuple(int(body_pr.get(k, v)) for k, v in BODY_INSETS.items())
+    # BODY_INSETS segue a ordem do XML (l, t, r, b)
+    return ("text", x, y, w, h, insets, body_pr.get("anchor", "t"), paragraphs)
+
+
+def display_list(sl):
+    """Fundo e formas do slide, na ordem de desenho, para miniaturas.render."""
+    shapes = []
+    for el in sl.shapes._spTree:
+        off, ext = el.find(f".//{A_OFF}"), el.find(f".//{A_EXT}")
+        if off is None or ext is None:
+            continue
+        x, y = int(off.get("x")), int(off.get("y"))
+        w, h = int(ext.get("cx")), int(ext.get("cy"))
+        if el.tag == P_GRAPHIC_FRAME:
+            shapes.append(("chart", x, y, w, h))
+            continue
+        if el.tag != P_SP:
+            continue
+        geom = el.find(f".//{A_PRST_GEOM}")
+        kind = SHAPE_KINDS.get(geom.get("prst")) if geom is not None else None
+        sp_pr = el.find(qn("p:spPr"))
+        fill = _solid(sp_pr)
+        ln = sp_pr.find(A_LN)
+        line = _solid(ln) if ln is not None and ln.find(A_NO_FILL) is None else None
+        if kind and (fill or line):
+            adj = geom.find(f".//{A_GD}")
+            radius = (int(adj.get("fmla").split()[-1]) if adj is not None else ROUND_RECT_ADJ)
+            shapes.append((kind, x, y, w, h, fill, line,
+                           int(ln.get("w", 0)) if line else 0, radius / 100000))
+        tx_body = el.find(P_TX_BODY)
+        text = _display_text(el, tx_body, x, y, w, h) if tx_body is not None else None
+        if text:
+            shapes.append(text)
+    # int(): Length (Inches, Pt) nao volta igual do pickle para os workers
+    return {"size": (int(W), int(H)), "background": slide_background(sl), "shapes": shapes}
+
+
+def write_previews(slides, out_dir=PREVIEW_DIR, width=960, jobs=1):
+    """slide-NN.png em out_dir; retorna quantos arquivos mudaram."""
+    displays = [display_list(sl) for sl in slides]
+    images = miniaturas.render_all(displays, width, jobs)
+    os.makedirs(out_dir, exist_ok=True)
+    names = set()
+    changed = 0
+    for n, data in enumerate(images, start=1):
+        name = f"slide-{n:02d}.png"
+        names.add(name)
+        written, _ = pacote.write_if_changed(data, os.path.join(out_dir, name))
+        changed += written
+    # Slides que sairam do deck
+    for name in os.listdir(out_dir):
+        if name.startswith("slide-") and name.endswith(".png") and name not in names:
+            os.remove(os.path.join(out_dir, name))
+    return changed
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SLIDES
 # ═══════════════════════════════════════════════════════════════════════════════
+#
+# O texto e os dados de cada slide vem de pitch-deck.json (secao "slides", uma
+# entrada por slide com os parametros da funcao); aqui fica so o desenho.
 
-def build():
-    prs = Presentation()
-    prs.slide_width  = W
-    prs.slide_height = H
-    blank = prs.slide_layouts[6]
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 1 — CAPA
+# ───────────────────────────────────────────────────────────────────────────────
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 1 — CAPA
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, SLATE_900)
+@slide(SLATE_900)
+def slide_capa(sl, title, tagline, subtitle, badge, date):
     stripe_left(sl)
 
     # Orbs decorativos
@@ -257,200 +1141,145 @@ def build():
 
     # Logo + tagline
     txt(sl, Inches(1.2), Inches(1.6), Inches(6), Inches(1.1),
-        "FinApp", size=Pt(60), color=EMERALD_500, bold=True)
+        title, size=Pt(60), color=EMERALD_500, bold=True)
 
     accent_bar(sl, Inches(1.2), Inches(2.8), Inches(2.5), Pt(3))
 
     txt(sl, Inches(1.2), Inches(3.0), Inches(8.5), Inches(0.8),
-        "Gestao financeira pessoal inteligente.",
-        size=Pt(28), color=WHITE)
+        tagline, size=Pt(28), color=WHITE)
 
     txt(sl, Inches(1.2), Inches(3.85), Inches(9), Inches(0.6),
-        "Controle completo. Projecoes reais. Assistente com IA. Gratuito.",
-        size=Pt(16), color=SLATE_400)
+        subtitle, size=Pt(16), color=SLATE_400)
 
     # Badge "gratuito"
     rrect(sl, Inches(1.2), Inches(4.75), Inches(1.8), Inches(0.45), EMERALD_600)
     txt(sl, Inches(1.2), Inches(4.75), Inches(1.8), Inches(0.45),
-        "Gratuito", size=Pt(13), color=WHITE, bold=True,
+        badge, size=Pt(13), color=WHITE, bold=True,
         align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
 
     txt(sl, Inches(1.2), Inches(6.6), Inches(5), Inches(0.4),
-        "Marco 2026", size=Pt(11), color=SLATE_500)
+        date, size=Pt(11), color=SLATE_500)
+
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 2 — O PROBLEMA (CHOQUE COM DADOS)
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, WHITE)
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 2 — O PROBLEMA (CHOQUE COM DADOS)
+# ───────────────────────────────────────────────────────────────────────────────
 
+@slide(WHITE)
+def slide_problema(sl, section, title, lead, stats, footnote):
     # Barra vermelha de alerta no topo
     rect(sl, 0, 0, W, Inches(0.08), ROSE_500)
 
-    label(sl, Inches(0.8), Inches(0.35), "O CENARIO ATUAL", ROSE_500)
+    label(sl, Inches(0.8), Inches(0.35), section, ROSE_500)
 
     mtxt(sl, Inches(0.8), Inches(0.85), Inches(11.5), Inches(1.6),
          [
-             ("Metade do Brasil esta no vermelho.", {"size": Pt(40), "color": SLATE_900, "bold": True}),
+             (title, {"size": Pt(40), "color": SLATE_900, "bold": True}),
          ])
 
     txt(sl, Inches(0.8), Inches(2.05), Inches(10.5), Inches(0.55),
-        "Inadimplencia bate recorde. Dividas crescem. E a maioria nao sabe como sair.",
-        size=Pt(18), color=SLATE_500)
+        lead, size=Pt(18), color=SLATE_500)
 
-    # 3 cards de stats
+    # Cards de stats
     cw, ch = Inches(3.7), Inches(3.2)
-    cy = Inches(3.2)
-    gx = Inches(0.4)
-    sx = Inches(0.8)
-
-    stat_card(sl, sx, cy, cw, ch,
-              "81 mi", "de brasileiros inadimplentes\n— recorde historico\nem dezembro de 2025",
-              ROSE_500, number_size=Pt(42), source="Serasa, Dez/2025")
-
-    stat_card(sl, sx + cw + gx, cy, cw, ch,
-              "77,5%", "das familias brasileiras\nestao endividadas\nno inicio de 2026",
-              AMBER_500, number_size=Pt(42), source="CNC / Agencia Brasil")
-
-    stat_card(sl, sx + 2*(cw + gx), cy, cw, ch,
-              "48%", "dos brasileiros nao\ncontrolam o proprio\norcamento",
-              BLUE_500, number_size=Pt(42), source="CNDL/SPC Brasil")
+    cells = grid(Inches(0.8), Inches(3.2), cw + Inches(0.4), 0, len(stats), cols=len(stats))
+    for (x, y), stat in zip(cells, stats):
+        stat_card(sl, x, y, cw, ch, stat["number"], stat["desc"], stat["accent"],
+                  number_size=Pt(42), source=stat["source"])
 
     txt(sl, Inches(0.8), Inches(6.85), Inches(11), Inches(0.35),
-        "Fontes: Serasa (Dez/2025) | CNC/Agencia Brasil | CNDL/SPC Brasil",
-        size=Pt(8.5), color=SLATE_400)
+        footnote, size=Pt(8.5), color=SLATE_400)
+
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 3 — POR QUE AS PESSOAS NAO CONTROLAM (4 BARREIRAS)
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, SLATE_50)
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 3 — POR QUE AS PESSOAS NAO CONTROLAM (4 BARREIRAS)
+# ───────────────────────────────────────────────────────────────────────────────
 
-    label(sl, Inches(0.8), Inches(0.4), "A RAIZ DO PROBLEMA")
+@slide(SLATE_50)
+def slide_barreiras(sl, section, title, barriers, footnote):
+    label(sl, Inches(0.8), Inches(0.4), section)
 
     txt(sl, Inches(0.8), Inches(0.85), Inches(10), Inches(0.75),
-        "Por que as pessoas nao controlam suas financas?",
-        size=Pt(32), color=SLATE_900, bold=True)
-
-    barriers = [
-        ("\u2716", "Nao sabem por onde comecar",
-         "55% dos brasileiros entendem pouco ou nada sobre financas pessoais. "
-         "19% dos jovens adultos dizem nunca ter aprendido.",
-         ROSE_500, ROSE_50),
-
-        ("\u23F3", "Falta de disciplina e continuidade",
-         "Registrar gastos manualmente e tedioso. A maioria desiste em semanas. "
-         "36% dos que tentam usam caderno de papel ou planilha — e abandonam.",
-         AMBER_500, AMBER_50),
-
-        ("\u2699", "Ferramentas complexas e fragmentadas",
-         "Gastos em um app, investimentos em outro, projecoes numa planilha. "
-         "Nenhuma ferramenta centraliza tudo com clareza e sem curva de aprendizado.",
-         BLUE_500, BLUE_100),
-
-        ("\u20AC", "Funcionalidades essenciais atras de paywall",
-         "Organizze cobra R$ 35/mes so para controle basico. "
-         "Mobills exige plano PRO para IA. O usuario paga mas nao engaja.",
-         VIOLET_500, VIOLET_50),
-    ]
+        title, size=Pt(32), color=SLATE_900, bold=True)
 
     cw, ch = Inches(5.6), Inches(1.85)
-    gx, gy = Inches(0.5), Inches(0.35)
-    sx, sy = Inches(0.8), Inches(2.0)
+    cells = grid(Inches(0.8), Inches(2.0), cw + Inches(0.5), ch + Inches(0.35),
+                 len(barriers), cols=2)
 
-    for i, (icon, title, desc, accent, bg_c) in enumerate(barriers):
-        col = i % 2
-        row = i // 2
-        x = sx + col * (cw + gx)
-        y = sy + row * (ch + gy)
-
-        rrect(sl, x, y, cw, ch, bg_c, line_color=SLATE_200)
+    for (x, y), item in zip(cells, barriers):
+        rrect(sl, x, y, cw, ch, item["background"], line_color=SLATE_200)
         txt(sl, x + Inches(0.25), y + Inches(0.2), Inches(0.5), Inches(0.5),
-            icon, size=Pt(18), color=accent, bold=True)
+            item["icon"], size=Pt(18), color=item["accent"], bold=True)
         txt(sl, x + Inches(0.9), y + Inches(0.18), cw - Inches(1.1), Inches(0.42),
-            title, size=Pt(15), color=SLATE_900, bold=True)
+            item["title"], size=Pt(15), color=SLATE_900, bold=True)
         txt(sl, x + Inches(0.9), y + Inches(0.65), cw - Inches(1.1), ch - Inches(0.9),
-            desc, size=Pt(11.5), color=SLATE_600, spacing=Pt(17))
+            item["desc"], size=Pt(11.5), color=SLATE_600, spacing=Pt(17))
 
     txt(sl, Inches(0.8), Inches(6.88), Inches(10), Inches(0.35),
-        "Fontes: CNDL/SPC Brasil | FEBRABAN | Pesquisa de Educacao Financeira (ENEF)",
-        size=Pt(8.5), color=SLATE_400)
+        footnote, size=Pt(8.5), color=SLATE_400)
+
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 4 — CONCORRENTES FALHAM
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, WHITE)
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 4 — CONCORRENTES FALHAM
+# ───────────────────────────────────────────────────────────────────────────────
 
-    label(sl, Inches(0.8), Inches(0.35), "O MERCADO HOJE")
+@slide(WHITE)
+def slide_mercado(sl, section, title, lead, competitors, conclusion, highlight):
+    # highlight: concorrente em destaque nos decks por prospect ("" para nenhum)
+    names = [comp["name"] for comp in competitors]
+    if highlight and highlight not in names:
+        raise DeckSpecError(f"mercado: destaque {highlight!r} nao e um dos concorrentes "
+                            f"({', '.join(names)})")
+    label(sl, Inches(0.8), Inches(0.35), section)
 
     txt(sl, Inches(0.8), Inches(0.78), Inches(11.5), Inches(0.65),
-        "Nenhuma ferramenta resolve o problema completo.",
-        size=Pt(30), color=SLATE_900, bold=True)
+        title, size=Pt(30), color=SLATE_900, bold=True)
 
     txt(sl, Inches(0.8), Inches(1.5), Inches(11), Inches(0.4),
-        "Cada uma ataca um pedaco — o usuario fica sem visao integrada.",
-        size=Pt(15), color=SLATE_500)
-
-    competitors = [
-        ("Mobills",          "Gratuito\nlimitado",
-         AMBER_500, AMBER_50,
-         ["IA so no plano PRO (R$ 25/mes)", "Investimentos em app separado",
-          "Sem simuladores financeiros", "Sem Metas e Dividas integrados"]),
-        ("Organizze",        "R$ 35/mes",
-         ROSE_500, ROSE_50,
-         ["Sem assistente IA", "Sem investimentos", "Sem importacao PDF",
-          "Sem fluxo de caixa projetado"]),
-        ("GuiaBolso",        "Encerrado\nem 2022",
-         SLATE_500, SLATE_100,
-         ["Descontinuado", "Usuarios perderam dados", "Confianca destruida",
-          "Sem suporte ou atualizacoes"]),
-        ("Minhas Economias", "Gratuito\n(muito limitado)",
-         BLUE_500, BLUE_100,
-         ["Interface desatualizada", "Sem IA ou projecoes reais",
-          "Instabilidade frequente", "Sem metas nem simuladores"]),
-    ]
+        lead, size=Pt(15), color=SLATE_500)
 
     cw, ch = Inches(2.85), Inches(4.3)
-    sx, sy = Inches(0.8), Inches(2.1)
-    gx = Inches(0.3)
+    cells = grid(Inches(0.8), Inches(2.1), cw + Inches(0.3), 0,
+                 len(competitors), cols=len(competitors))
 
-    for i, (name, price, accent, bg_c, issues) in enumerate(competitors):
-        x = sx + i * (cw + gx)
-        rrect(sl, x, sy, cw, ch, bg_c, line_color=SLATE_200)
+    for (x, y), comp in zip(cells, competitors):
+        marked = comp["name"] == highlight
+        rrect(sl, x, y, cw, ch, comp["background"],
+              line_color=comp["accent"] if marked else SLATE_200)
+        if marked:
+            accent_bar(sl, x + Inches(0.25), y + Inches(0.12), color=comp["accent"])
 
         # Nome
-        txt(sl, x + Inches(0.25), sy + Inches(0.2), cw - Inches(0.4), Inches(0.55),
-            name, size=Pt(17), color=SLATE_900, bold=True)
+        txt(sl, x + Inches(0.25), y + Inches(0.2), cw - Inches(0.4), Inches(0.55),
+            comp["name"], size=Pt(17), color=SLATE_900, bold=True)
 
         # Preco
-        rrect(sl, x + Inches(0.25), sy + Inches(0.82), cw - Inches(0.5), Inches(0.48),
-              accent)
-        txt(sl, x + Inches(0.25), sy + Inches(0.82), cw - Inches(0.5), Inches(0.48),
-            price, size=Pt(11), color=WHITE, bold=True,
+        rrect(sl, x + Inches(0.25), y + Inches(0.82), cw - Inches(0.5), Inches(0.48),
+              comp["accent"])
+        txt(sl, x + Inches(0.25), y + Inches(0.82), cw - Inches(0.5), Inches(0.48),
+            comp["price"], size=Pt(11), color=WHITE, bold=True,
             align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
 
         # Issues
-        xlist(sl, x + Inches(0.25), sy + Inches(1.5), cw - Inches(0.35),
-              issues, size=Pt(11), color=ROSE_500, text_color=SLATE_700)
+        xlist(sl, x + Inches(0.25), y + Inches(1.5), cw - Inches(0.35),
+              comp["issues"], size=Pt(11), color=ROSE_500, text_color=SLATE_700)
 
     # Conclusao
     rrect(sl, Inches(0.8), Inches(6.55), Inches(11.5), Inches(0.6), SLATE_900)
     txt(sl, Inches(0.8), Inches(6.55), Inches(11.5), Inches(0.6),
-        "  Nenhum oferece: IA integrada + Metas + Dividas + Simuladores + Importacao PDF + Plano gratuito completo",
-        size=Pt(13), color=EMERALD_400, bold=True, anchor=MSO_ANCHOR.MIDDLE)
+        conclusion, size=Pt(13), color=EMERALD_400, bold=True, anchor=MSO_ANCHOR.MIDDLE)
+
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 5 — COMPARATIVO DETALHADO
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, WHITE)
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 5 — COMPARATIVO DETALHADO
+# ───────────────────────────────────────────────────────────────────────────────
 
-    label(sl, Inches(0.8), Inches(0.3), "COMPARATIVO")
+@slide(WHITE)
+def slide_comparativo(sl, section, title, columns, rows):
+    label(sl, Inches(0.8), Inches(0.3), section)
 
     txt(sl, Inches(0.8), Inches(0.68), Inches(11), Inches(0.55),
-        "FinApp vs. concorrentes: funcionalidade por funcionalidade.",
-        size=Pt(26), color=SLATE_900, bold=True)
+        title, size=Pt(26), color=SLATE_900, bold=True)
 
     # Cabecalho da tabela
     hy = Inches(1.45)
@@ -459,38 +1288,22 @@ def build():
     col_comp = Inches(4.8)
     col_fa   = Inches(3.3)
     total_w  = col_feat + col_comp + col_fa
+    head_feat, head_comp, head_fa = columns
 
     rect(sl, lx, hy, total_w, Inches(0.48), SLATE_900)
     txt(sl, lx + Inches(0.15), hy, col_feat, Inches(0.48),
-        "Funcionalidade", size=Pt(11.5), color=WHITE, bold=True, anchor=MSO_ANCHOR.MIDDLE)
+        head_feat, size=Pt(11.5), color=WHITE, bold=True, anchor=MSO_ANCHOR.MIDDLE)
     txt(sl, lx + col_feat, hy, col_comp, Inches(0.48),
-        "Concorrentes", size=Pt(11.5), color=SLATE_400, bold=True,
+        head_comp, size=Pt(11.5), color=SLATE_400, bold=True,
         align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
     txt(sl, lx + col_feat + col_comp, hy, col_fa, Inches(0.48),
-        "FinApp", size=Pt(11.5), color=EMERALD_400, bold=True,
+        head_fa, size=Pt(11.5), color=EMERALD_400, bold=True,
         align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
 
-    rows = [
-        ("Plano gratuito completo",       "Limitado ou pago (R$ 8–35/mes)",           "\u2713  Sim, sem restricoes"),
-        ("Assistente com IA",             "So Mobills (WhatsApp, plano PRO)",          "\u2713  Chat integrado (Gemini)"),
-        ("Importacao OFX / CSV / PDF",    "Parcial (so OFX, so plano pago)",           "\u2713  3 formatos + IA no PDF"),
-        ("KPIs e alertas inteligentes",   "Ausente ou basico",                         "\u2713  5 KPIs + insights proativos"),
-        ("Tetos de orcamento",            "Ausente ou rigido",                         "\u2713  Por categoria + alertas"),
-        ("Metas financeiras",             "Ausente",                                   "\u2713  CRUD + progresso + prazo"),
-        ("Gestao de dividas",             "Ausente",                                   "\u2713  CRUD + simulador de quitacao"),
-        ("Simuladores educacionais",      "Ausente",                                   "\u2713  4 simuladores interativos"),
-        ("Fluxo de caixa projetado",      "Basico ou ausente",                         "\u2713  Diario + Previsto"),
-        ("Investimentos integrados",      "Ausente ou em app separado",                "\u2713  CRUD + evolucao + retorno real"),
-        ("Historico de KPIs mensal",      "Ausente",                                   "\u2713  Graficos + fechamento guiado"),
-        ("Deteccao automatica de padroes","Ausente",                                   "\u2713  Sugestao de recorrentes"),
-    ]
-
     rh   = Inches(0.44)
-    ry   = hy + Inches(0.52)
     fa_x = lx + col_feat + col_comp
 
-    for i, (feat, comp, finapp) in enumerate(rows):
-        y = ry + i * rh
+    for i, ((_, y), row) in enumerate(zip(grid(lx, hy + Inches(0.52), 0, rh, len(rows)), rows)):
         # Fundo alternado
         row_bg = SLATE_50 if i % 2 == 0 else WHITE
         rect(sl, lx, y, col_feat + col_comp, rh, row_bg)
@@ -500,406 +1313,285 @@ def build():
         rect(sl, fa_x, y, col_fa, rh, fa_bg)
 
         txt(sl, lx + Inches(0.15), y, col_feat - Inches(0.15), rh,
-            feat, size=Pt(11), color=SLATE_700, anchor=MSO_ANCHOR.MIDDLE)
+            row["feature"], size=Pt(11), color=SLATE_700, anchor=MSO_ANCHOR.MIDDLE)
         txt(sl, lx + col_feat, y, col_comp, rh,
-            comp, size=Pt(10.5), color=SLATE_500,
+            row["competitors"], size=Pt(10.5), color=SLATE_500,
             align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
         txt(sl, fa_x, y, col_fa, rh,
-            finapp, size=Pt(11), color=EMERALD_600,
+            "✓  " + row["finapp"], size=Pt(11), color=EMERALD_600,
             bold=True, align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 6 — A SOLUCAO (HERO)
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, SLATE_900)
+
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 6 — A SOLUCAO (HERO)
+# ───────────────────────────────────────────────────────────────────────────────
+
+@slide(SLATE_900)
+def slide_solucao(sl, section, title, lead, pills):
     stripe_left(sl)
 
     deco_circle(sl, Inches(10.2), Inches(0.5), Inches(5))
     deco_circle(sl, Inches(0.5), Inches(5.8), Inches(2.5))
 
-    label(sl, Inches(1.0), Inches(0.45), "A SOLUCAO", EMERALD_400)
+    label(sl, Inches(1.0), Inches(0.45), section, EMERALD_400)
 
     txt(sl, Inches(1.0), Inches(1.1), Inches(9), Inches(1.6),
-        "Tudo o que voce precisa.\nEm um unico lugar.",
-        size=Pt(44), color=WHITE, bold=True, spacing=Pt(56))
+        title, size=Pt(44), color=WHITE, bold=True, spacing=Pt(56))
 
     txt(sl, Inches(1.0), Inches(3.1), Inches(9), Inches(0.9),
-        "Contas, transacoes, investimentos, metas, dividas, simuladores\n"
-        "e um assistente com inteligencia artificial — integrados numa\n"
-        "plataforma moderna. Gratuita. Sem paywall.",
-        size=Pt(16.5), color=SLATE_400, spacing=Pt(24))
+        lead, size=Pt(16.5), color=SLATE_400, spacing=Pt(24))
 
     # Pills 4x3
-    pills_items = [
-        "Controle completo",    "Importacao OFX/CSV/PDF", "Transacoes planejadas",
-        "Orcamento com tetos",  "Metas financeiras",      "Gestao de dividas",
-        "Fluxo de caixa",       "Investimentos + IPCA",   "Historico de KPIs",
-        "Assistente IA",        "4 Simuladores",          "Deteccao de padroes",
-    ]
-
-    pill_y0 = Inches(4.5)
-    pill_w  = Inches(2.9)
-    pill_h  = Inches(0.44)
-    gap_x   = Inches(0.42)
-    gap_y   = Inches(0.2)
-    pill_x0 = Inches(1.0)
-
-    for i, p_text in enumerate(pills_items):
-        col = i % 4
-        row = i // 4
-        x = pill_x0 + col * (pill_w + gap_x)
-        y = pill_y0 + row * (pill_h + gap_y)
+    pill_w = Inches(2.9)
+    pill_h = Inches(0.44)
+    cells = grid(Inches(1.0), Inches(4.5), pill_w + Inches(0.42), pill_h + Inches(0.2),
+                 len(pills), cols=4)
+
+    for (x, y), p_text in zip(cells, pills):
         rrect(sl, x, y, pill_w, pill_h, SLATE_800)
         txt(sl, x, y, pill_w, pill_h,
-            "\u2713  " + p_text, size=Pt(11), color=EMERALD_400,
+            "✓  " + p_text, size=Pt(11), color=EMERALD_400,
             bold=True, align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 7 — CONTROLE FINANCEIRO + ORCAMENTO
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, SLATE_50)
 
-    label(sl, Inches(0.8), Inches(0.38), "MODULO 1 — CONTROLE E ORCAMENTO")
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 7 — CONTROLE FINANCEIRO + ORCAMENTO
+# ───────────────────────────────────────────────────────────────────────────────
+
+@slide(SLATE_50)
+def slide_controle(sl, section, title, features):
+    label(sl, Inches(0.8), Inches(0.38), section)
 
     txt(sl, Inches(0.8), Inches(0.8), Inches(11), Inches(0.6),
-        "Seu dinheiro, dia a dia — com clareza e sem esforco.",
-        size=Pt(28), color=SLATE_900, bold=True)
-
-    # 6 feature cards em 3x2
-    feats = [
-        ("$", "Contas e Transacoes",
-         "Multiplas contas (banco, cartao, carteira). Saldo atualizado automaticamente. Historico paginado com busca e filtros avancados."),
-        ("\u2191\u2193", "Importacao Inteligente",
-         "Importe OFX, CSV ou faturas PDF. Gemini extrai os dados automaticamente. Deteccao de duplicatas e auto-categorizacao por regras."),
-        ("\u2637", "Orcamento por Categoria",
-         "Tetos mensais por categoria de despesa. Badges de alerta (Atencao / Estourado) no Dashboard. Insights proativos baseados nos desvios."),
-        ("\u21BB", "Transacoes Planejadas",
-         "Recorrentes sem prazo, pontuais ou com periodo. Deteccao automatica de padroes e sugestao de criar recorrentes."),
-        ("\u25A6", "Dashboard com KPIs",
-         "5 indicadores-chave: taxa de poupanca, runway financeiro, reserva de emergencia, desvio orcamentario e percentual de gasto fixo."),
-        ("\u2261", "Fluxo de Caixa",
-         "Fluxo Diario (dia a dia com saldo acumulado) e Fluxo Previsto (projecao de 4 meses). Ideal para evitar surpresas no fim do mes."),
-    ]
+        title, size=Pt(28), color=SLATE_900, bold=True)
 
+    # Feature cards em 3 colunas
     cw, ch = Inches(3.7), Inches(2.5)
-    gx, gy = Inches(0.35), Inches(0.28)
-    sx, sy = Inches(0.8), Inches(1.65)
+    cells = grid(Inches(0.8), Inches(1.65), cw + Inches(0.35), ch + Inches(0.28),
+                 len(features), cols=3)
 
-    for i, (icon, title, desc) in enumerate(feats):
-        col = i % 3
-        row = i // 3
-        x = sx + col * (cw + gx)
-        y = sy + row * (ch + gy)
-        feature_card(sl, x, y, cw, ch, icon, title, desc)
+    for (x, y), feat in zip(cells, features):
+        feature_card(sl, x, y, cw, ch, feat["icon"], feat["title"], feat["desc"])
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 8 — METAS, DIVIDAS E SIMULADORES
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, WHITE)
 
-    label(sl, Inches(0.8), Inches(0.38), "MODULO 2 — PLANEJAMENTO FINANCEIRO")
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 8 — METAS, DIVIDAS E SIMULADORES
+# ───────────────────────────────────────────────────────────────────────────────
+
+@slide(WHITE)
+def slide_planejamento(sl, section, title, columns):
+    label(sl, Inches(0.8), Inches(0.38), section)
 
     txt(sl, Inches(0.8), Inches(0.8), Inches(11), Inches(0.6),
-        "De onde voce esta para onde quer chegar.",
-        size=Pt(28), color=SLATE_900, bold=True)
-
-    # Coluna esquerda — Metas
-    rect(sl, Inches(0.7), Inches(1.65), Inches(3.9), Inches(5.5), EMERALD_50)
-    accent_bar(sl, Inches(0.7), Inches(1.65), Inches(3.9), Pt(5), EMERALD_600)
-    txt(sl, Inches(1.0), Inches(1.9), Inches(3.3), Inches(0.45),
-        "Metas Financeiras", size=Pt(18), color=EMERALD_600, bold=True)
-    txt(sl, Inches(1.0), Inches(2.5), Inches(3.3), Inches(0.55),
-        "Crie objetivos com prazo e valor alvo.\nAcompanhe o progresso com barra visual.",
-        size=Pt(12.5), color=SLATE_600, spacing=Pt(17))
-    checklist(sl, Inches(1.0), Inches(3.35), Inches(3.3),
-              ["Vinculada a conta real",
-               "Progresso automatico pelo saldo",
-               "Aporte mensal necessario",
-               "Widget no Dashboard",
-               "Exemplos: viagem, carro, IF"],
-              size=Pt(12), gap=Pt(8))
-
-    # Coluna centro — Dividas
-    rect(sl, Inches(4.8), Inches(1.65), Inches(3.9), Inches(5.5), ROSE_50)
-    accent_bar(sl, Inches(4.8), Inches(1.65), Inches(3.9), Pt(5), ROSE_500)
-    txt(sl, Inches(5.1), Inches(1.9), Inches(3.3), Inches(0.45),
-        "Gestao de Dividas", size=Pt(18), color=ROSE_500, bold=True)
-    txt(sl, Inches(5.1), Inches(2.5), Inches(3.3), Inches(0.55),
-        "Centralize emprestimos, financiamentos\ne cartoes parcelados em um lugar so.",
-        size=Pt(12.5), color=SLATE_600, spacing=Pt(17))
-    checklist(sl, Inches(5.1), Inches(3.35), Inches(3.3),
-              ["Saldo devedor + parcelas restantes",
-               "Simulador de pagamento extra",
-               "Calculo de juros totais",
-               "Widget no Dashboard",
-               "Priorize a divida certa"],
-              size=Pt(12), color=ROSE_500, gap=Pt(8))
-
-    # Coluna direita — Simuladores
-    rect(sl, Inches(8.9), Inches(1.65), Inches(3.9), Inches(5.5), VIOLET_50)
-    accent_bar(sl, Inches(8.9), Inches(1.65), Inches(3.9), Pt(5), VIOLET_500)
-    txt(sl, Inches(9.2), Inches(1.9), Inches(3.3), Inches(0.45),
-        "Simuladores Educacionais", size=Pt(18), color=VIOLET_500, bold=True)
-    txt(sl, Inches(9.2), Inches(2.5), Inches(3.3), Inches(0.55),
-        "4 calculadoras interativas para\ndecisoes financeiras mais inteligentes.",
-        size=Pt(12.5), color=SLATE_600, spacing=Pt(17))
-    checklist(sl, Inches(9.2), Inches(3.35), Inches(3.3),
-              ["Juros Compostos",
-               "Impacto da Inflacao",
-               "Custo de Oportunidade",
-               "Independencia Financeira (FIRE)",
-               "Calculos em tempo real"],
-              size=Pt(12), color=VIOLET_500, gap=Pt(8))
-
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 9 — INVESTIMENTOS E HISTORICO
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, SLATE_50)
-
-    label(sl, Inches(0.8), Inches(0.38), "MODULO 3 — INVESTIMENTOS E ANALISE")
+        title, size=Pt(28), color=SLATE_900, bold=True)
+
+    # Colunas: Metas, Dividas, Simuladores
+    cw = Inches(3.9)
+    cells = grid(Inches(0.7), Inches(1.65), cw + Inches(0.2), 0, len(columns), cols=len(columns))
+
+    for (x, y), col in zip(cells, columns):
+        rect(sl, x, y, cw, Inches(5.5), col["background"])
+        accent_bar(sl, x, y, cw, Pt(5), col["accent"])
+        txt(sl, x + Inches(0.3), y + Inches(0.25), Inches(3.3), Inches(0.45),
+            col["title"], size=Pt(18), color=col["accent"], bold=True)
+        txt(sl, x + Inches(0.3), y + Inches(0.85), Inches(3.3), Inches(0.55),
+            col["desc"], size=Pt(12.5), color=SLATE_600, spacing=Pt(17))
+        checklist(sl, x + Inches(0.3), y + Inches(1.7), Inches(3.3),
+                  col["items"], size=Pt(12), color=col["accent"], gap=Pt(8))
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 9 — INVESTIMENTOS E HISTORICO
+# ───────────────────────────────────────────────────────────────────────────────
+
+@slide(SLATE_50)
+def slide_investimentos(sl, section, title, panels):
+    label(sl, Inches(0.8), Inches(0.38), section)
 
     txt(sl, Inches(0.8), Inches(0.8), Inches(11), Inches(0.6),
-        "Patrimonio e evolucao financeira em um so painel.",
-        size=Pt(28), color=SLATE_900, bold=True)
-
-    # Cards lado a lado
-    # Investimentos (esquerda)
-    rrect(sl, Inches(0.8), Inches(1.65), Inches(5.8), Inches(5.5), WHITE, line_color=SLATE_200)
-    accent_bar(sl, Inches(1.1), Inches(2.0), Inches(0.7), Pt(4), EMERALD_600)
-    txt(sl, Inches(1.1), Inches(2.18), Inches(5), Inches(0.5),
-        "Carteira de Investimentos", size=Pt(20), color=SLATE_900, bold=True)
-    txt(sl, Inches(1.1), Inches(2.78), Inches(5), Inches(0.7),
-        "CDB, Tesouro Direto, Acoes, Cripto, Fundos — todos em um unico lugar. "
-        "Aportes, resgates e atualizacoes de saldo. Quadro de evolucao mensal.",
-        size=Pt(12.5), color=SLATE_600, spacing=Pt(18))
-    checklist(sl, Inches(1.1), Inches(3.75), Inches(5.1),
-              ["Agrupamento por tipo de produto",
-               "Historico de lancamentos",
-               "Evolucao mensal (quadro visual)",
-               "Retorno real descontando inflacao (IPCA 12 meses)",
-               "Widget com saldo total no Dashboard"],
-              size=Pt(12.5), gap=Pt(8))
-
-    # Historico de KPIs (direita)
-    rrect(sl, Inches(6.9), Inches(1.65), Inches(5.8), Inches(5.5), WHITE, line_color=SLATE_200)
-    accent_bar(sl, Inches(7.2), Inches(2.0), Inches(0.7), Pt(4), BLUE_500)
-    txt(sl, Inches(7.2), Inches(2.18), Inches(5), Inches(0.5),
-        "Historico de KPIs Mensal", size=Pt(20), color=SLATE_900, bold=True)
-    txt(sl, Inches(7.2), Inches(2.78), Inches(5), Inches(0.7),
-        "Acompanhe a evolucao financeira mes a mes. Cada fechamento mensal "
-        "gera um snapshot automatico de todos os indicadores-chave.",
-        size=Pt(12.5), color=SLATE_600, spacing=Pt(18))
-    checklist(sl, Inches(7.2), Inches(3.75), Inches(5.1),
-              ["Grafico Receitas vs Despesas vs Saldo",
-               "Grafico de saude financeira (taxa de poupanca)",
-               "Tabela comparativa mes a mes",
-               "Fechamento mensal guiado com sugestoes",
-               "Base para decisoes de medio prazo"],
-              size=Pt(12.5), color=BLUE_500, gap=Pt(8))
-
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 10 — ASSISTENTE IA (DIFERENCIAL)
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, WHITE)
+        title, size=Pt(28), color=SLATE_900, bold=True)
+
+    # Cards lado a lado: Investimentos e Historico de KPIs
+    cw = Inches(5.8)
+    cells = grid(Inches(0.8), Inches(1.65), cw + Inches(0.3), 0, len(panels), cols=len(panels))
 
+    for (x, y), panel in zip(cells, panels):
+        rrect(sl, x, y, cw, Inches(5.5), WHITE, line_color=SLATE_200)
+        accent_bar(sl, x + Inches(0.3), Inches(2.0), Inches(0.7), Pt(4), panel["accent"])
+        txt(sl, x + Inches(0.3), Inches(2.18), Inches(5), Inches(0.5),
+            panel["title"], size=Pt(20), color=SLATE_900, bold=True)
+        txt(sl, x + Inches(0.3), Inches(2.78), Inches(5), Inches(0.7),
+            panel["desc"], size=Pt(12.5), color=SLATE_600, spacing=Pt(18))
+        checklist(sl, x + Inches(0.3), Inches(3.75), Inches(5.1),
+                  panel["items"], size=Pt(12.5), color=panel["accent"], gap=Pt(8))
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 9b — O PAINEL COM DADOS REAIS (so com --transactions)
+# ───────────────────────────────────────────────────────────────────────────────
+
+@slide(WHITE, data=("months", "income", "expense", "categories", "rows"))
+def slide_dados(sl, section, title, months_title, categories_title, income_label,
+                expense_label, source, months, income, expense, categories, rows):
+    label(sl, Inches(0.8), Inches(0.38), section)
+
+    txt(sl, Inches(0.8), Inches(0.8), Inches(11), Inches(0.6),
+        title, size=Pt(28), color=SLATE_900, bold=True)
+
+    # Receitas x despesas por mes (esquerda)
+    txt(sl, Inches(0.8), Inches(1.6), Inches(7.2), Inches(0.4),
+        months_title, size=Pt(14), color=SLATE_700, bold=True)
+    column_chart(sl, Inches(0.8), Inches(2.05), Inches(7.2), Inches(4.6),
+                 [month_label(m) for m in months],
+                 [(income_label, income, EMERALD_500), (expense_label, expense, ROSE_500)])
+
+    # Despesas por categoria (direita)
+    txt(sl, Inches(8.4), Inches(1.6), Inches(4.2), Inches(0.4),
+        categories_title, size=Pt(14), color=SLATE_700, bold=True)
+    bar_chart(sl, Inches(8.4), Inches(2.05), Inches(4.2), Inches(4.6), categories)
+
+    txt(sl, Inches(0.8), Inches(6.85), Inches(11), Inches(0.35),
+        source.format(rows=f"{rows:,}".replace(",", ".")), size=Pt(8.5), color=SLATE_400)
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 10 — ASSISTENTE IA (DIFERENCIAL)
+# ───────────────────────────────────────────────────────────────────────────────
+
+@slide(WHITE)
+def slide_assistente(sl, section, title, lead, badge, prompt, questions, footer):
     # Painel escuro esquerda
     rect(sl, 0, 0, Inches(6.5), H, SLATE_900)
     stripe_left(sl)
 
     deco_circle(sl, Inches(3.5), Inches(5.0), Inches(3.5), SLATE_800)
 
-    label(sl, Inches(0.9), Inches(0.65), "O DIFERENCIAL", EMERALD_400)
+    label(sl, Inches(0.9), Inches(0.65), section, EMERALD_400)
 
     txt(sl, Inches(0.9), Inches(1.4), Inches(5.2), Inches(1.6),
-        "Um assistente\nque conhece\nsuas financas.",
-        size=Pt(38), color=WHITE, bold=True, spacing=Pt(50))
+        title, size=Pt(38), color=WHITE, bold=True, spacing=Pt(50))
 
     txt(sl, Inches(0.9), Inches(3.6), Inches(5.0), Inches(1.1),
-        "O Assistente analisa suas contas, transacoes, recorrentes, "
-        "investimentos e projecoes em tempo real — e responde com "
-        "diagnosticos personalizados, nao respostas genericas.",
-        size=Pt(13.5), color=SLATE_400, spacing=Pt(21))
+        lead, size=Pt(13.5), color=SLATE_400, spacing=Pt(21))
 
     # Badge powered by
     rrect(sl, Inches(0.9), Inches(5.0), Inches(2.8), Inches(0.42), SLATE_800)
     txt(sl, Inches(0.9), Inches(5.0), Inches(2.8), Inches(0.42),
-        "Powered by Gemini 2.5 Flash", size=Pt(11),
+        badge, size=Pt(11),
         color=SLATE_400, align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
 
     # Painel direito — perguntas
     txt(sl, Inches(6.9), Inches(0.65), Inches(5.5), Inches(0.4),
-        "O usuario pergunta:", size=Pt(13.5), color=SLATE_500, bold=True)
-
-    questions = [
-        "\"Como esta minha saude financeira?\"",
-        "\"Minhas despesas estao controladas?\"",
-        "\"Quais categorias estouraram o teto?\"",
-        "\"Vale a pena quitar minha divida agora?\"",
-        "\"Estou no caminho certo para minha meta?\"",
-        "\"Como posso economizar mais este mes?\"",
-    ]
-
-    for i, q in enumerate(questions):
-        y = Inches(1.3) + i * Inches(0.88)
-        rrect(sl, Inches(6.9), y, Inches(5.7), Inches(0.68), EMERALD_50)
+        prompt, size=Pt(13.5), color=SLATE_500, bold=True)
+
+    for (x, y), q in zip(grid(Inches(6.9), Inches(1.3), 0, Inches(0.88), len(questions)),
+                         questions):
+        rrect(sl, x, y, Inches(5.7), Inches(0.68), EMERALD_50)
         txt(sl, Inches(7.15), y, Inches(5.2), Inches(0.68),
             q, size=Pt(13.5), color=SLATE_700, anchor=MSO_ANCHOR.MIDDLE)
 
     rrect(sl, Inches(6.9), Inches(6.7), Inches(5.7), Inches(0.5), SLATE_100)
     txt(sl, Inches(7.1), Inches(6.7), Inches(5.3), Inches(0.5),
-        "\u21BB  Mantem contexto conversacional — perguntas de acompanhamento naturais",
-        size=Pt(11), color=SLATE_600, anchor=MSO_ANCHOR.MIDDLE)
+        footer, size=Pt(11), color=SLATE_600, anchor=MSO_ANCHOR.MIDDLE)
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 11 — A EVIDENCIA
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, SLATE_50)
 
-    label(sl, Inches(0.8), Inches(0.38), "A EVIDENCIA")
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 11 — A EVIDENCIA
+# ───────────────────────────────────────────────────────────────────────────────
+
+@slide(SLATE_50)
+def slide_evidencia(sl, section, title, evidence, insight):
+    label(sl, Inches(0.8), Inches(0.38), section)
 
     txt(sl, Inches(0.8), Inches(0.82), Inches(11), Inches(0.65),
-        "Controlar financas funciona. Os numeros comprovam.",
-        size=Pt(32), color=SLATE_900, bold=True)
-
-    evidence = [
-        ("88%",   "dos usuarios de\napps financeiros\nconsideram a\nferramenta muito\nou extremamente util",
-         EMERALD_600, "Academy Bank Research"),
-        ("2,5x",  "mais chance de\npoupar o suficiente\npara a aposentadoria\nquem usa planejamento\nfinanceiro",
-         BLUE_500, "Ramsey Solutions"),
-        ("+59%",  "crescimento em\ninstalacoes de apps\nfinanceiros na\nAmerica Latina\nem 2025",
-         EMERALD_600, "TI Inside / Adjust"),
-        ("90%",   "dos brasileiros\nadmitem precisar\nde mais educacao\nfinanceira",
-         AMBER_500, "Funpresp-Jud"),
-    ]
+        title, size=Pt(32), color=SLATE_900, bold=True)
 
     cw, ch = Inches(2.9), Inches(3.8)
-    sx, sy = Inches(0.8), Inches(2.3)
-    gx = Inches(0.3)
+    cells = grid(Inches(0.8), Inches(2.3), cw + Inches(0.3), 0, len(evidence), cols=len(evidence))
 
-    for i, (num, lbl, accent, source) in enumerate(evidence):
-        x = sx + i * (cw + gx)
-        stat_card(sl, x, sy, cw, ch, num, lbl, accent, number_size=Pt(42), source=source)
+    for (x, y), item in zip(cells, evidence):
+        stat_card(sl, x, y, cw, ch, item["number"], item["desc"], item["accent"],
+                  number_size=Pt(42), source=item["source"])
 
     # Bottom insight bar
     rrect(sl, Inches(0.8), Inches(6.4), Inches(11.5), Inches(0.68), SLATE_900)
     txt(sl, Inches(0.8), Inches(6.4), Inches(11.5), Inches(0.68),
-        "  O mercado de fintech pessoal cresce 2 digitos ao ano na America Latina. "
-        "O usuario quer controle — faltava a ferramenta certa.",
-        size=Pt(13), color=EMERALD_400, anchor=MSO_ANCHOR.MIDDLE)
+        insight, size=Pt(13), color=EMERALD_400, anchor=MSO_ANCHOR.MIDDLE)
+
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 12 — OPORTUNIDADE DE MERCADO
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, WHITE)
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 12 — OPORTUNIDADE DE MERCADO
+# ───────────────────────────────────────────────────────────────────────────────
 
-    label(sl, Inches(0.8), Inches(0.38), "OPORTUNIDADE")
+@slide(WHITE)
+def slide_oportunidade(sl, section, title, market, gaps_title, gaps):
+    label(sl, Inches(0.8), Inches(0.38), section)
 
     txt(sl, Inches(0.8), Inches(0.82), Inches(11), Inches(0.65),
-        "Um mercado enorme com lacunas claras.",
-        size=Pt(32), color=SLATE_900, bold=True)
+        title, size=Pt(32), color=SLATE_900, bold=True)
 
     # Numeros de mercado (esquerda)
-    market = [
-        ("USD 21,4 bi",  "Mercado global de apps\nfinanceiros pessoais em 2025", EMERALD_600),
-        ("42 milhoes",   "Brasileiros ja conectados\nao Open Finance",             BLUE_500),
-        ("44%",          "dos bancarizados gerem\nfinancas so pelo celular",        AMBER_500),
-        ("213 milhoes",  "de brasileiros — mercado\nenderecavel domestico",         VIOLET_500),
-    ]
-
-    for i, (num, lbl, accent) in enumerate(market):
-        y = Inches(1.85) + i * Inches(1.35)
-        rect(sl, Inches(0.8), y, Pt(5), Inches(1.0), accent)
+    for (x, y), item in zip(grid(Inches(0.8), Inches(1.85), 0, Inches(1.35), len(market)),
+                            market):
+        rect(sl, x, y, Pt(5), Inches(1.0), item["accent"])
         txt(sl, Inches(1.1), y, Inches(4.5), Inches(0.62),
-            num, size=Pt(28), color=accent, bold=True)
+            item["number"], size=Pt(28), color=item["accent"], bold=True)
         txt(sl, Inches(1.1), y + Inches(0.6), Inches(4.5), Inches(0.6),
-            lbl, size=Pt(12.5), color=SLATE_600, spacing=Pt(17))
+            item["desc"], size=Pt(12.5), color=SLATE_600, spacing=Pt(17))
 
     # Painel direito — lacunas que FinApp preenche
     rrect(sl, Inches(6.5), Inches(1.65), Inches(6.0), Inches(5.6), SLATE_900)
     txt(sl, Inches(7.0), Inches(2.05), Inches(5.0), Inches(0.5),
-        "FinApp preenche as lacunas:", size=Pt(16),
+        gaps_title, size=Pt(16),
         color=EMERALD_400, bold=True)
 
-    gaps = [
-        "Gratuito e completo — sem paywall em funcionalidades essenciais",
-        "IA integrada no app — nao em canal separado (WhatsApp)",
-        "Importacao OFX, CSV e PDF com IA — 3 formatos num so lugar",
-        "Metas e Dividas integrados — ausentes em todos os concorrentes",
-        "4 Simuladores educacionais — nao encontrado em nenhum rival",
-        "KPIs, tetos e alertas — orcamento ativo, nao passivo",
-        "Investimentos na mesma plataforma — sem app adicional",
-        "Fechamento mensal e historico — memoria financeira real",
-    ]
-
     checklist(sl, Inches(7.0), Inches(2.75), Inches(5.0),
               gaps, size=Pt(12), color=EMERALD_500, text_color=WHITE, gap=Pt(6))
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 13 — POR QUE FINAPP (3 PILARES)
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, EMERALD_600)
 
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 13 — POR QUE FINAPP (3 PILARES)
+# ───────────────────────────────────────────────────────────────────────────────
+
+@slide(EMERALD_600)
+def slide_pilares(sl, section, title, pillars):
     # Decorativos
     deco_circle(sl, Inches(10.5), Inches(-0.5), Inches(3), EMERALD_DK)
     deco_circle(sl, Inches(-0.5), Inches(5.5), Inches(2.5), EMERALD_DK)
 
-    label(sl, Inches(0.8), Inches(0.45), "POR QUE FINAPP?", EMERALD_100)
+    label(sl, Inches(0.8), Inches(0.45), section, EMERALD_100)
 
     txt(sl, Inches(0.8), Inches(1.0), Inches(10), Inches(0.8),
-        "Tres razoes que fazem a diferenca.",
-        size=Pt(36), color=WHITE, bold=True)
-
-    pillars = [
-        ("Completo",
-         "12 modulos integrados:\nContas, Transacoes, Recorrentes,\nMetas, Dividas, Investimentos,\n"
-         "Fluxo, Historico, Simuladores,\nAssistente IA, Importacao e Dashboard.\n\n"
-         "Uma plataforma. Sem fragmentacao."),
-        ("Inteligente",
-         "Assistente IA com seus dados reais.\n5 KPIs com alertas automaticos.\n"
-         "Tetos de orcamento por categoria.\nDeteccao de recorrencias.\n"
-         "Fechamento mensal guiado.\nRetorno real descontando inflacao."),
-        ("Acessivel",
-         "Interface moderna e intuitiva.\nDark mode nativo.\n"
-         "Web + celular — sem instalar nada.\n\n"
-         "Gratuito.\nSem paywall. Sem restricoes.\nFuncionalidades que custam\nR$ 35/mes em outros apps."),
-    ]
+        title, size=Pt(36), color=WHITE, bold=True)
 
     cw, ch = Inches(3.7), Inches(4.0)
-    gx     = Inches(0.45)
-    sx, sy = Inches(0.8), Inches(2.5)
+    cells = grid(Inches(0.8), Inches(2.5), cw + Inches(0.45), 0, len(pillars), cols=len(pillars))
 
-    for i, (title, desc) in enumerate(pillars):
-        x = sx + i * (cw + gx)
-        rrect(sl, x, sy, cw, ch, EMERALD_DK)
+    for i, ((x, y), pillar) in enumerate(zip(cells, pillars)):
+        rrect(sl, x, y, cw, ch, EMERALD_DK)
 
         # Numero do pilar
-        oval(sl, x + Inches(0.3), sy + Inches(0.25),
+        oval(sl, x + Inches(0.3), y + Inches(0.25),
              Inches(0.45), Inches(0.45), EMERALD_400)
-        txt(sl, x + Inches(0.3), sy + Inches(0.25), Inches(0.45), Inches(0.45),
+        txt(sl, x + Inches(0.3), y + Inches(0.25), Inches(0.45), Inches(0.45),
             str(i + 1), size=Pt(15), color=SLATE_900,
             bold=True, align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
 
-        txt(sl, x + Inches(0.88), sy + Inches(0.22), cw - Inches(1.1), Inches(0.5),
-            title, size=Pt(22), color=WHITE, bold=True)
+        txt(sl, x + Inches(0.88), y + Inches(0.22), cw - Inches(1.1), Inches(0.5),
+            pillar["title"], size=Pt(22), color=WHITE, bold=True)
+
+        accent_bar(sl, x + Inches(0.3), y + Inches(0.88), Inches(0.9), Pt(3), EMERALD_400)
 
-        accent_bar(sl, x + Inches(0.3), sy + Inches(0.88), Inches(0.9), Pt(3), EMERALD_400)
+        txt(sl, x + Inches(0.3), y + Inches(1.1), cw - Inches(0.55), ch - Inches(1.4),
+            pillar["desc"], size=Pt(12.5), color=EMERALD_100, spacing=Pt(19))
 
-        txt(sl, x + Inches(0.3), sy + Inches(1.1), cw - Inches(0.55), ch - Inches(1.4),
-            desc, size=Pt(12.5), color=EMERALD_100, spacing=Pt(19))
 
-    # ──────────────────────────────────────────────────────────────────────────
-    # SLIDE 14 — ENCERRAMENTO / CTA
-    # ──────────────────────────────────────────────────────────────────────────
-    sl = prs.slides.add_slide(blank)
-    bg(sl, SLATE_900)
+# ───────────────────────────────────────────────────────────────────────────────
+# SLIDE 14 — ENCERRAMENTO / CTA
+# ───────────────────────────────────────────────────────────────────────────────
+
+@slide(SLATE_900)
+def slide_cta(sl, title, subtitle, closing, button, footer):
     stripe_left(sl)
 
     # Orbs
@@ -907,41 +1599,406 @@ def build():
     deco_circle(sl, Inches(0.5), Inches(-0.5), Inches(2.5), SLATE_800)
 
     txt(sl, Inches(1.0), Inches(1.5), Inches(9), Inches(1.6),
-        "Assuma o controle\ndas suas financas.",
-        size=Pt(48), color=WHITE, bold=True, spacing=Pt(62))
+        title, size=Pt(48), color=WHITE, bold=True, spacing=Pt(62))
 
     txt(sl, Inches(1.0), Inches(3.5), Inches(7.5), Inches(0.55),
-        "Comece hoje. E gratuito. Sem paywall. Sem complicacao.",
-        size=Pt(20), color=EMERALD_400)
-
-    # 3 bullet points de fechamento
-    closing = [
-        "12 modulos integrados — tudo o que voce precisa, em um lugar",
-        "Assistente IA com seus dados reais — respostas de verdade",
-        "Gratuito — funcionalidades que custam R$ 35/mes nos concorrentes",
-    ]
+        subtitle, size=Pt(20), color=EMERALD_400)
 
+    # Bullet points de fechamento
     checklist(sl, Inches(1.0), Inches(4.3), Inches(8),
               closing, size=Pt(15), color=EMERALD_500, text_color=SLATE_300, gap=Pt(10))
 
     # Botao CTA
     rrect(sl, Inches(1.0), Inches(5.9), Inches(3.8), Inches(0.78), EMERALD_600)
     txt(sl, Inches(1.0), Inches(5.9), Inches(3.8), Inches(0.78),
-        "Conheca o FinApp  \u2192", size=Pt(19),
+        button, size=Pt(19),
         color=WHITE, bold=True,
         align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE)
 
     # Rodape
     accent_bar(sl, Inches(1.0), Inches(7.05), Inches(1.5), Pt(2))
     txt(sl, Inches(1.0), Inches(7.15), Inches(8), Inches(0.3),
-        "FinApp  |  Gestao Financeira Pessoal  |  Marco 2026  |  finapp-kohl.vercel.app",
-        size=Pt(10.5), color=SLATE_500)
+        footer, size=Pt(10.5), color=SLATE_500)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUILD
+# ═══════════════════════════════════════════════════════════════════════════════
 
-    # ── Salvar ────────────────────────────────────────────────────────────────
-    out = os.path.join(os.path.dirname(os.path.abspath(__file__)), "FinApp - Pitch Deck.pptx")
-    prs.save(out)
-    print("Pitch deck gerado: " + out)
+def transaction_inputs(path, categories_path=None, closing_day=1):
+    """Argumentos dos slides de dados, agregados da exportacao de transactions."""
+    summary = transacoes.aggregate(path, closing_day)
+    names = transacoes.read_categories(categories_path) if categories_path else {}
+    months = summary.months()
+    return {
+        "months": months,
+        "income": [summary.income.get(m, 0) / 100 for m in months],
+        "expense": [summary.expense.get(m, 0) / 100 for m in months],
+        "categories": [(name, cents / 100) for name, cents in summary.top_categories(names)],
+        "rows": summary.rows,
+    }
+
+
+def deck_specs(data=None):
+    """Slides do deck, na ordem; os de dados so entram com a exportacao."""
+    return [spec for spec in SLIDES if data is not None or not spec.data]
+
+
+def render_deck(prs, inputs, data=None, use_cache=True):
+    """
+    Monta os slides em prs. Retorna (slides, chave de cada slide, acertos no
+    cache); a chave e None nos slides de dados, que nao vao para o cache.
+    """
+    hits = 0
+    slides, keys = [], []
+    for n, spec in enumerate(deck_specs(data), start=1):
+        with PROFILER.phase(f"slide {n:02d}"):
+            sl = new_slide(prs, spec.background)
+            slides.append(sl)
+            args = dict(inputs[spec.name], **{name: data[name] for name in spec.data})
+            key = slide_key(spec, args) if spec.cacheable else None
+            keys.append(key)
+            if key is None:
+                spec.render(sl, **args)
+                continue
+            if use_cache and restore_slide(sl, key):
+                hits += 1
+                continue
+            spec.render(sl, **args)
+            if use_cache:
+                store_slide(sl, key)
+    return slides, keys, hits
+
+
+def check_slides(numbered, overflow="avisar", layout_check=True):
+    """
+    Verificacao de textos e de layout de [(numero, slide)]. Retorna (caixas
+    medidas, estouros, formas verificadas, avisos de layout).
+    """
+    measured, overflows = 0, []
+    if overflow != "ignorar":
+        with PROFILER.phase("textos"):
+            for n, sl in numbered:
+                count, found = check_text(sl, n, shrink=overflow == "reduzir")
+                measured += count
+                overflows += found
+
+    shapes, layout_problems = 0, []
+    if layout_check:
+        with PROFILER.phase("layout"):
+            for n, sl in numbered:
+                count, found = check_layout(sl, n)
+                shapes += count
+                layout_problems += found
+    return measured, overflows, shapes, layout_problems
+
+
+def report_checks(checks, overflow="avisar", layout_check=True, indent=""):
+    measured, overflows, shapes, layout_problems = checks
+    if overflow != "ignorar":
+        print(f"{indent}Textos: {measured} caixas medidas, {len(overflows)} maiores que a caixa")
+        for item in overflows:
+            print(f"{indent}  {item}")
+    if layout_check:
+        print(f"{indent}Layout: {shapes} formas verificadas, {len(layout_problems)} avisos")
+        for problem in layout_problems:
+            print(f"{indent}  {problem}")
+
+
+def build(out=OUT_PATH, compression="deflate", level=pacote.DEFAULT_LEVEL, use_cache=True,
+          spec_path=SPEC_PATH, overflow="avisar", layout_check=True,
+          transactions=None, categories=None, closing_day=1, preview=None, preview_width=960,
+          jobs=1):
+    with PROFILER.phase("setup"):
+        inputs = load_spec(spec_path)
+        prs = new_presentation()
+
+    data = None
+    if transactions:
+        with PROFILER.phase("transacoes"):
+            data = transaction_inputs(transactions, categories, closing_day)
+
+    slides, keys, hits = render_deck(prs, inputs, data, use_cache)
+    if use_cache:
+        prune_cache({key for key in keys if key})
+
+    checks = check_slides(list(enumerate(slides, start=1)), overflow, layout_check)
+
+    if preview:
+        with PROFILER.phase("miniaturas"):
+            t0 = time.perf_counter()
+            changed = write_previews(slides, preview, preview_width, jobs)
+            preview_ms = (time.perf_counter() - t0) * 1000
+
+    with PROFILER.phase("save"):
+        pacote.stamp_core_properties(prs.core_properties, "FinApp — Pitch Deck")
+        written, digest = pacote.save_package(prs.save, out, compression, level)
+    print(pacote.describe("Pitch deck", out, written, digest))
+    print(f"Slides: {hits} do cache, {len(slides) - hits} renderizados")
+    if data is not None:
+        print(f"Transacoes: {data['rows']} linhas em {len(data['months'])} meses")
+    report_checks(checks, overflow, layout_check)
+    if preview:
+        print(f"Miniaturas: {len(slides)} em {preview} ({changed} alteradas, "
+              f"{preview_ms:.0f} ms)")
+
+
+# ── Lote de decks ──────────────────────────────────────────────────────────────
+#
+# Um deck por linha de uma tabela CSV de variantes (um por prospect ou
+# parceiro). A coluna "arquivo" da o nome do pptx; cada coluna "slide.campo"
+# troca um campo de texto do roteiro, como capa.subtitle, mercado.highlight ou
+# cta.button. Celula vazia mantem o roteiro. O deck base e montado e salvo uma
+# vez; cada worker abre essa base uma vez e, por variante, so redesenha os
+# slides cujos argumentos mudaram. Os outros voltam ao XML que ja tinham.
+
+BATCH_DIR = os.path.join(SCRIPT_DIR, ".cache", "pitch-lote")
+NAME_COLUMN = "arquivo"
+
+# Estado de cada worker do lote (ver _init_batch)
+_BATCH = {}
+
+
+def load_variants(path, inputs):
+    """[(arquivo, {nome da funcao: {campo: texto}})] das linhas do CSV em path."""
+    entries = {spec.entry: spec for spec in SLIDES}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        header = reader.fieldnames or []
+        if NAME_COLUMN not in header:
+            raise DeckSpecError(f"{path}: falta a coluna '{NAME_COLUMN}'")
+        columns = {}
+        for column in header:
+            if column == NAME_COLUMN:
+                continue
+            entry, _, field = column.partition(".")
+            spec = entries.get(entry)
+            if spec is None or field not in spec.fields:
+                raise DeckSpecError(f"{path}: coluna desconhecida '{column}' (use slide.campo)")
+            if spec.data or not isinstance(inputs[spec.name][field], str):
+                raise DeckSpecError(f"{path}: coluna '{column}': so campos de texto de "
+                                    "slides sem dados variam no lote")
+            columns[column] = (spec.name, field)
+
+        variants, seen = [], set()
+        for line, row in enumerate(reader, start=2):
+            name = (row[NAME_COLUMN] or "").strip()
+            if not name or name in (".", "..") or any(c in name for c in "/\\"):
+                raise DeckSpecError(f"{path}:{line}: nome de arquivo invalido {name!r}")
+            if name in seen:
+                raise DeckSpecError(f"{path}:{line}: arquivo {name!r} repetido")
+            seen.add(name)
+            overrides = {}
+            for column, (slide_name, field) in columns.items():
+                if row.get(column):
+                    overrides.setdefault(slide_name, {})[field] = row[column]
+            variants.append((name, overrides))
+    return variants
+
+
+def _init_batch(base, inputs, data, keys, out_dir, options):
+    """Abre o deck base (bytes do pptx) uma vez por worker."""
+    prs = Presentation(io.BytesIO(base))
+    _BATCH.update(prs=prs, slides=list(prs.slides), specs=deck_specs(data),
+                  current=list(keys), memo={}, inputs=inputs, out_dir=out_dir, **options)
+
+
+def build_variant(variant):
+    """
+    Grava o deck de uma variante a partir do deck base do worker. Retorna
+    (arquivo, gravou?, sha256, slides renderizados, slides reaproveitados, avisos).
+    """
+    name, overrides = variant
+    state = _BATCH
+    current, memo = state["current"], state["memo"]
+    rendered = reused = 0
+    warnings = []
+    for i, (spec, sl) in enumerate(zip(state["specs"], state["slides"])):
+        if spec.data:
+            continue        # slides de dados sao iguais em todas as variantes
+        args = dict(state["inputs"][spec.name], **overrides.get(spec.name, {}))
+        key = slide_key(spec, args)
+        if key != current[i]:
+            # Guarda o que o slide tem agora (a base, na primeira troca)
+            memo.setdefault(current[i], (etree.tostring(sl.shapes._spTree, encoding="UTF-8"), []))
+            if key in memo:
+                paste_slide(sl, memo[key][0])
+                reused += 1
+            else:
+                clear_slide(sl)
+                spec.render(sl, **args)
+                _, overflows, _, problems = check_slides([(i + 1, sl)], state["overflow"],
+                                                         state["layout_check"])
+                memo[key] = (etree.tostring(sl.shapes._spTree, encoding="UTF-8"),
+                             [str(item) for item in overflows] + problems)
+                rendered += 1
+            current[i] = key
+        if key in memo:
+            warnings += memo[key][1]
+
+    out = os.path.join(state["out_dir"], name + ".pptx")
+    written, digest = pacote.save_package(state["prs"].save, out, state["compression"],
+                                          state["level"])
+    return name, written, digest, rendered, reused, warnings
+
+
+def build_batch(variants_path, out_dir=BATCH_DIR, compression="deflate",
+                level=pacote.DEFAULT_LEVEL, use_cache=True, spec_path=SPEC_PATH,
+                overflow="avisar", layout_check=True, transactions=None, categories=None,
+                closing_day=1, jobs=1):
+    with PROFILER.phase("setup"):
+        inputs = load_spec(spec_path)
+        variants = load_variants(variants_path, inputs)
+        prs = new_presentation()
+
+    data = None
+    if transactions:
+        with PROFILER.phase("transacoes"):
+            data = transaction_inputs(transactions, categories, closing_day)
+
+    slides, keys, hits = render_deck(prs, inputs, data, use_cache)
+    if use_cache:
+        prune_cache({key for key in keys if key})
+    checks = check_slides(list(enumerate(slides, start=1)), overflow, layout_check)
+
+    with PROFILER.phase("base"):
+        pacote.stamp_core_properties(prs.core_properties, "FinApp — Pitch Deck")
+        buf = io.BytesIO()
+        prs.save(buf)
+        base = buf.getvalue()
+    print(f"Base: {len(slides)} slides ({hits} do cache, {len(slides) - hits} renderizados)")
+    report_checks(checks, overflow, layout_check)
+    if not variants:
+        print(f"Lote: nenhuma variante em {variants_path}")
+        return
+
+    os.makedirs(out_dir, exist_ok=True)
+    initargs = (base, inputs, data, keys, out_dir,
+                {"compression": compression, "level": level, "overflow": overflow,
+                 "layout_check": layout_check})
+    t0 = time.perf_counter()
+    with PROFILER.phase("lote"):
+        if jobs <= 1 or len(variants) <= 1:
+            _init_batch(*initargs)
+            results = [build_variant(variant) for variant in variants]
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(variants)),
+                                     initializer=_init_batch, initargs=initargs) as pool:
+                results = list(pool.map(build_variant, variants))
+    elapsed = time.perf_counter() - t0
+
+    written = sum(result[1] for result in results)
+    rendered = sum(result[3] for result in results)
+    reused = sum(result[4] for result in results)
+    print(f"Lote: {len(results)} decks em {out_dir} ({written} gerados, "
+          f"{len(results) - written} sem alteracoes)")
+    print(f"Slides das variantes: {rendered} renderizados, {reused} reaproveitados")
+    print(f"Vazao: {len(results) / elapsed:.1f} decks/s ({elapsed:.2f} s, "
+          f"{min(jobs, len(variants))} processos)")
+    for name, _, digest, _, _, warnings in results:
+        if warnings:
+            print(f"  {name}.pptx (sha256 {digest[:12]}): {len(warnings)} avisos")
+            for warning in warnings:
+                print(f"    {warning}")
+
+
+# ── Modo watch ─────────────────────────────────────────────────────────────────
+
+# Modulos auxiliares recarregados pelo watch quando mudam (dependencias primeiro)
+HELPERS = (perfil, pacote, metricas, transacoes, miniaturas)
+
+
+def load_fresh_generator(changed=()):
+    """Reexecuta este arquivo como modulo novo; pptx/lxml continuam em sys.modules."""
+    return observador.load_fresh(__file__, "gerar_pitch", HELPERS, changed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o pitch deck do FinApp (.pptx)")
+    parser.add_argument("--watch", action="store_true",
+                        help="reconstroi a cada alteracao do gerador")
+    parser.add_argument("--spec", default=SPEC_PATH, metavar="ARQUIVO",
+                        help="roteiro do deck em JSON ou YAML (padrao: pitch-deck.json)")
+    parser.add_argument("--transactions", metavar="CSV",
+                        help="exportacao da tabela transactions; inclui o slide com graficos "
+                             "de receitas, despesas e categorias")
+    parser.add_argument("--categories", metavar="CSV",
+                        help="exportacao da tabela categories, para os nomes no grafico")
+    parser.add_argument("--closing-day", type=int, choices=range(1, 29), default=1,
+                        metavar="1-28", help="dia de fechamento da competencia (padrao: 1)")
+    parser.add_argument("--batch", metavar="CSV",
+                        help="gera um deck por linha da tabela de variantes (coluna arquivo "
+                             "e colunas slide.campo, ex.: capa.subtitle, mercado.highlight)")
+    parser.add_argument("--batch-out", default=BATCH_DIR, metavar="DIR",
+                        help="pasta dos decks do lote (padrao: .cache/pitch-lote)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignora o cache de slides e renderiza o deck inteiro")
+    parser.add_argument("--overflow", choices=("avisar", "reduzir", "ignorar"), default="avisar",
+                        help="texto maior que a caixa: avisa, reduz a fonte (normAutofit) "
+                             "ou nao mede (padrao: avisar)")
+    parser.add_argument("--no-layout-check", action="store_true",
+                        help="nao procura formas sobrepostas ou fora do slide")
+    parser.add_argument("--preview", nargs="?", const=PREVIEW_DIR, metavar="DIR",
+                        help="grava uma miniatura PNG por slide "
+                             "(padrao: .cache/pitch-preview; exige o Pillow)")
+    parser.add_argument("--preview-width", type=int, default=960, metavar="PX",
+                        help="largura das miniaturas em pixels (padrao: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, metavar="N",
+                        help="processos para as miniaturas e para o lote "
+                             "(padrao: numero de CPUs)")
+    parser.add_argument("--compression", choices=sorted(pacote.COMPRESSION), default="deflate",
+                        help="compressao do pptx; store e mais rapido para builds de "
+                             "desenvolvimento (padrao: deflate)")
+    parser.add_argument("--level", type=int, choices=range(10), default=pacote.DEFAULT_LEVEL,
+                        metavar="0-9", help="nivel do deflate (padrao: %(default)s)")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_PATH, metavar="ARQUIVO",
+                        help="grava tempo e alocacoes por slide em JSON "
+                             "(padrao: .cache/perfil-pitch.json)")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs precisa ser pelo menos 1")
+    if args.preview_width < 16:
+        parser.error("--preview-width precisa ser pelo menos 16")
+    if args.batch and args.preview:
+        parser.error("--preview nao se combina com --batch")
+
+    def run(generator):
+        if args.profile:
+            generator.PROFILER.start(since=generator.IMPORT_T0)
+            generator.PROFILER.record("import", generator.IMPORT_WALL, *generator.IMPORT_MEM)
+        if args.batch:
+            generator.build_batch(args.batch, args.batch_out, compression=args.compression,
+                                  level=args.level, use_cache=not args.no_cache,
+                                  spec_path=args.spec, overflow=args.overflow,
+                                  layout_check=not args.no_layout_check,
+                                  transactions=args.transactions, categories=args.categories,
+                                  closing_day=args.closing_day, jobs=args.jobs)
+        else:
+            generator.build(compression=args.compression, level=args.level,
+                            use_cache=not args.no_cache, spec_path=args.spec,
+                            overflow=args.overflow, layout_check=not args.no_layout_check,
+                            transactions=args.transactions, categories=args.categories,
+                            closing_day=args.closing_day, preview=args.preview,
+                            preview_width=args.preview_width, jobs=args.jobs)
+        if args.profile:
+            generator.PROFILER.dump(args.profile, "gerar-pitch")
+
+    try:
+        run(sys.modules[__name__])
+    except (DeckSpecError, transacoes.TransactionsError, miniaturas.PreviewError) as e:
+        if not args.watch:
+            sys.exit(f"Erro na entrada: {e}")
+        print(f"Erro na entrada: {e}")
+    if not args.watch:
+        return
+
+    def rebuild(changed):
+        run(load_fresh_generator(changed))
+
+    sources = [os.path.abspath(__file__), *observador.sources(HELPERS)]
+    inputs = [args.spec, args.transactions, args.categories, args.batch]
+    observador.watch(sources + [os.path.abspath(p) for p in inputs if p], rebuild)
 
 
 if __name__ == "__main__":
-    build()
+    main()
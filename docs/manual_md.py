@@ -0,0 +1,447 @@
+"""
+Markdown do Manual do Usuário → AST de blocos, sem depender de python-docx.
+
+Usado por gerar-manual.py (todos os formatos de saída) e pelo modo --check,
+que valida manual-usuario.md sem carregar o docx.
+"""
+
+import re
+import os
+import time
+import argparse
+import unicodedata
+
+
+# ── Markup inline ──────────────────────────────────────────────────────────────
+#
+# Suportado: **negrito**, *itálico* / _itálico_, `código`,
+# [links](#ancora) e escapes (\*, \_, \`...). O texto vira uma lista de
+# segmentos (texto, marcas, href) já mesclados: segmentos vizinhos com a mesma
+# formatação viram um só run e nenhum run vazio é emitido. Como no CommonMark,
+# um marcador só abre se não vier espaço depois e só fecha se não vier espaço
+# antes: em "2 * 3 * 4" os asteriscos são texto.
+
+RE_INLINE = re.compile(
+    r"\\(?P<esc>[\\`*_\[\]()#!>|-])"
+    r"|`(?P<code>[^`]+)`"
+    r"|(?<!!)\[(?P<label>(?:\\.|[^\]\\])+)\]\((?P<href>[^)\s]+)\)"
+    r"|(?P<mark>\*\*|\*|(?<!\w)_(?=\S)|(?<=\S)_(?!\w))"
+)
+
+MARK_NAMES = {"**": "b", "*": "i", "_": "i"}
+
+
+def _flanking(text, start, end):
+    """(pode abrir, pode fechar) do marcador text[start:end]."""
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not after.isspace(), not before.isspace()
+
+
+def _lex_inline(text, href=None):
+    """
+    Primeira passada: texto, código, links e marcadores (ainda sem par, com
+    (pode abrir, pode fechar) de _flanking).
+    """
+    items = []
+    pos = 0
+    for m in RE_INLINE.finditer(text):
+        if m.start() > pos:
+            items.append(["text", text[pos:m.start()], href])
+        if m.group("esc") is not None:
+            items.append(["text", m.group("esc"), href])
+        elif m.group("code") is not None:
+            items.append(["code", m.group("code"), href])
+        elif m.group("label") is not None:
+            items.extend(_lex_inline(m.group("label"), m.group("href")))
+        else:
+            flanking = _flanking(text, m.start(), m.end())
+            # Cercado de espaços ("2 * 3"): não abre nem fecha, fica como texto
+            items.append(["mark" if any(flanking) else "text", m.group("mark"), href, flanking])
+        pos = m.end()
+    if pos < len(text):
+        items.append(["text", text[pos:], href])
+    return items
+
+
+def _pair_marks(items):
+    """
+    Marca os pares de marcadores como open/close; os que sobram abertos voltam
+    a ser texto literal e são devolvidos (o --check reporta os de negrito).
+    """
+    open_at = {}
+    stray = []
+    for idx, item in enumerate(items):
+        if item[0] != "mark":
+            continue
+        can_open, can_close = item[3]
+        name = MARK_NAMES[item[1]]
+        if name in open_at and items[open_at[name]][1] == item[1] and can_close:
+            items[open_at.pop(name)][0] = "open"
+            item[0] = "close"
+        elif name not in open_at and can_open:
+            open_at[name] = idx
+        else:
+            item[0] = "text"
+            stray.append(idx)
+    for idx in open_at.values():
+        items[idx][0] = "text"
+    return [items[idx][1] for idx in sorted([*open_at.values(), *stray])]
+
+
+def unpaired_marks(text):
+    return _pair_marks(_lex_inline(text))
+
+
+def inline_tokens(text):
+    """
+    Converte o markup inline em [(texto, marcas, href)], com marcas sendo um
+    frozenset de "b", "i" e "code". Marcadores sem par ficam como texto.
+    """
+    items = _lex_inline(text)
+    _pair_marks(items)
+
+    tokens = []
+    active = set()
+    for kind, value, href, *_ in items:
+        if kind == "open":
+            active.add(MARK_NAMES[value])
+            continue
+        if kind == "close":
+            active.discard(MARK_NAMES[value])
+            continue
+        if kind == "mark":
+            kind = "text"
+        marks = frozenset(active | {"code"}) if kind == "code" else frozenset(active)
+        if tokens and tokens[-1][1] == marks and tokens[-1][2] == href:
+            tokens[-1] = (tokens[-1][0] + value, marks, href)
+        elif value:
+            tokens.append((value, marks, href))
+    return tokens
+
+
+# ── Parser de markdown (markdown → AST de blocos) ──────────────────────────────
+#
+# O parser percorre as linhas uma única vez e produz uma lista de blocos
+# (tuplas "tipo, dados"), sem tocar em python-docx:
+#
+#   ("title", texto)            # FinApp / ## Manual do Usuário (vão para a capa)
+#   ("meta", texto)             **Versão / **Data
+#   ("toc", [(texto, âncora)])  bloco "## Sumário"; sai como ("toc", None) e
+#                               fill_toc() o preenche com os títulos ## do
+#                               documento inteiro (a lista escrita à mão no
+#                               markdown fica para quem lê no GitHub)
+#   ("sep", None)               ---
+#   ("h1".."h4", (texto, âncora))
+#   ("table", [[célula, ...]])  cabeçalho primeiro, sem a linha separadora
+#   ("tip", texto)              > blockquote (linhas consecutivas unidas)
+#   ("bullet", texto)           - item
+#   ("number", texto)           1. item
+#   ("image", (alt, caminho))   ![alt](caminho), sozinha na linha
+#   ("para", texto)
+
+RE_HEADING   = re.compile(r"(#{1,4}) ")
+RE_NUMBERED  = re.compile(r"\d+\.\s")
+RE_TABLE_SEP = re.compile(r":?-+:?")
+RE_TOC_ENTRY = re.compile(r"\d+\.\s+\[(.+?)\]\(#([^)]+)\)")
+RE_IMAGE     = re.compile(r"!\[([^\]]*)\]\(([^)\s]+)\)")
+RE_SECTION_N = re.compile(r"^\d+(\.\d+)*\s+")
+
+HEADING_KINDS = ("h1", "h2", "h3", "h4")
+
+
+def parse_markdown(content, index=None):
+    """index: dict âncora → título, compartilhado entre seções para deduplicar âncoras."""
+    if index is None:
+        index = {}
+    lines = content.split("\n")
+    n = len(lines)
+    blocks = []
+    table_rows = []
+    i = 0
+
+    while i < n:
+        line = lines[i]
+        stripped = line.strip()
+
+        # Tabela: acumula linhas até a primeira que não começa com "|"
+        if stripped.startswith("|"):
+            cells = [c.strip() for c in stripped.strip("|").split("|")]
+            if not all(RE_TABLE_SEP.fullmatch(c) for c in cells if c):
+                table_rows.append(cells)
+            i += 1
+            continue
+        if table_rows:
+            blocks.append(("table", table_rows))
+            table_rows = []
+
+        if not stripped:
+            pass
+        elif line.startswith(("# FinApp", "## Manual do Usuário")):
+            blocks.append(("title", line.lstrip("#").strip()))
+        elif line.startswith(("**Versão", "**Data")):
+            blocks.append(("meta", stripped))
+        elif stripped == "---":
+            blocks.append(("sep", None))
+        elif stripped == "## Sumário":
+            # A lista escrita à mão é pulada; o conteúdo vem de fill_toc()
+            while i + 1 < n and not lines[i + 1].startswith(("---", "## ")):
+                i += 1
+            blocks.append(("toc", None))
+        elif line.startswith("#"):
+            m = RE_HEADING.match(line)
+            if m:
+                text = line[m.end():].strip()
+                blocks.append((HEADING_KINDS[len(m.group(1)) - 1], (text, heading_anchor(text, index))))
+            else:
+                blocks.append(("para", stripped))
+        elif line.startswith("> "):
+            parts = [line[2:].strip()]
+            while i + 1 < n and lines[i + 1].startswith("> "):
+                i += 1
+                parts.append(lines[i][2:].strip())
+            blocks.append(("tip", " ".join(parts)))
+        elif line.startswith("- "):
+            blocks.append(("bullet", line[2:].strip()))
+        elif RE_NUMBERED.match(line):
+            blocks.append(("number", RE_NUMBERED.sub("", line, count=1)))
+        elif line.startswith("![") and RE_IMAGE.fullmatch(stripped):
+            m = RE_IMAGE.fullmatch(stripped)
+            blocks.append(("image", (m.group(1), m.group(2))))
+        else:
+            blocks.append(("para", stripped))
+        i += 1
+
+    if table_rows:
+        blocks.append(("table", table_rows))
+    return blocks
+
+
+def toc_entries(sections):
+    """
+    [(texto, âncora)] dos títulos ## de todas as seções, na ordem do
+    documento; o número da seção sai do texto ('1 Contas' → 'Contas').
+    """
+    return [(RE_SECTION_N.sub("", data[0], count=1), data[1])
+            for blocks in sections for kind, data in blocks if kind == "h2"]
+
+
+def fill_toc(sections, entries=None):
+    """
+    Troca os ("toc", None) das listas de blocos pelo sumário gerado: entries,
+    ou os títulos ## das próprias seções. Devolve as entradas usadas.
+    """
+    if entries is None:
+        entries = toc_entries(sections)
+    for blocks in sections:
+        for i, (kind, data) in enumerate(blocks):
+            if kind == "toc" and data is None:
+                blocks[i] = ("toc", entries)
+    return entries
+
+
+# ── Âncoras e referências cruzadas ─────────────────────────────────────────────
+
+def slugify(text):
+    """'2 Navegação' → '2-navegacao' (mesmo formato das âncoras do Sumário)."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r"[^a-z0-9\s-]", "", text)
+    return re.sub(r"\s+", "-", text.strip())
+
+
+def heading_anchor(text, index):
+    """Registra o título no índice; repetições ganham sufixo -1, -2... (como no GitHub)."""
+    base = anchor = slugify(text)
+    n = 0
+    while anchor in index:
+        n += 1
+        anchor = f"{base}-{n}"
+    index[anchor] = text
+    return anchor
+
+
+def block_links(kind, data):
+    """Âncoras (#...) referenciadas por um bloco: sumário e links inline."""
+    if kind == "toc":
+        return [anchor for _, anchor in data or ()]
+    if kind == "table":
+        texts = [cell for row in data for cell in row]
+    elif kind in ("para", "tip", "bullet", "number", "meta"):
+        texts = [data]
+    else:
+        return []
+    return [href[1:] for text in texts if "](#" in text
+            for _, _, href in inline_tokens(text) if href and href.startswith("#")]
+
+
+def unresolved_links(parsed, index):
+    """[(âncora, título da seção)] dos links sem título correspondente no índice."""
+    missing = []
+    for _, blocks in parsed:
+        where = next((data[0] for kind, data in blocks if kind in HEADING_KINDS), "preâmbulo")
+        for kind, data in blocks:
+            missing.extend((anchor, where) for anchor in block_links(kind, data)
+                           if anchor not in index)
+    return missing
+
+
+def link_report(parsed, index):
+    total = sum(len(block_links(kind, data)) for _, blocks in parsed for kind, data in blocks)
+    missing = unresolved_links(parsed, index)
+    lines = [f"Referências cruzadas: {total - len(missing)} de {total} resolvidas "
+             f"({len(index)} títulos indexados)"]
+    lines.extend(f"  âncora sem destino: #{anchor} (em “{where}”)" for anchor, where in missing)
+    return lines
+
+
+# ── Seções ─────────────────────────────────────────────────────────────────────
+
+def iter_sections(lines):
+    """
+    Agrupa as linhas em blocos que começam em cada '## ' (o primeiro é o
+    preâmbulo). Aceita um arquivo aberto: só uma seção fica em memória por vez.
+    """
+    current = []
+    for line in lines:
+        line = line.rstrip("\n")
+        if line.startswith("## ") and current:
+            yield "\n".join(current)
+            current = []
+        current.append(line)
+    if current:
+        yield "\n".join(current)
+
+
+# ── Verificação (--check) ──────────────────────────────────────────────────────
+#
+# Percorre as linhas com as mesmas regras do parser, mas guardando o número da
+# linha, e aponta o que o gerador aceitaria em silêncio com resultado errado.
+
+def check_markdown(lines):
+    """[(número da linha, mensagem)] dos problemas encontrados."""
+    problems = []
+    table_cols = None
+    prev_level = None
+    tip = None  # (linha inicial, texto acumulado) da dica em andamento
+    # O sumário do documento é gerado dos títulos ##; a lista escrita à mão
+    # precisa acompanhá-los, senão o markdown no GitHub mostra outro índice
+    toc_line = None
+    in_toc = False
+    listed = []    # (linha, âncora) dos itens da lista escrita à mão
+    headings = []  # (linha, âncora) dos títulos ##
+    index = {}
+
+    def check_bold(no, text):
+        if "**" in unpaired_marks(text):
+            problems.append((no, "'**' sem fechamento; o negrito sai como texto literal"))
+
+    for no, line in enumerate(lines, start=1):
+        line = line.rstrip("\n")
+        stripped = line.strip()
+
+        # Dicas: linhas "> " consecutivas viram um bloco só, como no parser
+        if line.startswith("> "):
+            tip = (tip[0], tip[1] + " " + line[2:]) if tip else (no, line[2:])
+            if not line[2:].strip():
+                problems.append((no, "dica (>) sem conteúdo"))
+            continue
+        if tip:
+            check_bold(*tip)
+            if stripped and not stripped.startswith(("|", "#", "-", ">")):
+                problems.append((no, "linha colada a uma dica sem '>'; vira parágrafo separado"))
+            tip = None
+        if stripped.startswith(">"):
+            problems.append((no, "'>' sem espaço depois ou fora de uma dica; "
+                                 "não vira caixa de dica"))
+
+        if stripped.startswith("|"):
+            cells = stripped.strip("|").split("|")
+            if table_cols is None:
+                table_cols = len(cells)
+            elif len(cells) != table_cols:
+                problems.append((no, f"linha de tabela com {len(cells)} colunas; "
+                                     f"o cabeçalho tem {table_cols}"))
+            for cell in cells:
+                check_bold(no, cell)
+            continue
+        table_cols = None
+
+        if in_toc and line.startswith(("---", "## ")):
+            in_toc = False
+        if in_toc:
+            m = RE_TOC_ENTRY.match(line)
+            if m:
+                listed.append((no, m.group(2)))
+
+        m = RE_HEADING.match(line) if line.startswith("#") else None
+        if m:
+            level = len(m.group(1))
+            if prev_level is not None and level > prev_level + 1:
+                problems.append((no, f"título de nível {level} logo após um de nível "
+                                     f"{prev_level} (pula nível)"))
+            prev_level = level
+            if stripped == "## Sumário":
+                toc_line, in_toc = no, True
+            elif not line.startswith(("# FinApp", "## Manual do Usuário")):
+                anchor = heading_anchor(line[m.end():].strip(), index)
+                if level == 2:
+                    headings.append((no, anchor))
+        check_bold(no, stripped)
+
+    if tip:
+        check_bold(*tip)
+    if toc_line is not None:
+        problems.extend(check_toc(listed, headings))
+    return sorted(problems)
+
+
+def check_toc(listed, headings):
+    """Compara a lista escrita à mão do Sumário com os títulos ## do documento."""
+    problems = []
+    listed_anchors = {anchor for _, anchor in listed}
+    heading_anchors = {anchor for _, anchor in headings}
+    problems.extend((no, f"título ## fora do Sumário escrito à mão (#{anchor}); "
+                         "o sumário gerado o inclui")
+                    for no, anchor in headings if anchor not in listed_anchors)
+    problems.extend((no, f"item do Sumário para #{anchor} sem título ## correspondente")
+                    for no, anchor in listed if anchor not in heading_anchors)
+    expected = [anchor for _, anchor in headings if anchor in listed_anchors]
+    actual = [(no, anchor) for no, anchor in listed if anchor in heading_anchors]
+    for want, (no, anchor) in zip(expected, actual):
+        if anchor != want:
+            problems.append((no, f"Sumário fora da ordem dos títulos: esperado #{want}, "
+                                 f"veio #{anchor}"))
+            break
+    return problems
+
+
+def check_file(md_path):
+    """Imprime os problemas no formato arquivo:linha e devolve o código de saída."""
+    t0 = time.perf_counter()
+    with open(md_path, encoding="utf-8") as md:
+        lines = md.readlines()
+    problems = check_markdown(lines)
+
+    index = {}
+    parsed = [(None, parse_markdown(section, index)) for section in iter_sections(lines)]
+    fill_toc([blocks for _, blocks in parsed])
+    name = os.path.basename(md_path)
+    for no, message in problems:
+        print(f"{name}:{no}: {message}")
+    for anchor, where in unresolved_links(parsed, index):
+        print(f"{name}: link para #{anchor} sem título correspondente (em “{where}”)")
+        problems.append((None, anchor))
+
+    elapsed = (time.perf_counter() - t0) * 1000
+    status = f"{len(problems)} problema(s)" if problems else "OK"
+    print(f"{status}: {len(lines)} linhas verificadas em {elapsed:.0f} ms")
+    return 1 if problems else 0
+
+
+def check_cli(argv, default_path):
+    """--check [ARQUIVO]; as demais opções do gerador são ignoradas."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--check", nargs="?", const=default_path)
+    args, _ = parser.parse_known_args(argv)
+    return check_file(args.check)
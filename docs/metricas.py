@@ -0,0 +1,143 @@
+"""
+Medição de texto para os geradores (gerar-pitch.py): largura de cada glifo
+por (fonte, tamanho, negrito), quebra de linha e altura de parágrafos, para
+saber se um texto cabe na caixa sem abrir o PowerPoint.
+
+Com o Pillow e o arquivo da fonte instalados, as larguras vêm da própria fonte.
+Sem eles, é usada a tabela de larguras da Helvetica (métricas AFM públicas),
+próxima o bastante da Segoe UI para apontar caixas estouradas. O resultado é
+uma estimativa: kerning e hinting ficam de fora.
+"""
+
+import os
+import bisect
+import functools
+import unicodedata
+from itertools import accumulate
+
+try:
+    from PIL import ImageFont
+except ImportError:  # Pillow é opcional: sem ele vale a tabela embutida
+    ImageFont = None
+
+# Altura de linha com espaçamento simples, em em (ascendente + descendente da Segoe UI)
+LINE_HEIGHT = 1.33
+
+# Onde procurar os arquivos das fontes usadas nos documentos
+FONT_DIRS = [d for d in (os.environ.get("FONT_DIR"),
+                         os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+                         "/Library/Fonts", os.path.expanduser("~/.fonts"),
+                         "/usr/share/fonts/truetype", "/usr/share/fonts") if d]
+FONT_FILES = {
+    ("Segoe UI", False): "segoeui.ttf",
+    ("Segoe UI", True): "segoeuib.ttf",
+}
+
+# Larguras em milésimos de em, ASCII 32..126 (Helvetica e Helvetica-Bold)
+_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+# Símbolos comuns nos slides que não têm letra base (travessão, setas, marcas)
+_WIDE = {"\u2014": 1000, "\u2013": 556, "\u2026": 1000, "\u2022": 350, "\u00b7": 278,
+         "\u2713": 800, "\u2717": 800, "\u2192": 1000, "\u21bb": 1000, "\u00ba": 365,
+         "\u00aa": 370}
+_UNKNOWN = 1000
+
+
+@functools.lru_cache(maxsize=None)
+def font_file(font, bold):
+    name = FONT_FILES.get((font, bold))
+    if ImageFont is None or not name:
+        return None
+    for base in FONT_DIRS:
+        for root, _, files in os.walk(base):
+            for f in files:
+                if f.lower() == name:
+                    return os.path.join(root, f)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _truetype(path):
+    return ImageFont.truetype(path, 1000)
+
+
+def _em_width(ch, font, bold):
+    """Largura de ch em milésimos de em."""
+    path = font_file(font, bold)
+    if path:
+        return _truetype(path).getlength(ch)
+    table = _HELVETICA_BOLD if bold else _HELVETICA
+    code = ord(ch)
+    if 32 <= code < 127:
+        return table[code - 32]
+    if ch in _WIDE:
+        return _WIDE[ch]
+    # Letras acentuadas medem o mesmo que a letra base
+    base = unicodedata.normalize("NFD", ch)[0]
+    if base != ch and 32 <= ord(base) < 127:
+        return table[ord(base) - 32]
+    return _UNKNOWN
+
+
+class AdvanceTable(dict):
+    """Largura em pontos de cada glifo já visto, para uma fonte e um tamanho."""
+
+    def __init__(self, font, size, bold):
+        super().__init__()
+        self.font, self.size, self.bold = font, size, bold
+
+    def __missing__(self, ch):
+        width = self[ch] = _em_width(ch, self.font, self.bold) * self.size / 1000
+        return width
+
+
+@functools.lru_cache(maxsize=None)
+def advance_table(font, size, bold=False):
+    """size em pontos."""
+    return AdvanceTable(font, size, bold)
+
+
+def wrap(text, width, font, size, bold=False):
+    """
+    Linhas de text quebrado em width pontos, como a quebra por palavra do
+    PowerPoint. Cada linha vai até o último fim de palavra cuja soma acumulada
+    cabe: uma busca binária sobre as larguras acumuladas, sem medir de novo.
+    Uma palavra mais larga que a caixa ocupa uma linha para cada width.
+    """
+    widths = advance_table(font, size, bold)
+    words = text.split(" ")
+    space = widths[" "]
+    # ends[k]: largura das palavras 0..k-1, cada uma seguida de um espaço
+    ends = [0.0, *accumulate(sum(map(widths.__getitem__, w)) + space for w in words)]
+    lines = []
+    start = 0
+    while start < len(words):
+        stop = bisect.bisect_right(ends, ends[start] + width + space) - 1
+        if stop <= start:
+            # Palavra sozinha maior que a linha: o PowerPoint quebra no meio
+            overflow = ends[start + 1] - ends[start] - space
+            lines.extend([words[start]] + [""] * (int(overflow // max(width, 1e-9))))
+            start += 1
+            continue
+        lines.append(" ".join(words[start:stop]))
+        start = stop
+    return lines or [""]
+
+
+def paragraph_height(lines, size, spacing=None, space_after=0.0):
+    """Altura em pontos de um parágrafo com lines linhas (spacing: entrelinha fixa)."""
+    return lines * (spacing or size * LINE_HEIGHT) + space_after
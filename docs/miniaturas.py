@@ -0,0 +1,171 @@
+"""
+Miniaturas PNG dos slides do pitch, desenhadas com o Pillow direto da lista
+de formas (sem PowerPoint nem LibreOffice).
+
+O gerador entrega cada slide como uma lista de exibição: tuplas simples com
+fundo, retângulos, retângulos arredondados, elipses, caixas de texto e a área
+dos gráficos. Assim cada slide pode ser desenhado em outro processo. A
+quebra de linha usa metricas.wrap, a mesma da verificação de textos. É uma
+prévia para revisão e CI, não uma renderização fiel: kerning, gradientes e o
+conteúdo dos gráficos ficam de fora.
+"""
+
+import io
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+import metricas
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # Pillow é opcional: sem ele não há miniaturas
+    Image = ImageDraw = ImageFont = None
+
+EMU_PER_PT = 12700
+# Desenha em SUPERSAMPLE vezes o tamanho e reduz no fim: bordas suavizadas
+SUPERSAMPLE = 2
+# Miniaturas sao regeradas a cada build: compressao rapida vale mais que bytes
+PNG_LEVEL = 1
+CHART_FILL, CHART_LINE = "F8FAFC", "E2E8F0"
+
+
+class PreviewError(Exception):
+    pass
+
+
+def _rgb(hex_color):
+    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+@functools.lru_cache(maxsize=None)
+def _font(name, bold, px):
+    path = metricas.font_file(name, bold)
+    if path:
+        return ImageFont.truetype(path, px)
+    return ImageFont.load_default(size=px)
+
+
+@functools.lru_cache(maxsize=None)
+def _glyph(font, ch):
+    """
+    (avanco, deslocamento x, deslocamento y, mascara) de ch em font, relativo a
+    linha de base. Cada glifo e rasterizado uma vez e so colado nas repeticoes.
+    """
+    left, top, right, bottom = font.getbbox(ch, anchor="ls")
+    mask = None
+    if right > left and bottom > top:
+        mask = Image.new("L", (right - left, bottom - top))
+        ImageDraw.Draw(mask).text((-left, -top), ch, fill=255, font=font, anchor="ls")
+    return font.getlength(ch), left, top, mask
+
+
+def _layout_paragraph(paragraph, width):
+    """
+    (alinhamento, espaço depois, linhas) de um parágrafo; cada linha é
+    (altura em pt, [(texto, cor, negrito, tamanho, fonte)]) com os trechos de
+    mesmo estilo juntos.
+    """
+    align, size, spacing, after, runs = paragraph
+    text = "".join(run[0] for run in runs)
+    styles = [run[1:] for run in runs for _ in run[0]]
+    line_height = spacing or size * metricas.LINE_HEIGHT
+    _, _, bold, _, font = runs[0] if runs else ("", "", False, size, "")
+    lines, offset = [], 0
+    for chunk in text.split("\n"):
+        for line in metricas.wrap(chunk, width, font, size, bold):
+            start = text.find(line, offset) if line else offset
+            segments = []
+            for i in range(start, start + len(line)):
+                if segments and segments[-1][1] == styles[i]:
+                    segments[-1][0].append(text[i])
+                else:
+                    segments.append(([text[i]], styles[i]))
+            lines.append((line_height, [("".join(chars), *style) for chars, style in segments]))
+            offset = start + len(line)
+        offset += 1     # o "\n" que separou os pedaços
+    return align, after, lines
+
+
+def _draw_text(draw, shape, scale):
+    _, x, y, w, h, insets, anchor, paragraphs = shape
+    left, top, right, bottom = insets
+    width_pt = (w - left - right) / EMU_PER_PT
+    laid_out = [_layout_paragraph(p, width_pt) for p in paragraphs]
+    total = sum(sum(lh for lh, _ in lines) + after for _, after, lines in laid_out)
+    if laid_out:
+        total -= laid_out[-1][1]
+    box_h = (h - top - bottom) / EMU_PER_PT
+    cursor = {"ctr": (box_h - total) / 2, "b": box_h - total}.get(anchor, 0.0)
+
+    px = scale      # pixels por ponto
+    x0 = (x + left) / EMU_PER_PT * px
+    y0 = (y + top) / EMU_PER_PT * px
+    box_w = width_pt * px
+    for align, after, lines in laid_out:
+        for line_height, segments in lines:
+            fonts = [_font(font, bold, max(1, round(size * px)))
+                     for _, _, bold, size, font in segments]
+            widths = [sum(_glyph(f, ch)[0] for ch in text) for f, (text, *_) in zip(fonts, segments)]
+            line_w = sum(widths)
+            lx = x0 + {"ctr": (box_w - line_w) / 2, "r": box_w - line_w}.get(align, 0.0)
+            baseline = y0 + (cursor + line_height * 0.8) * px
+            for f, seg_w, (text, color, *_) in zip(fonts, widths, segments):
+                fill, gx = _rgb(color), lx
+                for ch in text:
+                    advance, left, top, mask = _glyph(f, ch)
+                    if mask is not None:
+                        draw.bitmap((round(gx + left), round(baseline + top)), mask, fill=fill)
+                    gx += advance
+                lx += seg_w
+            cursor += line_height
+        cursor += after
+
+
+def render(display, width=960):
+    """PNG (bytes) de um slide descrito pela lista de exibição display."""
+    if Image is None:
+        raise PreviewError("miniaturas exigem o Pillow (pip install pillow)")
+    slide_w, slide_h = display["size"]
+    size = (width * SUPERSAMPLE, round(width * slide_h / slide_w) * SUPERSAMPLE)
+    scale = size[0] / (slide_w / EMU_PER_PT)        # pixels por ponto
+    image = Image.new("RGB", size, _rgb(display["background"]))
+    draw = ImageDraw.Draw(image)
+
+    def box(x, y, w, h):
+        k = scale / EMU_PER_PT
+        return [x * k, y * k, (x + w) * k, (y + h) * k]
+
+    for shape in display["shapes"]:
+        kind = shape[0]
+        if kind == "text":
+            _draw_text(draw, shape, scale)
+            continue
+        if kind == "chart":
+            draw.rectangle(box(*shape[1:5]), fill=_rgb(CHART_FILL), outline=_rgb(CHART_LINE),
+                           width=SUPERSAMPLE)
+            continue
+        _, x, y, w, h, fill, line, line_w, radius = shape
+        style = {"fill": _rgb(fill) if fill else None,
+                 "outline": _rgb(line) if line else None,
+                 "width": max(1, round(line_w * scale / EMU_PER_PT)) if line else 0}
+        if kind == "oval":
+            draw.ellipse(box(x, y, w, h), **style)
+        elif kind == "rrect":
+            r = radius * min(w, h) * scale / EMU_PER_PT
+            draw.rounded_rectangle(box(x, y, w, h), radius=r, **style)
+        else:
+            draw.rectangle(box(x, y, w, h), **style)
+
+    if SUPERSAMPLE > 1:
+        image = image.reduce(SUPERSAMPLE)
+    out = io.BytesIO()
+    image.save(out, "PNG", compress_level=PNG_LEVEL)
+    return out.getvalue()
+
+
+def render_all(displays, width=960, jobs=1):
+    """[PNG] na ordem de displays, em até jobs processos (um slide por tarefa)."""
+    if jobs <= 1 or len(displays) <= 1:
+        return [render(display, width) for display in displays]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(displays))) as pool:
+        return list(pool.map(render, displays, [width] * len(displays)))
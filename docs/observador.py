@@ -0,0 +1,63 @@
+"""
+Modo --watch dos geradores de documentos (gerar-manual.py, gerar-pitch.py).
+
+O processo fica aquecido: python-docx, python-pptx e lxml são importados uma
+vez só. Quando um arquivo observado muda, o gerador é reexecutado como módulo
+novo. Antes disso, os módulos auxiliares que mudaram (pacote.py, perfil.py,
+manual_md.py, metricas.py...) são recarregados.
+"""
+
+import os
+import sys
+import time
+import importlib
+import importlib.util
+
+
+def sources(modules):
+    """Caminhos absolutos dos arquivos dos módulos, para observar."""
+    return [os.path.abspath(module.__file__) for module in modules]
+
+
+def load_fresh(path, name, helpers=(), changed=()):
+    """
+    Reexecuta o gerador em path como módulo novo name. Os módulos de helpers
+    cujo arquivo está em changed são recarregados antes, na ordem dada
+    (dependências primeiro). O módulo novo fica em sys.modules: os workers
+    dos pools acham as funções dele pelo nome.
+    """
+    changed = {os.path.abspath(p) for p in changed}
+    for module in helpers:
+        if os.path.abspath(module.__file__) in changed:
+            importlib.reload(module)
+    spec = importlib.util.spec_from_file_location(name, os.path.abspath(path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def watch(paths, rebuild, interval=0.25):
+    """Mantém o processo aquecido e chama rebuild(changed) quando algum arquivo muda."""
+    def snapshot():
+        return {p: os.stat(p).st_mtime_ns for p in paths if os.path.exists(p)}
+
+    last = snapshot()
+    print("Observando alterações (Ctrl+C para sair)...")
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot()
+            if current == last:
+                continue
+            changed = {p for p in paths if current.get(p) != last.get(p)}
+            last = current
+            t0 = time.perf_counter()
+            try:
+                rebuild(changed)
+            except Exception as e:  # mantém o watch vivo com entrada ou código quebrado
+                print(f"Erro no build: {e!r}")
+                continue
+            print(f"Reconstruído em {(time.perf_counter() - t0) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print()
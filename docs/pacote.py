@@ -0,0 +1,225 @@
+"""
+Escrita determinística dos pacotes zip gerados em docs/ (docx, pptx, epub).
+
+O mesmo conteúdo sempre produz os mesmos bytes: datas fixas nas entradas do
+zip e nas propriedades do documento, ordem estável das partes e compressão
+configurável. Antes de gravar, o resultado é comparado com o arquivo que já
+existe; se for idêntico, o arquivo não é tocado (nem o mtime).
+
+Também guarda os pacotes base (modelos) dos geradores: estilos, página, capa
+e masters montados uma vez por versão do tema e reaproveitados nos builds.
+"""
+
+import io
+import os
+import sys
+import types
+import hashlib
+import zipfile
+from datetime import datetime, timezone
+
+# SOURCE_DATE_EPOCH é a convenção dos builds reprodutíveis; sem ela vale a data
+# da versão atual dos documentos
+BUILD_DATE = (datetime.fromtimestamp(int(os.environ["SOURCE_DATE_EPOCH"]), timezone.utc)
+              if os.environ.get("SOURCE_DATE_EPOCH") else
+              datetime(2026, 3, 1, tzinfo=timezone.utc))
+ZIP_DATE = max(BUILD_DATE.timetuple()[:6], (1980, 1, 1, 0, 0, 0))
+
+COMPRESSION = {"deflate": zipfile.ZIP_DEFLATED, "store": zipfile.ZIP_STORED}
+DEFAULT_LEVEL = 6
+
+# Partes que os leitores esperam no início do pacote, nessa ordem
+FIRST_PARTS = ("mimetype", "[Content_Types].xml", "_rels/.rels")
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "modelos")
+
+
+def stamp_core_properties(core, title):
+    """Datas e autoria fixas em docProps/core.xml (python-docx e python-pptx)."""
+    core.title = title
+    core.created = core.modified = BUILD_DATE.replace(tzinfo=None)
+    core.last_modified_by = "FinApp"
+    core.revision = 1
+
+
+def part_order(name):
+    return (FIRST_PARTS.index(name) if name in FIRST_PARTS else len(FIRST_PARTS), name)
+
+
+def zip_info(name, compression="deflate"):
+    """ZipInfo sem nada que dependa da máquina ou do momento do build."""
+    info = zipfile.ZipInfo(name, date_time=ZIP_DATE)
+    info.create_system = 0
+    info.external_attr = 0o644 << 16
+    # O mimetype do EPUB precisa ficar sem compressão
+    info.compress_type = zipfile.ZIP_STORED if name == "mimetype" else COMPRESSION[compression]
+    return info
+
+
+def open_zip(target, compression="deflate", level=DEFAULT_LEVEL):
+    """ZipFile para escrita; as partes levam compressão e nível de write_parts/stream_entry."""
+    return zipfile.ZipFile(target, "w", compression=COMPRESSION[compression],
+                           compresslevel=level)
+
+
+def stream_entry(zf, name, compression="deflate", level=DEFAULT_LEVEL):
+    """
+    Entrada aberta para escrita em partes (modo streaming), com os mesmos
+    metadados de write_parts. zf.open(ZipInfo, "w") ignora o nível do
+    ZipFile e só lê o da própria ZipInfo, como faz o writestr(compresslevel=).
+    """
+    info = zip_info(name, compression)
+    info._compresslevel = level
+    return zf.open(info, "w")
+
+
+def write_parts(zf, parts, compression="deflate", level=DEFAULT_LEVEL):
+    """parts: {nome: bytes}; grava na ordem estável de part_order."""
+    for name in sorted(parts, key=part_order):
+        zf.writestr(zip_info(name, compression), parts[name], compresslevel=level)
+
+
+def repack(data, compression="deflate", level=DEFAULT_LEVEL):
+    """Reempacota um zip já salvo com datas fixas e ordem estável."""
+    with zipfile.ZipFile(io.BytesIO(data)) as src:
+        parts = {info.filename: src.read(info) for info in src.infolist()}
+    out = io.BytesIO()
+    with open_zip(out) as zf:
+        write_parts(zf, parts, compression, level)
+    return out.getvalue()
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_if_changed(data, out_path):
+    """Grava data em out_path só se o conteúdo mudou. Retorna (gravou?, sha256)."""
+    digest = hashlib.sha256(data).hexdigest()
+    if (os.path.exists(out_path) and os.path.getsize(out_path) == len(data)
+            and file_digest(out_path) == digest):
+        return False, digest
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, out_path)
+    return True, digest
+
+
+def replace_if_changed(tmp_path, out_path):
+    """Como write_if_changed, para um pacote já escrito em disco (modo streaming)."""
+    digest = file_digest(tmp_path)
+    if (os.path.exists(out_path) and os.path.getsize(out_path) == os.path.getsize(tmp_path)
+            and file_digest(out_path) == digest):
+        os.remove(tmp_path)
+        return False, digest
+    os.replace(tmp_path, out_path)
+    return True, digest
+
+
+def pack_parts(parts, out_path, compression="deflate", level=DEFAULT_LEVEL):
+    """Monta o zip em memória a partir de {nome: bytes} e grava se mudou."""
+    out = io.BytesIO()
+    with open_zip(out) as zf:
+        write_parts(zf, parts, compression, level)
+    return write_if_changed(out.getvalue(), out_path)
+
+
+def save_package(save, out_path, compression="deflate", level=DEFAULT_LEVEL):
+    """save: o método save() do python-docx/python-pptx. Retorna (gravou?, sha256)."""
+    buf = io.BytesIO()
+    save(buf)
+    return write_if_changed(repack(buf.getvalue(), compression, level), out_path)
+
+
+def describe(label, out_path, written, digest):
+    state = "gerado" if written else "sem alterações"
+    return f"{label} {state}: {out_path} (sha256 {digest[:12]})"
+
+
+# ── Modelos base ───────────────────────────────────────────────────────────────
+
+_TEMPLATES = {}
+
+
+def _plain(value):
+    """str, int ou tupla deles (RGBColor é uma tupla de ints); nada com repr de objeto."""
+    if isinstance(value, tuple):
+        return all(_plain(item) for item in value)
+    return isinstance(value, (str, int)) and not isinstance(value, bool)
+
+
+def theme_constants(namespace):
+    """
+    Constantes do tema num módulo gerador: nomes em maiúsculas com cores, fontes,
+    medidas e ids de estilo. Caminhos e medições do import ficam de fora.
+    """
+    return {name: str(value) for name, value in namespace.items()
+            if name.isupper() and _plain(value) and not name.startswith("IMPORT_")
+            and not name.endswith(("_PATH", "_DIR"))}
+
+
+def _code_parts(code):
+    yield code.co_code
+    yield repr((code.co_names, code.co_varnames)).encode("utf-8")
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _code_parts(const)
+        else:
+            yield repr(const).encode("utf-8")
+
+
+def code_digest(digest, fn):
+    """
+    Alimenta digest com o bytecode, as constantes e os defaults de fn. Ao
+    contrário do texto da fonte, não muda com comentários nem quando a função
+    só troca de linha no arquivo, e não exige tokenizar o módulo.
+    """
+    digest.update(sys.version.encode("utf-8"))
+    for part in _code_parts(fn.__code__):
+        digest.update(part)
+    digest.update(repr((fn.__defaults__, fn.__kwdefaults__)).encode("utf-8"))
+
+
+def template_version(theme, builders, *extra):
+    """Hash do tema, do código que monta o modelo e de extras (ex.: versão da biblioteca)."""
+    digest = hashlib.sha256()
+    for name in sorted(theme):
+        digest.update(f"{name}={theme[name]}\n".encode("utf-8"))
+    for fn in builders:
+        code_digest(digest, fn)
+    for item in extra:
+        digest.update(f"{item}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def cached_template(name, version, build):
+    """
+    Bytes do modelo base name (ex.: "manual.docx") na versão pedida. build()
+    só roda quando a versão muda; o resultado fica em .cache/modelos e em
+    memória, para os builds seguintes do mesmo processo (watch, benchmark).
+    Retorna (bytes, gerado agora?).
+    """
+    key = (name, version)
+    if key in _TEMPLATES:
+        return _TEMPLATES[key], False
+    stem, ext = os.path.splitext(name)
+    path = os.path.join(TEMPLATE_DIR, f"{stem}-{version}{ext}")
+    fresh = not os.path.exists(path)
+    if fresh:
+        data = build()
+        os.makedirs(TEMPLATE_DIR, exist_ok=True)
+        write_if_changed(data, path)
+        # Versões antigas do mesmo modelo não servem mais
+        for old in os.listdir(TEMPLATE_DIR):
+            if old.startswith(stem + "-") and old.endswith(ext) and old != os.path.basename(path):
+                os.remove(os.path.join(TEMPLATE_DIR, old))
+    else:
+        with open(path, "rb") as f:
+            data = f.read()
+    _TEMPLATES[key] = data
+    return data, fresh
@@ -0,0 +1,104 @@
+"""
+Perfil por fase dos geradores de documentos (gerar-manual.py, gerar-pitch.py).
+Mede tempo de parede e alocações (tracemalloc) de cada fase e grava um
+relatório JSON, para acompanhar a evolução entre commits.
+"""
+
+import os
+import sys
+import json
+import time
+import subprocess
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class Profiler:
+    """
+    Acumula as fases por nome: chamadas, tempo total, bytes alocados (líquido)
+    e pico de memória acima do início da fase. Desligado, phase() é um
+    nullcontext e o custo no build normal é desprezível.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.phases = {}
+        self._stack = []
+        self._t0 = None
+        self._peak = 0
+
+    def start(self, since=None):
+        """since: perf_counter() de referência para o total (ex.: antes dos imports)."""
+        self.enabled = True
+        self.phases = {}
+        self._peak = 0
+        self._t0 = time.perf_counter() if since is None else since
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def phase(self, name):
+        return self._measure(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _measure(self, name):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # reset_peak() abaixo apaga o pico visto até aqui pela fase externa
+            self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        frame = {"t0": time.perf_counter(), "mem0": current, "peak": current}
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            wall = time.perf_counter() - frame["t0"]
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame["peak"])
+            self._peak = max(self._peak, peak)
+            if self._stack:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            self.record(name, wall, current - frame["mem0"], peak - frame["mem0"])
+
+    def record(self, name, wall, alloc=0, peak=0):
+        entry = self.phases.setdefault(
+            name, {"calls": 0, "wall_s": 0.0, "alloc_bytes": 0, "peak_bytes": 0})
+        entry["calls"] += 1
+        entry["wall_s"] += wall
+        entry["alloc_bytes"] += alloc
+        entry["peak_bytes"] = max(entry["peak_bytes"], peak)
+
+    def report(self, tool, **extra):
+        return {
+            "tool": tool,
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "total_wall_s": round(time.perf_counter() - self._t0, 6),
+            "peak_bytes": max(self._peak, tracemalloc.get_traced_memory()[1]),
+            **extra,
+            "phases": [{"name": name, **entry, "wall_s": round(entry["wall_s"], 6)}
+                       for name, entry in self.phases.items()],
+        }
+
+    def dump(self, path, tool, **extra):
+        """Grava o relatório JSON e imprime as fases mais lentas."""
+        report = self.report(tool, **extra)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Perfil: {path} ({report['total_wall_s'] * 1000:.0f} ms no total)")
+        for phase in sorted(report["phases"], key=lambda p: -p["wall_s"])[:5]:
+            print(f"  {phase['name']:<24} {phase['wall_s'] * 1000:8.1f} ms  "
+                  f"{phase['alloc_bytes'] / 1024:9.0f} KiB  x{phase['calls']}")
+        return report
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
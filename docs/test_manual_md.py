@@ -0,0 +1,75 @@
+"""Testes do tokenizador inline e do sumário de manual_md.py (python -m pytest docs)."""
+
+import pytest
+
+from manual_md import (inline_tokens, unpaired_marks, parse_markdown, iter_sections, fill_toc,
+                       check_markdown)
+
+B, I, CODE = frozenset({"b"}), frozenset({"i"}), frozenset({"code"})
+PLAIN = frozenset()
+
+
+@pytest.mark.parametrize("text, tokens", [
+    ("**negrito** e *itálico*", [("negrito", B, None), (" e ", PLAIN, None), ("itálico", I, None)]),
+    ("_itálico_ no fim", [("itálico", I, None), (" no fim", PLAIN, None)]),
+    ("**a *b* c**", [("a ", B, None), ("b", B | I, None), (" c", B, None)]),
+    ("use `npm run dev`", [("use ", PLAIN, None), ("npm run dev", CODE, None)]),
+    ("veja [**Contas**](#contas)", [("veja ", PLAIN, None), ("Contas", B, "#contas")]),
+    (r"\*literal\*", [("*literal*", PLAIN, None)]),
+    ("nome_de_variavel", [("nome_de_variavel", PLAIN, None)]),
+    ("**aberto sem fim", [("**aberto sem fim", PLAIN, None)]),
+])
+def test_inline_tokens(text, tokens):
+    assert inline_tokens(text) == tokens
+
+
+@pytest.mark.parametrize("text", ["2 * 3 * 4", "a ** b ** c", "x _ y _ z", "* item *"])
+def test_marker_between_spaces_is_text(text):
+    # Como no CommonMark: só abre sem espaço depois e só fecha sem espaço antes
+    assert inline_tokens(text) == [(text, PLAIN, None)]
+    assert unpaired_marks(text) == []
+
+
+def test_closer_needs_no_space_before():
+    assert inline_tokens("**a **b") == [("**a **b", PLAIN, None)]
+    assert unpaired_marks("**a **b") == ["**", "**"]
+
+
+def test_unpaired_bold_is_reported():
+    assert unpaired_marks("texto** solto") == ["**"]
+    assert unpaired_marks("**negrito**") == []
+
+
+SUMARIO = """# FinApp
+## Sumário
+
+1. [Contas](#1-contas)
+2. [Transações](#2-transacoes)
+
+---
+
+## 1 Contas
+
+## 2 Transações
+
+## Dicas rápidas
+"""
+
+
+def test_toc_is_generated_from_headings():
+    index = {}
+    sections = [parse_markdown(section, index) for section in iter_sections(SUMARIO.split("\n"))]
+    assert ("toc", None) in sections[1]
+    entries = fill_toc(sections)
+    assert entries == [("Contas", "1-contas"), ("Transações", "2-transacoes"),
+                       ("Dicas rápidas", "dicas-rapidas")]
+    assert ("toc", entries) in sections[1]
+
+
+def test_handwritten_toc_is_checked():
+    lines = SUMARIO.split("\n")
+    assert check_markdown(lines) == [
+        (13, "título ## fora do Sumário escrito à mão (#dicas-rapidas); o sumário gerado o inclui")]
+    lines[3], lines[4] = lines[4], lines[3]
+    assert (4, "Sumário fora da ordem dos títulos: esperado #1-contas, veio #2-transacoes") \
+        in check_markdown(lines)
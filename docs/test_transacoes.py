@@ -0,0 +1,37 @@
+"""Testes de transacoes.py (python -m pytest docs)."""
+
+import pytest
+
+import transacoes
+
+HEADER = "type,amount_cents,date,category_id\n"
+
+
+def write_csv(tmp_path, body):
+    path = tmp_path / "transactions.csv"
+    path.write_text(HEADER + body, encoding="utf-8")
+    return str(path)
+
+
+def test_aggregate_sums_by_competency(tmp_path):
+    path = write_csv(tmp_path, "receita,10000,2026-03-05,\n"
+                               "despesa,2500,2026-03-10,c1\n"
+                               "transferencia,999,2026-03-11,\n"
+                               "despesa,500,2026-04-02,c1\n")
+    summary = transacoes.aggregate(path, closing_day=5)
+    assert summary.rows == 3
+    assert summary.income == {"2026-03": 10000}
+    assert summary.expense == {"2026-03": 3000}
+    assert summary.by_category == {"c1": 3000}
+
+
+def test_aggregate_skips_blank_lines(tmp_path):
+    path = write_csv(tmp_path, "receita,100,2026-03-05,\n\n\n")
+    assert transacoes.aggregate(path).rows == 1
+
+
+@pytest.mark.parametrize("row", ["receita,100", "despesa,100,2026-03-05", "receita"])
+def test_aggregate_rejects_truncated_row(tmp_path, row):
+    path = write_csv(tmp_path, "receita,100,2026-03-05,\n" + row + "\n")
+    with pytest.raises(transacoes.TransactionsError, match=r":3: linha inválida"):
+        transacoes.aggregate(path)
@@ -0,0 +1,106 @@
+"""
+Agregação de exportações CSV da tabela transactions (Supabase) para os
+gráficos do pitch: receitas e despesas por mês de competência e despesas
+por categoria.
+
+Colunas usadas (001_initial_schema.sql, 019_transfers.sql,
+025_competency_override.sql): type, amount_cents, date, category_id e,
+quando existir, competency_month. Transferências não entram nos totais.
+
+A leitura é uma passada só pelo arquivo, com csv.reader e somas em dict:
+memória constante e alguns segundos para milhões de linhas, sem depender
+de NumPy ou pandas.
+"""
+
+import csv
+import functools
+
+INCOME, EXPENSE, TRANSFER = "receita", "despesa", "transferencia"
+REQUIRED_COLUMNS = ("type", "amount_cents", "date", "category_id")
+NO_CATEGORY = "Sem categoria"
+
+
+class TransactionsError(Exception):
+    pass
+
+
+@functools.lru_cache(maxsize=4096)
+def competency(date, closing_day=1):
+    """
+    Mês de competência ("YYYY-MM") de uma data "YYYY-MM-DD", como em
+    src/lib/closing-day.ts: antes do dia de fechamento, a data pertence à
+    competência do mês anterior.
+    """
+    year, month, day = int(date[:4]), int(date[5:7]), int(date[8:10])
+    if closing_day > 1 and day < closing_day:
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return f"{year:04d}-{month:02d}"
+
+
+def read_categories(path):
+    """{id: nome} de uma exportação CSV da tabela categories."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return {row["id"]: row["name"] for row in csv.DictReader(f)}
+
+
+class Summary:
+    """Totais em centavos por mês de competência e por categoria de despesa."""
+
+    def __init__(self):
+        self.rows = 0
+        self.income = {}        # mês -> centavos
+        self.expense = {}       # mês -> centavos
+        self.by_category = {}   # category_id -> centavos de despesa
+
+    def months(self, last=12):
+        """Os last meses mais recentes com movimento, em ordem."""
+        return sorted(self.income.keys() | self.expense.keys())[-last:]
+
+    def top_categories(self, names, count=6, other="Outras"):
+        """[(nome, centavos)] das count maiores categorias; o resto somado em other."""
+        totals = {}
+        for category_id, cents in self.by_category.items():
+            name = names.get(category_id) or category_id or NO_CATEGORY
+            totals[name] = totals.get(name, 0) + cents
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        top, rest = ranked[:count], ranked[count:]
+        if rest:
+            top.append((other, sum(cents for _, cents in rest)))
+        return top
+
+
+def aggregate(path, closing_day=1):
+    """Lê a exportação de transactions em path e devolve o Summary."""
+    summary = Summary()
+    income, expense, by_category = summary.income, summary.expense, summary.by_category
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        missing = [c for c in REQUIRED_COLUMNS if c not in header]
+        if missing:
+            raise TransactionsError(f"{path}: faltam as colunas {', '.join(missing)}")
+        i_type, i_amount, i_date, i_category = (header.index(c) for c in REQUIRED_COLUMNS)
+        i_override = header.index("competency_month") if "competency_month" in header else None
+
+        for line, row in enumerate(reader, start=2):
+            if not row:
+                continue        # linha em branco (fim de arquivo com \n a mais)
+            try:
+                kind = row[i_type]
+                if kind == TRANSFER:
+                    continue
+                cents = int(row[i_amount])
+                category = row[i_category]
+                month = ((i_override is not None and row[i_override])
+                         or competency(row[i_date], closing_day))
+            except (ValueError, IndexError):
+                raise TransactionsError(f"{path}:{line}: linha inválida: {row!r}") from None
+            if kind == INCOME:
+                income[month] = income.get(month, 0) + cents
+            elif kind == EXPENSE:
+                expense[month] = expense.get(month, 0) + cents
+                by_category[category] = by_category.get(category, 0) + cents
+            else:
+                raise TransactionsError(f"{path}:{line}: tipo desconhecido {kind!r}")
+            summary.rows += 1
+    return summary